@@ -0,0 +1,103 @@
+"""
+Compare symbol indexers on a synthetic (or existing) Python project.
+
+    PYTHONPATH=. python benchmarks/bench_symbol_index.py --files 5000
+    python benchmarks/bench_symbol_index.py --project ~/src/monorepo --workers 16
+"""
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from cybermule.symbol_resolution.ctags_index import ctags_file_symbols
+from cybermule.symbol_resolution.native_index import tree_sitter_file_symbols
+from cybermule.symbol_resolution.symbol_index import SymbolIndex, list_source_files
+
+MODULE_TEMPLATE = '''\
+import os
+
+CONSTANT_{i} = {i}
+
+
+class Service{i}:
+    retries = 3
+
+    def __init__(self, name):
+        self.name = name
+
+{methods}
+
+def helper_{i}(value):
+    if value > {i}:
+        return Service{i}(str(value)).run_0()
+    return None
+'''
+
+METHOD_TEMPLATE = '''\
+    def run_{j}(self, *args):
+        total = 0
+        for arg in args:
+            total += len(str(arg)) + {j}
+        return total
+'''
+
+
+def generate_project(root: Path, files: int, methods: int) -> None:
+    body = "\n".join(METHOD_TEMPLATE.format(j=j) for j in range(methods))
+    for i in range(files):
+        package = root / f"pkg_{i % 50}"
+        package.mkdir(exist_ok=True)
+        (package / f"module_{i}.py").write_text(MODULE_TEMPLATE.format(i=i, methods=body))
+
+
+def timed(label: str, fn) -> float:
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    if isinstance(result, dict):
+        detail = f"{sum(len(symbols) for symbols in result.values())} symbols"
+    else:
+        detail = f"{result} files re-indexed"
+    typer.echo(f"{label:<34} {elapsed:8.3f}s  ({detail})")
+    return elapsed
+
+
+def main(
+    project: Optional[Path] = typer.Option(None, help="Index this project instead of a synthetic one"),
+    files: int = typer.Option(2000, help="Synthetic project size in files"),
+    methods: int = typer.Option(20, help="Methods per synthetic class"),
+    workers: int = typer.Option(os.cpu_count() or 1, help="tree-sitter indexing processes"),
+):
+    tmp = None
+    if project is None:
+        tmp = tempfile.mkdtemp(prefix="cybermule-bench-")
+        project = Path(tmp)
+        generate_project(project, files, methods)
+
+    try:
+        sources = list_source_files(project)
+        typer.echo(f"📁 {len(sources)} files in {project}\n")
+
+        timed("tree-sitter, 1 process", lambda: tree_sitter_file_symbols(sources, project, workers=1))
+        timed(f"tree-sitter, {workers} processes", lambda: tree_sitter_file_symbols(sources, project, workers=workers))
+        if shutil.which("ctags"):
+            timed("ctags", lambda: ctags_file_symbols(sources, project))
+        else:
+            typer.echo("ctags                              (not installed, skipped)")
+
+        index_path = Path(tempfile.mkdtemp(prefix="cybermule-index-")) / "symbol_index.json"
+        indexer = lambda changed, root: tree_sitter_file_symbols(changed, root, workers=workers)
+        timed("cold SymbolIndex.refresh", lambda: SymbolIndex(project, indexer, path=index_path).refresh())
+        timed("warm SymbolIndex load + refresh", lambda: SymbolIndex(project, indexer, path=index_path).refresh())
+        shutil.rmtree(index_path.parent)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,143 @@
+"""
+Compare the compiled tree-sitter queries used by lookups with a recursive Python
+walk over every node, on large synthetic (or existing) modules.
+
+    PYTHONPATH=. python benchmarks/bench_tree_sitter_queries.py --lines 5000
+    PYTHONPATH=. python benchmarks/bench_tree_sitter_queries.py --file path/to/big_module.py
+"""
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import typer
+
+from cybermule.symbol_resolution.tree_sitter_lookup import (
+    _query_outline,
+    extract_called_symbols_on_line,
+    extract_symbol_definition,
+    extract_test_definitions,
+    get_node_text,
+    parse_cache,
+)
+
+CLASS_TEMPLATE = '''\
+class TestService{i}:
+    retries = {i}
+
+    def test_run_{i}(self):
+        value = helper_{i}(self.retries)
+        assert check(value, str(value).strip())
+
+    def process_{i}(self, items):
+        total = 0
+        for item in items:
+            total += self.score(item) + len(str(item))
+        return self.finish(total, extra=helper_{i}(total))
+
+
+def helper_{i}(value):
+    return max(value, compute(value - 1), {i})
+
+'''
+
+
+def walk_tree(node):
+    yield node
+    for child in node.children:
+        yield from walk_tree(child)
+
+
+def walk_definitions(tree, source_bytes: bytes, symbol: str) -> List[int]:
+    lines = []
+    for node in walk_tree(tree.root_node):
+        if node.type in {"function_definition", "class_definition"}:
+            name_node = node.child_by_field_name("name")
+            if name_node and get_node_text(name_node, source_bytes) == symbol:
+                lines.append(node.start_point[0] + 1)
+    return lines
+
+
+def walk_calls_on_line(tree, source_bytes: bytes, lineno: int) -> List[str]:
+    results = []
+    for node in walk_tree(tree.root_node):
+        if node.type == "call" and node.start_point[0] + 1 == lineno:
+            func_node = node.child_by_field_name("function")
+            if func_node is not None and func_node.type == "identifier":
+                results.append(get_node_text(func_node, source_bytes))
+            elif func_node is not None and func_node.type == "attribute":
+                name_node = func_node.child_by_field_name("attribute")
+                if name_node:
+                    results.append(get_node_text(name_node, source_bytes))
+    return results
+
+
+def walk_test_functions(tree, source_bytes: bytes) -> List[str]:
+    return [get_node_text(node.child_by_field_name("name"), source_bytes)
+            for node in walk_tree(tree.root_node)
+            if node.type == "function_definition"
+            and get_node_text(node.child_by_field_name("name"), source_bytes).startswith("test_")]
+
+
+def timed(label: str, fn: Callable[[], int], baseline: Optional[float] = None) -> float:
+    started = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - started
+    speedup = f"  {baseline / elapsed:6.1f}x" if baseline else ""
+    typer.echo(f"{label:<38} {elapsed:8.3f}s  ({count} results){speedup}")
+    return elapsed
+
+
+def main(
+    file: Optional[Path] = typer.Option(None, help="Benchmark this module instead of a synthetic one"),
+    lines: int = typer.Option(5000, help="Synthetic module size in lines"),
+    lookups: int = typer.Option(200, help="Lookups of each kind"),
+    seed: int = typer.Option(0, help="Random seed for the looked-up names and lines"),
+):
+    tmp = None
+    if file is None:
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".py", delete=False)
+        classes = max(1, lines // CLASS_TEMPLATE.count("\n"))
+        tmp.write("".join(CLASS_TEMPLATE.format(i=i) for i in range(classes)))
+        tmp.close()
+        file = Path(tmp.name)
+
+    try:
+        parsed = parse_cache.get(file)
+        tree, source_bytes = parsed.tree, parsed.source_bytes
+        outline = _query_outline(tree, source_bytes)
+        rng = random.Random(seed)
+        names = [rng.choice(outline.definitions).name for _ in range(lookups)]
+        call_lines = [rng.choice(outline.call_lines) for _ in range(lookups)] if outline.call_lines else []
+        typer.echo(f"📄 {file}: {len(parsed.line_offsets)} lines, {tree.root_node.descendant_count} nodes, "
+                   f"{len(outline.definitions)} definitions, {len(outline.calls)} calls\n")
+
+        # The lookups must agree with the walk they replace
+        for name in names[:20]:
+            expected = walk_definitions(tree, source_bytes, name)
+            assert extract_symbol_definition(file, name)["start_line"] == expected[0]
+        for line in call_lines[:20]:
+            assert extract_called_symbols_on_line(file, line) == walk_calls_on_line(tree, source_bytes, line)
+        assert [t["symbol"] for t in extract_test_definitions(file)] == walk_test_functions(tree, source_bytes)
+
+        timed("one walk over every node", lambda: sum(1 for _ in walk_tree(tree.root_node)))
+        timed("one outline query", lambda: len(_query_outline(tree, source_bytes).definitions))
+        typer.echo("")
+
+        base = timed("definitions: walk per lookup",
+                     lambda: sum(len(walk_definitions(tree, source_bytes, n)) for n in names))
+        timed("definitions: cached outline", lambda: sum(bool(extract_symbol_definition(file, n)) for n in names), base)
+        base = timed("calls on a line: walk per lookup",
+                     lambda: sum(len(walk_calls_on_line(tree, source_bytes, l)) for l in call_lines))
+        timed("calls on a line: cached outline",
+              lambda: sum(len(extract_called_symbols_on_line(file, l)) for l in call_lines), base)
+        base = timed("test functions: walk", lambda: len(walk_test_functions(tree, source_bytes)))
+        timed("test functions: cached outline", lambda: len(extract_test_definitions(file)), base)
+    finally:
+        if tmp:
+            Path(tmp.name).unlink()
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -10,7 +10,9 @@ from cybermule.commands import (
     run_and_fix,
     suggest_test,
     replay_subtree,
+    stats,
 )
+from cybermule.symbol_resolution import configure_parse_cache, configure_symbol_index
 from cybermule.version_info import get_version_info
 
 app = typer.Typer()
@@ -56,6 +58,8 @@ def main(
 
     with open(config_file, "r") as f:
         config = yaml.safe_load(f)
+    configure_symbol_index((config or {}).get("symbol_index"))
+    configure_parse_cache((config or {}).get("parse_cache"))
 
     # ⬇️ Display version + commit hash
     version_info = get_version_info()
@@ -68,6 +72,7 @@ app.command("review-commit")(review_commit.run)
 app.command("run-and-fix")(run_and_fix.run)
 app.command("suggest-test")(suggest_test.run)
 app.command("replay-subtree")(replay_subtree.run)
+app.command("stats")(stats.run)
 
 
 # Lazily import check-llm command
@@ -80,6 +85,8 @@ def lazy_command(module: str, attr: str = "run"):
 
 
 app.command("check-llm")(lazy_command("cybermule.commands.check_llm"))
+app.command("mock-llm-server")(lazy_command("cybermule.commands.mock_llm_server"))
+app.command("eval-bench")(lazy_command("cybermule.commands.eval_bench"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from cybermule.executors.eval_bench import load_cases, run_bench, summarize_bench
+from cybermule.memory.memory_graph import MemoryGraph
+
+
+def _fmt(value: Optional[float], spec: str = ".2f") -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def run(
+    ctx: typer.Context,
+    variant: List[str] = typer.Option(..., "--variant", help="Prompt template to benchmark (repeatable)"),
+    tag: str = typer.Option(..., "--tag", help="Tag of recorded nodes to use as cases, e.g. traceback or fix"),
+    graph_path: Path = typer.Option("memory_graph.json", help="Path to the memory graph file"),
+    limit: int = typer.Option(None, "--limit", help="Use only the most recent N cases"),
+    expect: str = typer.Option(None, "--expect", help="Success check: json, tag:<name> or any (default: inferred)"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Maximum concurrent LLM calls (default: scheduler.max_workers)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the per-variant report as JSON"),
+):
+    """
+    Benchmark prompt template variants against recorded cases from the memory graph.
+    """
+    config = ctx.obj["config"]
+    cases = load_cases(MemoryGraph(storage_path=graph_path), tag, limit=limit)
+    if not cases:
+        typer.echo(f"❌ No recorded nodes tagged '{tag}' with stored variables in {graph_path}", err=True)
+        raise typer.Exit(1)
+
+    try:
+        runs = run_bench(config, variant, cases, expect=expect, jobs=jobs)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    report = summarize_bench(runs)
+
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    typer.echo(f"📊 {len(cases)} cases tagged '{tag}'")
+    for name, entry in report.items():
+        typer.echo(f"{name}: success {entry['success_rate']:.0%} ({entry['errors']} errors), "
+                   f"tokens in/out {entry['input_tokens']}/{entry['output_tokens']}, "
+                   f"latency p50 {_fmt(entry['latency_p50'])}s p95 {_fmt(entry['latency_p95'])}s, "
+                   f"cost ${_fmt(entry['cost'], '.4f')}, cache hits {entry['cache_hits']}")
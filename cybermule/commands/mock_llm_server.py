@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from cybermule.tools.mock_llm_server import MockLLMServer, MockServerSettings, load_script
+
+
+def run(
+    host: str = typer.Option("127.0.0.1", help="Interface to bind"),
+    port: int = typer.Option(8765, help="Port to listen on"),
+    ttft: float = typer.Option(0.0, help="Seconds before the first token is streamed"),
+    tps: float = typer.Option(0.0, help="Tokens per second while streaming (0 = unthrottled)"),
+    error_rate: float = typer.Option(0.0, help="Fraction of requests that fail with HTTP 500"),
+    rate_limit_rate: float = typer.Option(0.0, help="Fraction of requests that fail with HTTP 429"),
+    script: Optional[Path] = typer.Option(None, exists=True, help="YAML/JSON file with scripted responses"),
+    seed: Optional[int] = typer.Option(None, help="Seed for error and rate-limit injection"),
+):
+    """
+    Serve an OpenAI-compatible stand-in LLM for load and latency testing.
+    """
+    settings = MockServerSettings(ttft=ttft, tokens_per_second=tps, error_rate=error_rate,
+                                  rate_limit_rate=rate_limit_rate, seed=seed)
+    server = MockLLMServer(host=host, port=port, settings=settings,
+                           script=load_script(script) if script else None)
+
+    typer.echo(f"🧪 Stand-in LLM server listening on {server.url}")
+    typer.echo(f'   Point litellm at it with: model: "openai/mock", api_base: "{server.url}"')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo("\n🛑 Stopping stand-in LLM server")
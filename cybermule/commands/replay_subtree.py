@@ -10,6 +10,8 @@ def run(
     node_id: str = typer.Argument(..., help="Root node ID to replay"),
     graph_path: Path = typer.Option("memory_graph.json", help="Path to the memory graph file"),
     prompt_map: Path = typer.Option(None, help="YAML file with prompt substitution map"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Maximum concurrent LLM calls (default: scheduler.max_workers)"),
+    force: bool = typer.Option(False, "--force", help="Re-run every node, even those whose inputs are unchanged"),
 ):
     """
     Replay a subtree of LLM tasks from a given root node.
@@ -28,8 +30,11 @@ def run(
         graph=graph,
         config=config,
         prompt_substitutions=substitutions,
+        jobs=jobs,
+        force=force,
     )
 
-    typer.echo(f"🔁 [replay_subtree] Replayed {len(node_id_map)} nodes:")
+    reused = sum(1 for new in node_id_map.values() if graph.get(new).get("reused_response_of"))
+    typer.echo(f"🔁 [replay_subtree] Replayed {len(node_id_map)} nodes ({reused} reused unchanged):")
     for original, new in node_id_map.items():
         typer.echo(f"  {original} → {new}")
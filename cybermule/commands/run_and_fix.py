@@ -1,13 +1,27 @@
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import typer
 from typer import Context
 
 from cybermule.executors.git_review import review_commit_with_llm
 from cybermule.memory.memory_graph import MemoryGraph
-from cybermule.tools.test_runner import run_test, get_first_failure, run_single_test
+from cybermule.tools.test_runner import (
+    cluster_failures,
+    extract_failures_blocks,
+    format_cluster,
+    get_first_failure,
+    run_single_test,
+    run_test,
+)
 from cybermule.executors.analyzer import summarize_traceback, analyze_failure_with_llm
-from cybermule.executors.apply_code_change import apply_code_change, describe_change_plan
+from cybermule.executors.apply_code_change import (
+    apply_code_change,
+    describe_change_plan,
+    group_change_plans,
+    merge_change_plans,
+)
+from cybermule.executors.task_graph import TaskGraph
+from cybermule.symbol_resolution import parse_cache_stats
 
 
 def run(
@@ -21,21 +35,43 @@ def run(
       "--dry-run",
       help="Only show new tests without applying them",
     ),
+    all_failures: bool = typer.Option(
+      False, "--all-failures", help="Analyze every failing test concurrently and fix them in one cycle."),
+    batch: bool = typer.Option(
+      False, "--batch", help="With --all-failures, apply all fix plans as one change instead of one per file group."),
+    jobs: Optional[int] = typer.Option(
+      None, "--jobs", "-j", help="With --all-failures, maximum concurrent analyses (default: scheduler.max_workers)"),
 ):
     config = ctx.obj.get("config", {})
     graph = MemoryGraph()
+    ctx.call_on_close(report_parse_cache)
 
-    review_node_id = None
+    # The commit review and the test run are independent, so they run concurrently
+    tasks = TaskGraph(config, graph)
     if review_commit:
         typer.echo("[run_and_fix] Reviewing latest commit...")
-        review, review_node_id = review_commit_with_llm(config, graph=graph)
+        tasks.add_task("review", lambda results: review_commit_with_llm(config, graph=graph))
+    if log is None:
+        get_failures = run_and_get_all_failures if all_failures else run_and_get_first_failure
+        tasks.add_task("tests", lambda results: get_failures(test, config))
+    results = tasks.run(raise_on_error=True)
+
+    review_node_id = None
+    if review_commit:
+        review, review_node_id = results["review"].value
         typer.echo(review)
 
+    if all_failures:
+        failures = results["tests"].value if log is None else read_failures_from_log(log)
+        fix_all_failures(failures, config, graph, parent_id=review_node_id, summarize_only=summarize_only,
+                         dry_run=dry_run, batch=batch, jobs=jobs)
+        return
+
     if log is not None:
         typer.echo(f"[run_and_fix] ❌ reading stack trace from log: {log}\n")
         traceback = log.read_text()
     else:
-        test_name, traceback = run_and_get_first_failure(test, config)
+        test_name, traceback = results["tests"].value
         typer.echo(f"[run_and_fix] ❌ First failed test: {test_name}\n")
     
     if summarize_only:
@@ -66,6 +102,13 @@ def run(
                       operation_type="fix")
 
 
+def report_parse_cache():
+  stats = parse_cache_stats()
+  if stats["hit_rate"] is not None:
+    typer.echo(f"[run_and_fix] 🌳 Parse cache: {stats['hit_rate']:.0%} hits "
+               f"({stats['hits']}/{stats['hits'] + stats['misses']}), {stats['evictions']} evictions")
+
+
 def run_and_get_first_failure(test, config):
   typer.echo("[run_and_fix] Running pytest...")
   if test:
@@ -83,3 +126,101 @@ def run_and_get_first_failure(test, config):
     raise typer.Exit(code=0)
 
   return get_first_failure(tracebacks)
+
+
+def run_and_get_all_failures(test, config) -> List[str]:
+  typer.echo("[run_and_fix] Running pytest...")
+  if test:
+    test_name, traceback = run_and_get_first_failure(test, config)
+    return [f"{test_name}\n{traceback}"]
+
+  typer.echo("[run_and_fix] Running full test suite...")
+  failure_count, tracebacks = run_test(config)
+  if failure_count == 0:
+    typer.echo("[run_and_fix] ✅ All tests passed. Nothing to fix.")
+    raise typer.Exit(code=0)
+
+  return tracebacks
+
+
+def read_failures_from_log(log: Path) -> List[str]:
+  typer.echo(f"[run_and_fix] ❌ reading stack traces from log: {log}\n")
+  output = log.read_text()
+  _, blocks = extract_failures_blocks(output)
+  if not blocks:
+    # Not a pytest report: treat the whole log as one traceback
+    return [f"{log.name}\n{output}"]
+  return blocks
+
+
+def fix_all_failures(failures: List[str], config: dict, graph: MemoryGraph,
+                     parent_id: Optional[str] = None, summarize_only: bool = False,
+                     dry_run: bool = False, batch: bool = False, jobs: Optional[int] = None) -> None:
+  """
+  Cluster failures by traceback signature, summarize and plan a fix for each
+  cluster concurrently, then apply the plans grouped by the files they touch
+  (one change per group, or one batch).
+  """
+  clusters = cluster_failures(failures)
+  typer.echo(f"[run_and_fix] ❌ {len(failures)} failing test(s) in {len(clusters)} cluster(s)")
+  for cluster in clusters:
+    typer.echo(f"  {cluster.count:>4} × {cluster.exception} [{cluster.signature}] e.g. {cluster.names[0]}")
+
+  # Tasks are keyed by signature: tests in different files can share a name
+  tasks = TaskGraph(config, graph, max_workers=jobs)
+  labels = {}
+  for cluster in clusters:
+    traceback = format_cluster(cluster)
+    if summarize_only:
+      work = lambda results, tb=traceback: summarize_traceback(tb, config, graph=graph, parent_id=parent_id)
+    else:
+      work = lambda results, tb=traceback: analyze_failure_with_llm(tb, config, graph=graph, parent_id=parent_id)
+    labels[cluster.signature] = cluster.names[0] if cluster.count == 1 else f"{cluster.names[0]} (+{cluster.count - 1})"
+    tasks.add_task(cluster.signature, work)
+  results = tasks.run()
+
+  completed = [(labels[key], result.value) for key, result in results.items() if result.status == "COMPLETED"]
+  for key, result in results.items():
+    if result.status != "COMPLETED":
+      typer.echo(f"[run_and_fix] ⚠️  Analysis failed for {labels[key]}: {result.error}")
+
+  if summarize_only:
+    for name, (summary, _) in completed:
+      typer.echo(f"[run_and_fix] 🔍 {name}:\n{summary}\n")
+    return
+
+  plans = [(name, fix_plan, analyze_id) for name, (fix_plan, analyze_id) in completed
+           if fix_plan and fix_plan.get("edits")]
+  if not plans:
+    typer.echo("[run_and_fix] ❌ No applicable fix plans.")
+    raise typer.Exit(code=1)
+
+  if batch:
+    groups = [list(range(len(plans)))]
+  else:
+    groups = group_change_plans([plan for _, plan, _ in plans])
+  typer.echo(f"[run_and_fix] 🛠 {len(plans)} fix plan(s) in {len(groups)} change(s)")
+
+  applied = 0
+  for group in groups:
+    names = [plans[i][0] for i in group]
+    merged = merge_change_plans([plans[i][1] for i in group])
+    file_paths, message = describe_change_plan(merged, config)
+    typer.echo(f"🧾 Fixes for {', '.join(names)}:\n{merged['fix_description']}")
+
+    if dry_run:
+      continue
+    try:
+      apply_code_change(description=merged["fix_description"],
+                        file_paths=file_paths, message=message,
+                        config=config, graph=graph, parent_id=plans[group[0]][2],
+                        operation_type="fix")
+      applied += 1
+    except RuntimeError as e:
+      # apply_code_change already rolled back; the other groups are independent
+      typer.echo(f"[run_and_fix] ❌ Could not apply fixes for {', '.join(names)}: {e}")
+
+  if dry_run:
+    typer.echo("🎯 Dry run, not applying changes")
+    return
+  typer.echo(f"[run_and_fix] ✅ Applied {applied}/{len(groups)} change(s)")
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.memory.stats import (
+    LATENCY_METRICS,
+    collect_llm_stats,
+    parse_window,
+    summarize_llm_stats,
+)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def run(
+    graph_path: Path = typer.Option("memory_graph.json", help="Path to the memory graph file"),
+    since: str = typer.Option(None, "--since", help="Only include calls from this window, e.g. 30m, 24h, 7d"),
+    by: str = typer.Option("both", "--by", help="Group by 'template', 'model' or 'both'"),
+    as_json: bool = typer.Option(False, "--json", help="Print the aggregated stats as JSON"),
+):
+    """
+    Aggregate per-call LLM telemetry (TTFT, latency, throughput, tokens) stored on graph nodes.
+    """
+    if by not in ("template", "model", "both"):
+        raise typer.BadParameter("--by must be 'template', 'model' or 'both'")
+    try:
+        window = parse_window(since) if since else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    records = collect_llm_stats(MemoryGraph(storage_path=graph_path), since=window)
+    groupings = ["template", "model"] if by == "both" else [by]
+    report = {group_by: summarize_llm_stats(records, group_by) for group_by in groupings}
+
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    window_label = f" in the last {since}" if since else ""
+    typer.echo(f"📊 {len(records)} LLM calls{window_label}")
+    for group_by, summary in report.items():
+        typer.echo(f"\n=== By {group_by} ===")
+        for name, entry in summary.items():
+            typer.echo(f"{name}: {entry['calls']} calls, cache hits {entry['cache_hit_rate']:.0%}, "
+                       f"tokens in/out {entry['input_tokens']}/{entry['output_tokens']}")
+            for metric in LATENCY_METRICS:
+                p = entry[metric]
+                typer.echo(f"  {metric:<26} p50 {_fmt(p['p50'])}  p95 {_fmt(p['p95'])}  p99 {_fmt(p['p99'])}")
@@ -1,19 +1,38 @@
+import contextvars
+import json
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Any, Tuple, Optional, List
 
+import typer
+
 from cybermule.executors.llm_runner import llm_run_and_store, run_llm_and_store
 from cybermule.memory.memory_graph import MemoryGraph
 from cybermule.symbol_resolution import (
+    extract_called_symbols_in_function,
+    extract_called_symbols_on_line,
+    parse_batch,
     resolve_symbol,
     resolve_symbol_in_function,
     extract_definition_by_callsite,
 )
 
 from cybermule.utils.context_extract import (
+    DEFAULT_CONTEXT_TOKEN_BUDGET,
+    assemble_contexts,
     extract_locations,
-    get_context_snippets,
+    is_project_file,
 )
+from cybermule.utils.config_loader import with_llm_options
 from cybermule.utils.parsing import extract_first_json_block, extract_tagged_blocks
+from cybermule.utils.token_utils import estimate_tokens
+
+FIX_TEMPLATE = "generate_fix_from_summary.j2"
+DEFAULT_SPECULATIVE_TEMPERATURES = (0.2, 0.6, 1.0)
+DEFAULT_CONTEXT_WORKERS = 8
+DEFAULT_PREFETCH_TOKEN_BUDGET = 2000
+DEFAULT_PREFETCH_FRAMES = 3
 
 
 def summarize_traceback(
@@ -38,6 +57,7 @@ def summarize_traceback(
         prompt_template="summarize_traceback.j2",
         variables={"TRACEBACK": traceback},
         status="SUMMARIZED",
+        validate=lambda r: bool(extract_tagged_blocks(r, tag="error_summary")),
         postprocess=lambda r: {
             "error_summary": extract_tagged_blocks(r, tag="error_summary")[0]
         })
@@ -45,61 +65,369 @@ def summarize_traceback(
     return metadata['error_summary'], node_id
 
 
-def fulfill_context_requests(required_info: List[Dict], project_root: Path) -> List[Dict]:
+def _resolve_context_request(info: Dict, project_root: Path) -> Optional[Dict]:
+    symbol = info.get("symbol")
+    ref_path = info.get("ref_path")
+    ref_function = info.get("ref_function")
+    # The required_info returned by llm can be fuzzy,
+    # lineno may not be well-formed.
+    # we may get something like "around line 42"
+    try:
+        lineno = int(info.get("lineno"))
+    except (ValueError, TypeError):
+        lineno = None
+
+    result = None
+
+    # Strategy 1: Use ref_function inside known file
+    if symbol and ref_path and ref_function:
+        result = resolve_symbol_in_function(
+            ref_path=Path(ref_path),
+            ref_function=ref_function,
+            symbol=symbol,
+            project_root=project_root,
+        )
+
+    # Strategy 2: Use callsite line number
+    if result is None and symbol and ref_path and lineno:
+        result = extract_definition_by_callsite(
+            path=Path(ref_path),
+            line=lineno,
+            symbol=symbol,
+            project_root=project_root,
+        )
+
+    # Strategy 3: Fallback: global symbol resolution
+    if result is None and symbol:
+        result = resolve_symbol(symbol=symbol, project_root=project_root,
+                                ref_path=Path(ref_path) if ref_path else None)
+
+    if result:
+        result.update({
+            "traceback_line": lineno or result.get("start_line"),
+        })
+    return result
+
+
+def fulfill_context_requests(required_info: List[Dict], project_root: Path,
+                             max_workers: Optional[int] = None) -> List[Dict]:
     """
     Resolve all LLM context requests to symbol definitions.
     Priority:
       1. ref_path + ref_function + symbol → resolve_symbol_in_function
       2. ref_path + lineno + symbol → extract_definition_by_callsite
       3. symbol → resolve_symbol
+    Requests are resolved concurrently; files shared between them are parsed once
+    and results are deduplicated by (file, symbol, start_line), in request order.
     Returns a list of context dicts: {file, symbol, snippet, start_line, traceback_line}
     """
+    requests = list({json.dumps(info, sort_keys=True, default=str): info for info in required_info}.values())
+    if not requests:
+        return []
+
+    with parse_batch():
+        if len(requests) == 1:
+            resolved = [_resolve_context_request(requests[0], project_root)]
+        else:
+            workers = min(max_workers or DEFAULT_CONTEXT_WORKERS, len(requests))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Each worker runs in a copy of this context so it sees the batch's parse memo
+                futures = [pool.submit(contextvars.copy_context().run, _resolve_context_request, info, project_root)
+                           for info in requests]
+                resolved = [future.result() for future in futures]
+
+    results, seen = [], set()
+    for result in resolved:
+        if not result:
+            continue
+        key = (result.get("file"), result.get("symbol"), result.get("start_line"))
+        if key in seen:
+            continue
+        seen.add(key)
+        results.append(result)
+    return results
+
 
-    results = []
+def _context_key(context: Dict) -> Tuple:
+    return context.get("file"), context.get("symbol"), context.get("start_line")
 
-    for info in required_info:
-        symbol = info.get("symbol")
-        ref_path = info.get("ref_path")
-        ref_function = info.get("ref_function")
-        # The required_info returned by llm can be fuzzy,
-        # lineno may not be well-formed.
-        # we may get something like "around line 42"
+
+def prefetch_contexts(
+    locations: List[Dict],
+    contexts: List[Dict],
+    config: Dict[str, Any],
+    project_root: Path,
+) -> List[Dict]:
+    """
+    Resolve the definitions the model is most likely to ask for before it asks.
+
+    Candidates are the callees on the failing line and the other calls made by the
+    failing function, for the innermost `fix.prefetch_frames` project frames. They are
+    ranked by frame depth (raise site first), then line callees before other calls,
+    and packed greedily into `fix.prefetch_token_budget` tokens. Frames outside
+    `project_root` or in installed packages (see `is_project_file`) are skipped.
+
+    Returns:
+        The prefetched contexts, not including any already in `contexts`.
+    """
+    fix_cfg = config.get("fix", {})
+    budget = fix_cfg.get("prefetch_token_budget", DEFAULT_PREFETCH_TOKEN_BUDGET)
+    max_frames = fix_cfg.get("prefetch_frames", DEFAULT_PREFETCH_FRAMES)
+    if not budget or not max_frames:
+        return []
+
+    frames, seen_frames = [], set()
+    for loc in reversed(locations):
+        key = (loc["file"], loc["line"])
+        if key not in seen_frames and Path(loc["file"]).exists() and is_project_file(loc["file"], project_root):
+            seen_frames.add(key)
+            frames.append(loc)
+        if len(frames) == max_frames:
+            break
+
+    required_info = []
+    with parse_batch():
+        for loc in frames:
+            path = Path(loc["file"])
+            on_line = extract_called_symbols_on_line(path, loc["line"])
+            required_info.extend({"symbol": symbol, "ref_path": loc["file"], "lineno": loc["line"]}
+                                 for symbol in on_line)
+            try:
+                in_function = extract_called_symbols_in_function(path, loc["function"])
+            except Exception:
+                in_function = []
+            required_info.extend({"symbol": symbol}
+                                 for symbol in dict.fromkeys(in_function) if symbol not in on_line)
+
+        # Requests are in rank order, and so are the deduplicated results
         try:
-            lineno = int(info.get("lineno"))
-        except (ValueError, TypeError):
-            lineno = None
-
-        result = None
-
-        # Strategy 1: Use ref_function inside known file
-        if symbol and ref_path and ref_function:
-            result = resolve_symbol_in_function(
-                ref_path=Path(ref_path),
-                ref_function=ref_function,
-                symbol=symbol,
-                project_root=project_root,
-            )
+            resolved = fulfill_context_requests(required_info, project_root,
+                                                max_workers=fix_cfg.get("context_workers"))
+        except Exception as e:
+            # Prefetching is only an optimization; the model can still ask for context
+            typer.echo(f"[analyzer] ⚠️  Context prefetch failed: {e}")
+            return []
+
+    shown = {_context_key(ctx) for ctx in contexts}
+    prefetched, used = [], 0
+    for ctx in resolved:
+        tokens = estimate_tokens(ctx.get("snippet", ""))
+        if _context_key(ctx) in shown or used + tokens > budget:
+            continue
+        prefetched.append(ctx)
+        used += tokens
+    return prefetched
+
+
+def prefetch_hit_stats(prefetched: List[Dict], requested_symbols: set) -> Dict[str, Any]:
+    """
+    How well the prefetch anticipated the model: `requested` are the symbols the model
+    asked for or edited, `hits` those of them that were already prefetched.
+    """
+    prefetched_symbols = {ctx.get("symbol") for ctx in prefetched if ctx.get("symbol")}
+    requested = sorted(s for s in requested_symbols if s)
+    hits = [s for s in requested if s in prefetched_symbols or s.split(".")[-1] in prefetched_symbols]
+    return {
+        "symbols": sorted(prefetched_symbols),
+        "tokens": sum(estimate_tokens(ctx.get("snippet", "")) for ctx in prefetched),
+        "requested": requested,
+        "hits": hits,
+        "hit_rate": len(hits) / len(requested) if requested else None,
+    }
+
+
+def _plan_symbols(fix_plan: Optional[dict]) -> set:
+    plan = fix_plan or {}
+    return ({info.get("symbol") for info in plan.get("required_info") or []}
+            | {edit.get("symbol") for edit in plan.get("edits") or []})
+
+
+def _symbol_in_contexts(symbol: Optional[str], contexts: List[Dict]) -> bool:
+    if not symbol:
+        return False
+    names = {ctx.get("symbol") for ctx in contexts}
+    return symbol in names or symbol.split(".")[-1] in names
+
+
+def is_applicable_fix_plan(fix_plan: Optional[dict], contexts: List[Dict]) -> bool:
+    """A finalized fix plan whose edited symbols were all shown to the model."""
+    if not fix_plan or fix_plan.get("needs_more_context"):
+        return False
+    edits = fix_plan.get("edits") or []
+    return bool(edits) and all(_symbol_in_contexts(edit.get("symbol"), contexts) for edit in edits)
+
+
+def _candidate_configs(config: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+    """Spread speculative candidates over the configured temperatures and models."""
+    fix_cfg = config.get("fix", {})
+    temperatures = fix_cfg.get("speculative_temperatures") or DEFAULT_SPECULATIVE_TEMPERATURES
+    models = fix_cfg.get("speculative_models") or []
+
+    configs = []
+    for i in range(count):
+        candidate = with_llm_options(config, temperature=temperatures[i % len(temperatures)])
+        if models:
+            # An explicit candidate model replaces the template's routing cascade
+            routing = {**config.get("model_routing", {}), FIX_TEMPLATE: [models[i % len(models)]]}
+            candidate = {**candidate, "model_routing": routing}
+        configs.append(candidate)
+    return configs
+
+
+def _race_fix_candidates(
+    config: Dict[str, Any],
+    graph: MemoryGraph,
+    parent_id: Optional[str],
+    variables: Dict[str, Any],
+    contexts: List[Dict],
+    round_num: int,
+    count: int,
+) -> Tuple[Optional[str], Dict[str, dict]]:
+    """
+    Request `count` fix plans concurrently, each recorded as a sibling node.
+
+    Returns as soon as one candidate is applicable. Candidates that have not started
+    are cancelled. Running ones make no further LLM calls or graph writes. Every
+    candidate node ends FIX_FINALIZED, REJECTED, CANCELLED or FAILED.
 
-        # Strategy 2: Use callsite line number
-        if result is None and symbol and ref_path and lineno:
-            result = extract_definition_by_callsite(
-                path=Path(ref_path),
-                line=lineno,
-                symbol=symbol,
-                project_root=project_root,
+    Returns:
+        (winner_node_id or None, {node_id: fix_plan} for every finished candidate)
+    """
+    configs = _candidate_configs(config, count)
+    tags = ["fix", "candidate"]
+    node_ids = [graph.new("Generate fix plan", parent_id=parent_id, tags=tags)
+                for _ in range(count)]
+    decided = threading.Event()
+
+    def run_candidate(i: int) -> dict:
+        llm_cfg = configs[i].get("litellm", {})
+        try:
+            _, metadata = run_llm_and_store(
+                config=configs[i],
+                graph=graph,
+                node_id=node_ids[i],
+                prompt_template=FIX_TEMPLATE,
+                variables=variables,
+                status=f"FIX_ATTEMPT_{round_num + 1}",
+                tags=tags,
+                extra={"candidate_index": i, "temperature": llm_cfg.get("temperature")},
+                validate=lambda r: extract_first_json_block(r) is not None,
+                postprocess=lambda r: {
+                    "fix_plan": extract_first_json_block(r)
+                },
+                cancelled=decided.is_set,
             )
+        except CancelledError:
+            graph.update(node_ids[i], status="CANCELLED")
+            raise
+        if decided.is_set():
+            # Finished just as another candidate won; its plan is never considered
+            graph.update(node_ids[i], status="CANCELLED")
+            raise CancelledError()
+        return metadata["fix_plan"]
+
+    plans: Dict[str, dict] = {}
+    winner = None
+    pool = ThreadPoolExecutor(max_workers=count)
+    futures = {pool.submit(run_candidate, i): node_ids[i] for i in range(count)}
+    try:
+        for future in as_completed(futures):
+            node_id = futures[future]
+            try:
+                plans[node_id] = future.result() or {}
+            except CancelledError:
+                continue
+            except Exception as e:
+                typer.echo(f"[generate_fix_from_summary] Candidate {node_id} failed: {e}")
+                graph.update(node_id, status="FAILED", error=str(e))
+                continue
+            if is_applicable_fix_plan(plans[node_id], contexts):
+                winner = node_id
+                break
+    finally:
+        decided.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    for future, node_id in futures.items():
+        if node_id == winner:
+            graph.update(node_id, status="FIX_FINALIZED", speculative_winner=True)
+        elif node_id in plans:
+            graph.update(node_id, status="REJECTED")
+        elif not future.done() or future.cancelled():
+            # Still running candidates stop at their next check and keep this status
+            graph.update(node_id, status="CANCELLED")
+        elif isinstance(future.exception(), CancelledError):
+            continue    # the candidate already marked itself CANCELLED
+        elif future.exception() is not None:
+            graph.update(node_id, status="FAILED", error=str(future.exception()))
+        else:
+            # Finished after the winner but before the pool was shut down
+            graph.update(node_id, status="REJECTED")
+
+    return winner, plans
+
+
+def _generate_fix_speculatively(
+    error_summary: str,
+    contexts: List[Dict],
+    config: Dict[str, Any],
+    graph: MemoryGraph,
+    parent_id: Optional[str],
+    project_root: Path,
+    max_rounds: int,
+    count: int,
+    prefetched: List[Dict],
+) -> Tuple[dict, Optional[str]]:
+    fix_plan, node_id = {}, None
+    requested_symbols = set()
 
-        # Strategy 3: Fallback: global symbol resolution
-        if result is None and symbol:
-            result = resolve_symbol(symbol=symbol, project_root=project_root)
+    def finish(plan: dict, plan_node_id: Optional[str]) -> Tuple[dict, Optional[str]]:
+        if plan_node_id is not None:
+            graph.update(plan_node_id, prefetch=prefetch_hit_stats(
+                prefetched, requested_symbols | _plan_symbols(plan)))
+        return plan, plan_node_id
 
-        if result:
-            result.update({
-                "traceback_line": lineno or result.get("start_line"),
-            })
-            results.append(result)
+    for round_num in range(max_rounds):
+        shown_contexts = contexts[:]
+        variables = {"ERROR_SUMMARY": error_summary, "CODE_CONTEXTS": shown_contexts}
+        winner, plans = _race_fix_candidates(
+            config, graph, parent_id, variables, shown_contexts, round_num, count)
+
+        if winner is not None:
+            return finish(plans[winner], winner)
+        if not plans:
+            break
+
+        # Pool every candidate's context request into the next round
+        required_info, seen = [], set()
+        for candidate_id, plan in plans.items():
+            if plan.get("needs_more_context"):
+                for info in plan.get("required_info", []):
+                    key = (info.get("symbol"), info.get("ref_path"), info.get("ref_function"))
+                    if key not in seen:
+                        seen.add(key)
+                        required_info.append(info)
+                        requested_symbols.add(info.get("symbol"))
+            else:
+                fix_plan, node_id = plan, candidate_id
+
+        if not required_info:
+            # Only plans touching symbols outside CODE_CONTEXTS; take one as-is
+            if node_id is not None:
+                graph.update(node_id, status="FIX_FINALIZED")
+            return finish(fix_plan, node_id)
+
+        if node_id is None:
+            node_id, fix_plan = next(iter(plans.items()))
+
+        contexts.extend(fulfill_context_requests(
+            required_info=required_info,
+            project_root=project_root,
+            max_workers=config.get("fix", {}).get("context_workers"),
+        ))
 
-    return results
+    # Return last attempt even if not finalized
+    return finish(fix_plan, node_id)
 
 
 def generate_fix_from_summary(
@@ -108,35 +436,57 @@ def generate_fix_from_summary(
     config: Dict[str, Any],
     graph: Optional[MemoryGraph],
     parent_id: Optional[str],
-    max_rounds: int = 3
+    max_rounds: int = 3,
+    candidates: Optional[int] = None,
 ) -> Tuple[dict, Optional[str]]:
     """
     Use an LLM to generate a structured code fix plan, retrying if more context is requested.
 
+    When the model keeps asking for context it has already been given (or that cannot be
+    resolved), later rounds start one step further up the `model_routing` cascade.
+
+    With `candidates` (or `fix.speculative_candidates`) above 1, each round asks for that
+    many plans concurrently at different temperatures/models and takes the first one whose
+    edited symbols all appear in CODE_CONTEXTS; every candidate is kept as a sibling node.
+
     Returns:
         (fix_plan: dict, node_id: Optional[str])
     """
+    project_root = Path(config.get("project_root", "."))
     base_locations = extract_locations(traceback)
-    base_contexts = get_context_snippets(base_locations)
+    base_contexts = assemble_contexts(
+        base_locations, project_root,
+        token_budget=config.get("fix", {}).get("context_token_budget", DEFAULT_CONTEXT_TOKEN_BUDGET))
+    # Callees of the failing frames, shown up front to save needs_more_context rounds
+    prefetched = prefetch_contexts(base_locations, base_contexts, config, project_root)
 
-    project_root = Path(config.get("project_root", "."))
+    current_contexts = base_contexts + prefetched
+
+    candidates = candidates or config.get("fix", {}).get("speculative_candidates", 1)
+    if candidates > 1:
+        return _generate_fix_speculatively(
+            error_summary, current_contexts, config, graph, parent_id,
+            project_root, max_rounds, candidates, prefetched)
 
-    current_contexts = base_contexts[:]
     node_id = graph.new("Generate fix plan", parent_id=parent_id, tags=["fix"])
 
     fix_plan = {}
+    route_level = 0
+    requested_symbols = set()
 
     for round_num in range(max_rounds):
         _, metadata = run_llm_and_store(
             config=config,
             graph=graph,
             node_id=node_id,
-            prompt_template="generate_fix_from_summary.j2",
+            prompt_template=FIX_TEMPLATE,
             variables={
                 "ERROR_SUMMARY": error_summary,
                 "CODE_CONTEXTS": current_contexts
             },
             status=f"FIX_ATTEMPT_{round_num + 1}",
+            validate=lambda r: extract_first_json_block(r) is not None,
+            min_route_level=route_level,
             postprocess=lambda r: {
                 "fix_plan": extract_first_json_block(r)
             }
@@ -151,16 +501,26 @@ def generate_fix_from_summary(
         required_info = fix_plan.get("required_info", [])
 
         if not needs_more or not required_info:
-            graph.update(node_id, status="FIX_FINALIZED")
+            graph.update(node_id, status="FIX_FINALIZED",
+                         prefetch=prefetch_hit_stats(prefetched, requested_symbols | _plan_symbols(fix_plan)))
             return fix_plan, node_id
 
         # Fulfill LLM's request for more symbol context
-        current_contexts.extend(fulfill_context_requests(
+        new_contexts = fulfill_context_requests(
             required_info=required_info,
-            project_root=project_root
-        ))
+            project_root=project_root,
+            max_workers=config.get("fix", {}).get("context_workers"),
+        )
+        current_contexts.extend(new_contexts)
+
+        # A context loop: nothing new to show the model, so escalate to a stronger one
+        symbols = {info.get("symbol") for info in required_info}
+        if not new_contexts or symbols <= requested_symbols:
+            route_level += 1
+        requested_symbols |= symbols
 
     # Return last attempt even if not finalized
+    graph.update(node_id, prefetch=prefetch_hit_stats(prefetched, requested_symbols | _plan_symbols(fix_plan)))
     return fix_plan, node_id
 
 def analyze_failure_with_llm(
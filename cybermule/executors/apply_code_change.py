@@ -3,6 +3,7 @@ import typer
 
 from typing import Dict, List, Optional, Tuple
 from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.symbol_resolution.incremental import refresh_after_change
 from cybermule.utils.aider_engine import apply_with_aider
 from cybermule.utils.config_loader import get_aider_extra_args, get_prompt_path
 from cybermule.utils.git_utils import get_commits_since, get_latest_commit_sha, run_git_command
@@ -40,6 +41,42 @@ def describe_change_plan(change_plan: Dict, config: dict) -> Tuple[List[str], st
     return file_paths, message
 
 
+def group_change_plans(change_plans: List[Dict]) -> List[List[int]]:
+    """
+    Group change plans that touch overlapping files.
+
+    Plans in different groups edit disjoint sets of files, so each group can be
+    applied (and committed) independently.
+
+    Returns:
+        Lists of indexes into `change_plans`, in order of first appearance.
+    """
+    group_of_file: Dict[str, int] = {}
+    groups: Dict[int, List[int]] = {}
+
+    for index, plan in enumerate(change_plans):
+        files = {edit["file"] for edit in plan.get("edits", [])}
+        merged = sorted({group_of_file[f] for f in files if f in group_of_file})
+        target = merged[0] if merged else index
+        members = groups.setdefault(target, [])
+        for other in merged[1:]:
+            members.extend(groups.pop(other))
+        members.append(index)
+        for i in members:
+            for edit in change_plans[i].get("edits", []):
+                group_of_file[edit["file"]] = target
+
+    return [sorted(members) for _, members in sorted(groups.items())]
+
+
+def merge_change_plans(change_plans: List[Dict]) -> Dict:
+    """Combine several change plans into one plan holding all of their edits."""
+    return {
+        "fix_description": "\n".join(p.get("fix_description", "") for p in change_plans if p.get("fix_description")),
+        "edits": [edit for plan in change_plans for edit in plan.get("edits", [])],
+    }
+
+
 def apply_code_change(
     description, message, file_paths,
     config: dict,
@@ -63,7 +100,16 @@ def apply_code_change(
         raise RuntimeError("[apply_code_change] Aider failed to apply the fix.")
     
     post_shas = get_commits_since(pre_sha)
-    
+
+    # Later lookups in this process should see the edited code
+    try:
+        reparsed = refresh_after_change(pre_sha)
+        if reparsed["incremental"] or reparsed["full"]:
+            typer.echo(f"[apply_code_change] 🌳 Re-parsed {reparsed['incremental']} file(s) incrementally, "
+                       f"{reparsed['full']} in full; re-indexed {reparsed['indexed']}")
+    except Exception as e:
+        typer.echo(f"[apply_code_change] ⚠️  Could not refresh parsed trees: {e}")
+
     node_id = None
     if graph:
         node_id = graph.new(f"Apply {operation_type}", parent_id=parent_id,
@@ -0,0 +1,91 @@
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import typer
+
+from cybermule.memory.history_utils import extract_chat_history, format_chat_history_as_text
+from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.providers.llm_provider import get_llm_provider
+from cybermule.utils.config_loader import get_prompt_path
+from cybermule.utils.parsing import extract_tagged_blocks
+from cybermule.utils.template_utils import render_template
+from cybermule.utils.token_utils import estimate_message_tokens
+
+CHECKPOINT_PROMPT = "Summarize our conversation so far."
+CHECKPOINT_TEMPLATE = "summarize_history.j2"
+
+# Siblings created concurrently (speculative candidates, task-graph tasks) share a parent;
+# one lock per parent makes them wait for a single digest instead of each writing one
+_parent_locks: Dict[str, threading.Lock] = {}
+_parent_locks_guard = threading.Lock()
+
+
+def _parent_lock(parent_id: str) -> threading.Lock:
+    with _parent_locks_guard:
+        return _parent_locks.setdefault(parent_id, threading.Lock())
+
+
+def _existing_checkpoint(graph: MemoryGraph, parent_id: str) -> Optional[str]:
+    for child in graph.children_of(parent_id):
+        if child.get("checkpoint") and child.get("response"):
+            return child["id"]
+    return None
+
+
+def create_checkpoint(config: Dict[str, Any], graph: MemoryGraph, parent_id: str) -> str:
+    """
+    Digest the ancestry of `parent_id` into a new checkpoint node under it.
+
+    The digest is generated once and cached on the node as its response, so every
+    later descendant sees a short, constant-size history.
+    """
+    history = extract_chat_history(parent_id, memory=graph)
+
+    prompt_path = get_prompt_path(config, name=CHECKPOINT_TEMPLATE)
+    prompt = render_template(Path(prompt_path),
+                             template_vars={"HISTORY": format_chat_history_as_text(history)})
+    response = get_llm_provider(config).generate(prompt)
+    digests = extract_tagged_blocks(response, tag="digest")
+    digest = digests[0].strip() if digests else response.strip()
+
+    checkpoint_id = graph.new("Checkpoint history", parent_id=parent_id, tags=["checkpoint"])
+    graph.update(
+        checkpoint_id,
+        prompt=CHECKPOINT_PROMPT,
+        response=digest,
+        prompt_template=CHECKPOINT_TEMPLATE,
+        status="CHECKPOINTED",
+        checkpoint=True,
+        checkpoint_tokens=estimate_message_tokens(history),
+    )
+    return checkpoint_id
+
+
+def maybe_insert_checkpoint(config: Dict[str, Any], graph: MemoryGraph, node_id: str) -> Optional[str]:
+    """
+    Insert a checkpoint between `node_id` and its parent once the ancestry of the
+    parent crosses `history.checkpoint_tokens` tokens.
+
+    Returns:
+        The checkpoint node ID now parenting `node_id`, or None if no checkpoint was needed.
+    """
+    threshold = config.get("history", {}).get("checkpoint_tokens")
+    parent_id = graph.parent_id_of(node_id)
+    if not threshold or not parent_id:
+        return None
+
+    checkpoint_id = _existing_checkpoint(graph, parent_id)
+    if checkpoint_id is None:
+        with _parent_lock(parent_id):
+            # Another sibling may have written the checkpoint while this one waited
+            checkpoint_id = _existing_checkpoint(graph, parent_id)
+            if checkpoint_id is None:
+                tokens = estimate_message_tokens(extract_chat_history(parent_id, memory=graph))
+                if tokens < threshold:
+                    return None
+                typer.echo(f"[checkpoint] 📌 History reached ~{tokens} tokens, writing a checkpoint digest")
+                checkpoint_id = create_checkpoint(config, graph, parent_id)
+
+    graph.reparent(node_id, checkpoint_id)
+    return checkpoint_id
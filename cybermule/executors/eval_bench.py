@@ -0,0 +1,157 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import typer
+
+from cybermule.memory.history_utils import extract_chat_history
+from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.memory.stats import percentile
+from cybermule.providers.llm_provider import get_llm_provider
+from cybermule.utils.config_loader import get_prompt_path
+from cybermule.utils.parsing import extract_first_json_block, extract_tagged_blocks
+from cybermule.utils.template_utils import render_template
+from cybermule.utils.token_utils import estimate_cost
+
+DEFAULT_BENCH_WORKERS = 4
+
+# Response tags the prompts in this repo ask for, checked when inferring a scorer
+KNOWN_TAGS = ("error_summary", "digest", "error_analysis")
+
+
+class BenchCase(NamedTuple):
+    node_id: str
+    prompt_template: str
+    variables: Dict[str, Any]
+    response: str
+    history: List[Dict[str, Any]]
+
+
+class BenchRun(NamedTuple):
+    variant: str
+    case_id: str
+    success: bool
+    latency: float
+    input_tokens: int
+    output_tokens: int
+    cache_hit: bool
+    cost: Optional[float]
+    error: Optional[str] = None
+
+
+def load_cases(graph: MemoryGraph, tag: str, limit: Optional[int] = None) -> List[BenchCase]:
+    """Collect recorded LLM nodes carrying `tag` (e.g. "traceback", "fix") as benchmark cases."""
+    cases = []
+    for node in sorted(graph.list(), key=lambda n: n.get("timestamp", "")):
+        if tag not in (node.get("tags") or []) or not node.get("prompt_template") or "variables" not in node:
+            continue
+        cases.append(BenchCase(
+            node_id=node["id"],
+            prompt_template=node["prompt_template"],
+            variables=node["variables"],
+            response=node.get("response") or "",
+            history=extract_chat_history(node["parent"], memory=graph) if node.get("parent") else [],
+        ))
+    return cases[-limit:] if limit else cases
+
+
+def make_scorer(expect: str) -> Callable[[str], bool]:
+    """
+    Build a success check from an expectation:
+    "json" (a parseable JSON block), "tag:<name>" (a <name> block) or "any" (non-empty).
+    """
+    if expect == "json":
+        return lambda response: extract_first_json_block(response) is not None
+    if expect.startswith("tag:"):
+        tag = expect[len("tag:"):]
+
+        def has_tag(response: str) -> bool:
+            try:
+                return bool(extract_tagged_blocks(response, tag))
+            except ValueError:
+                return False
+        return has_tag
+    if expect == "any":
+        return lambda response: bool(response.strip())
+    raise ValueError(f"Unknown expectation '{expect}', expected json, tag:<name> or any")
+
+
+def infer_expectation(cases: List[BenchCase]) -> str:
+    """Guess what a good output looks like from the recorded responses."""
+    responses = [case.response for case in cases if case.response]
+    for tag in KNOWN_TAGS:
+        if responses and all(f"<{tag}>" in r for r in responses):
+            return f"tag:{tag}"
+    if responses and all(extract_first_json_block(r) is not None for r in responses):
+        return "json"
+    return "any"
+
+
+def _run_case(provider, config: dict, model: str, variant: str, case: BenchCase,
+              scorer: Callable[[str], bool]) -> BenchRun:
+    try:
+        prompt = render_template(Path(get_prompt_path(config, name=variant)), template_vars=case.variables)
+        started = time.perf_counter()
+        response = provider.generate(prompt, history=case.history)
+        latency = time.perf_counter() - started
+    except Exception as e:
+        return BenchRun(variant=variant, case_id=case.node_id, success=False, latency=0.0,
+                        input_tokens=0, output_tokens=0, cache_hit=False, cost=None, error=str(e))
+
+    stats = getattr(provider, "last_call_stats", None)
+    stats = stats if isinstance(stats, dict) else {}
+    input_tokens = stats.get("input_tokens") or 0
+    output_tokens = stats.get("output_tokens") or 0
+    cache_hit = bool(stats.get("cache_hit"))
+    return BenchRun(
+        variant=variant,
+        case_id=case.node_id,
+        success=scorer(response),
+        latency=stats.get("latency") or latency,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_hit=cache_hit,
+        cost=0.0 if cache_hit else estimate_cost(model, input_tokens, output_tokens),
+    )
+
+
+def run_bench(config: dict, variants: List[str], cases: List[BenchCase], expect: Optional[str] = None,
+              jobs: Optional[int] = None) -> List[BenchRun]:
+    """
+    Run every prompt variant against every case concurrently.
+
+    Calls go through the provider's response cache, so re-running a bench only pays
+    for new variant × case combinations.
+    """
+    scorer = make_scorer(expect or infer_expectation(cases))
+    provider = get_llm_provider(config)
+    model = config.get("litellm", {}).get("model", "")
+    workers = jobs or config.get("scheduler", {}).get("max_workers", DEFAULT_BENCH_WORKERS)
+
+    combos = [(variant, case) for variant in variants for case in cases]
+    typer.echo(f"[eval_bench] 🧪 {len(variants)} variants × {len(cases)} cases with {workers} workers")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda combo: _run_case(provider, config, model, combo[0], combo[1], scorer),
+                             combos))
+
+
+def summarize_bench(runs: List[BenchRun]) -> Dict[str, Dict[str, Any]]:
+    """Success rate, tokens, latency and cost per variant."""
+    summary = {}
+    for variant in dict.fromkeys(run.variant for run in runs):
+        variant_runs = [run for run in runs if run.variant == variant]
+        latencies = [run.latency for run in variant_runs if not run.cache_hit and run.error is None]
+        costs = [run.cost for run in variant_runs if run.cost is not None]
+        summary[variant] = {
+            "cases": len(variant_runs),
+            "success_rate": sum(run.success for run in variant_runs) / len(variant_runs),
+            "errors": sum(1 for run in variant_runs if run.error),
+            "cache_hits": sum(run.cache_hit for run in variant_runs),
+            "input_tokens": sum(run.input_tokens for run in variant_runs),
+            "output_tokens": sum(run.output_tokens for run in variant_runs),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "cost": sum(costs) if costs else None,
+        }
+    return summary
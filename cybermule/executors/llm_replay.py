@@ -1,32 +1,46 @@
+import networkx as nx
+
 from cybermule.executors.llm_runner import run_llm_task
+from cybermule.executors.task_graph import TaskGraph
 from cybermule.memory.graph_utils import get_descendants
 
-def replay_subtree(root_node_id, graph, config, prompt_substitutions=None, tag="REPLAYED"):
+def replay_subtree(root_node_id, graph, config, prompt_substitutions=None, tag="REPLAYED", jobs=None,
+                   force=False):
     """
     Replays a subtree of LLM tasks starting from root_node_id using the same or updated prompt templates.
 
+    Each node is replayed as soon as its replayed parent has finished, so sibling
+    subtrees run concurrently with up to `jobs` LLM calls in flight. Nodes whose input
+    fingerprint (template, variables, model parameters, replayed history) matches the
+    original reuse its response, so only the cone below a changed node calls the LLM.
+    The replayed root is attached to the original root's parent, so replaying from a
+    node below the graph root keeps the conversation that led up to it.
+
     Args:
         root_node_id (str): ID of the root node to replay.
         graph (MemoryGraph): The memory graph instance.
         config (dict): Global config for LLM execution.
         prompt_substitutions (dict): Optional map {original_prompt_name: new_prompt_name}.
         tag (str): Tag to apply to replayed nodes.
+        jobs (int): Maximum concurrent replays (default: `scheduler.max_workers`).
+        force (bool): Re-run every node even if its inputs are unchanged.
 
     Returns:
         dict: Mapping of original node IDs to new replayed node IDs.
     """
     prompt_substitutions = prompt_substitutions or {}
-    all_nodes = [root_node_id] + sorted(
-        get_descendants(graph.graph, root_node_id),
+    subtree = [root_node_id] + get_descendants(graph.graph, root_node_id)
+    # Parents before children, otherwise in creation order
+    all_nodes = list(nx.lexicographical_topological_sort(
+        graph.graph.subgraph(subtree),
         key=lambda nid: graph.graph.nodes[nid].get("timestamp", "")
-    )
-
-    node_id_map = {}
+    ))
 
-    for original_id in all_nodes:
+    def replay_node(original_id, results):
         original = graph.get(original_id)
         parent_id = original.get("parent")
-        new_parent_id = node_id_map.get(parent_id) if parent_id else None
+        # The replayed root hangs off the original's parent so it sees the same history
+        new_parent_id = results[parent_id].value if parent_id in results else parent_id
 
         task_name = original.get("task")
         original_prompt = original.get("prompt_template")
@@ -52,9 +66,19 @@ def replay_subtree(root_node_id, graph, config, prompt_substitutions=None, tag="
             variables=variables,
             status="COMPLETED",
             tags=[tag],
-            extra=extra_data
+            extra=extra_data,
+            reuse_from=None if force else original_id,
         )
+        return new_node_id
 
-        node_id_map[original_id] = new_node_id
+    tasks = TaskGraph(config, graph, max_workers=jobs)
+    for original_id in all_nodes:
+        parent_id = graph.parent_id_of(original_id)
+        tasks.add_task(
+            original_id,
+            lambda results, original_id=original_id: replay_node(original_id, results),
+            depends_on=[parent_id] if original_id != root_node_id and parent_id else [],
+        )
+    results = tasks.run(raise_on_error=True)
 
-    return node_id_map
+    return {original_id: results[original_id].value for original_id in all_nodes}
@@ -1,12 +1,61 @@
+import hashlib
+import json
+import time
+from concurrent.futures import CancelledError
 from typing import Optional, Dict, Any, Callable, List, Tuple
 from pathlib import Path
 
+import typer
+
+from cybermule.executors.checkpoint import maybe_insert_checkpoint
 from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.memory.stats import combine_call_stats
 from cybermule.memory.tracker import log_llm_task
-from cybermule.utils.config_loader import get_prompt_path
+from cybermule.utils.config_loader import get_history_budget, get_model_route, get_prompt_path, with_model
 from cybermule.utils.template_utils import render_template
+from cybermule.utils.token_utils import estimate_cost
 from cybermule.providers.llm_provider import get_llm_provider
-from cybermule.memory.history_utils import extract_chat_history
+from cybermule.memory.history_utils import extract_chat_history, trim_chat_history
+
+
+# litellm settings that change what a model answers (credentials and transport settings don't)
+FINGERPRINT_MODEL_PARAMS = ("model", "temperature", "max_tokens", "system_prompt", "thinking_budget_tokens")
+
+
+def json_safe(value: Any) -> Any:
+    """Round-trip through JSON so values can be stored on graph nodes (unknown types become strings)."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def task_fingerprint(
+    config: dict,
+    prompt_template: str,
+    prompt: str,
+    variables: Dict[str, Any],
+    respond_prefix: Optional[str],
+    history: List[Dict[str, Any]],
+) -> str:
+    """
+    Hash the inputs that determine an LLM task's response.
+
+    Covers the rendered prompt (so any change to the template's content), the variables,
+    the model parameters and routing, and the chat history, which includes the parent's
+    (replayed) response.
+    """
+    llm_cfg = config.get("litellm", {})
+    material = {
+        "prompt": _sha256(prompt),
+        "variables": variables,
+        "respond_prefix": respond_prefix,
+        "model_params": {key: llm_cfg.get(key) for key in FINGERPRINT_MODEL_PARAMS},
+        "model_route": get_model_route(config, prompt_template),
+        "history": _sha256(json.dumps(history, sort_keys=True, default=str)),
+    }
+    return _sha256(json.dumps(material, sort_keys=True, default=str))
 
 
 def run_llm_task(
@@ -19,10 +68,21 @@ def run_llm_task(
     status: str = "COMPLETED",
     tags: Optional[List[str]] = None,
     extra: Optional[dict] = None,
+    validate: Optional[Callable[[str], bool]] = None,
+    min_route_level: int = 0,
+    reuse_from: Optional[str] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
 ) -> str:
     """
     Execute an LLM task using a prompt template, log the result to the memory graph.
 
+    If `model_routing` lists a model cascade for the template, the cheapest model is
+    tried first and the next one only when `validate` rejects the response.
+    Call telemetry (latency, TTFT, tokens, cost) is stored as `llm_stats`, summed over
+    every model the cascade tried.
+    The rendered variables and an input `fingerprint` are stored too, so a replay can
+    reuse a response (`reuse_from`) when nothing that determines it has changed.
+
     Args:
         config: Global configuration dictionary
         graph: MemoryGraph instance
@@ -33,6 +93,11 @@ def run_llm_task(
         status: Task completion status to store in the graph
         tags: Optional list of tags for the memory node
         extra: Additional metadata to log in the graph
+        validate: Optional check on the response; a failure escalates to the next routed model
+        min_route_level: Index in the model cascade to start from (e.g. after a context loop)
+        reuse_from: Node whose response is reused, without an LLM call, if its fingerprint matches
+        cancelled: Checked before each LLM call and before logging; once it returns True the
+            task stops with CancelledError and writes nothing more to the graph
 
     Returns:
         LLM-generated response text
@@ -40,12 +105,24 @@ def run_llm_task(
     prompt_path = get_prompt_path(config, name=prompt_template)
     prompt = render_template(Path(prompt_path), template_vars=variables)
 
-    llm = get_llm_provider(config)
+    maybe_insert_checkpoint(config, graph, node_id)
     history = extract_chat_history(graph.parent_id_of(node_id), memory=graph)
-    response = llm.generate(prompt, history=history, respond_prefix=respond_prefix)
 
-    extra = extra or {}
+    stored_variables = json_safe(variables)
+    fingerprint = task_fingerprint(config, prompt_template, prompt, stored_variables, respond_prefix, history)
+    extra = dict(extra or {})
 
+    memo = graph.get(reuse_from) if reuse_from else None
+    if memo is not None and memo.get("fingerprint") == fingerprint and memo.get("response") is not None:
+        typer.echo(f"[llm_runner] ♻️  Inputs of {prompt_template} unchanged, reusing response of {reuse_from}")
+        response = memo["response"]
+        extra["reused_response_of"] = reuse_from
+    else:
+        response, call_metadata = _generate_with_routing(
+            config, prompt_template, prompt, history, respond_prefix, validate, min_route_level, cancelled)
+        extra.update(call_metadata)
+
+    _raise_if_cancelled(cancelled, prompt_template)
     log_llm_task(
         graph=graph,
         node_id=node_id,
@@ -54,12 +131,84 @@ def run_llm_task(
         response=response,
         status=status,
         tags=tags,
+        variables=stored_variables,
+        fingerprint=fingerprint,
         **extra,
     )
 
     return response
 
 
+def _raise_if_cancelled(cancelled: Optional[Callable[[], bool]], prompt_template: str) -> None:
+    if cancelled is not None and cancelled():
+        raise CancelledError(f"[llm_runner] {prompt_template} task was cancelled")
+
+
+def _generate_with_routing(
+    config: dict,
+    prompt_template: str,
+    prompt: str,
+    history: List[Dict[str, Any]],
+    respond_prefix: Optional[str],
+    validate: Optional[Callable[[str], bool]],
+    min_route_level: int,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Call the routed model cascade and return (response, metadata to log on the node)."""
+    route = get_model_route(config, prompt_template)
+    start_level = min(max(min_route_level, 0), len(route) - 1)
+    route_decisions = []
+    history_tokens_saved = None
+    call_stats_per_level = []
+
+    for level in range(start_level, len(route)):
+        model = route[level]
+        model_config = with_model(config, model)
+        llm = get_llm_provider(model_config)
+
+        model_history = history
+        budget = get_history_budget(config, model_config.get("litellm", {}).get("model"))
+        if budget is not None:
+            model_history, history_tokens_saved = trim_chat_history(
+                history, budget, config.get("history", {}).get("keep_recent_turns", 2))
+            if history_tokens_saved:
+                typer.echo(f"[llm_runner] ✂️  Trimmed history for {prompt_template}: "
+                           f"saved ~{history_tokens_saved} tokens")
+
+        _raise_if_cancelled(cancelled, prompt_template)
+        started = time.perf_counter()
+        response = llm.generate(prompt, history=model_history, respond_prefix=respond_prefix)
+        latency = time.perf_counter() - started
+        # Providers without telemetry (e.g. test doubles) leave this unset
+        call_stats = getattr(llm, "last_call_stats", None)
+        if isinstance(call_stats, dict):
+            cost = 0.0 if call_stats.get("cache_hit") else estimate_cost(
+                call_stats.get("model"), call_stats.get("input_tokens") or 0, call_stats.get("output_tokens") or 0)
+            call_stats_per_level.append({**call_stats, "cost": cost})
+
+        valid = validate is None or validate(response)
+        route_decisions.append({
+            "model": model or config.get("litellm", {}).get("model"),
+            "level": level,
+            "latency": round(latency, 3),
+            "valid": valid,
+        })
+        if valid:
+            break
+        if level + 1 < len(route):
+            typer.echo(f"[llm_runner] ⤴️  {prompt_template}: response from {model} failed validation, "
+                       f"escalating to {route[level + 1]}")
+
+    metadata = {}
+    if route[0] is not None:
+        metadata["routing"] = route_decisions
+    if history_tokens_saved is not None:
+        metadata["history_tokens_saved"] = history_tokens_saved
+    if call_stats_per_level:
+        metadata["llm_stats"] = combine_call_stats(call_stats_per_level)
+    return response, metadata
+
+
 def run_llm_and_store(
     *,
     config: dict,
@@ -71,6 +220,9 @@ def run_llm_and_store(
     status: str = "COMPLETED",
     tags: Optional[List[str]] = None,
     extra: Optional[Dict[str, Any]] = None,
+    validate: Optional[Callable[[str], bool]] = None,
+    min_route_level: int = 0,
+    cancelled: Optional[Callable[[], bool]] = None,
 ) -> str:
     """
     Run an LLM task and store derived metadata (e.g. parsed JSON) back into the memory graph.
@@ -88,6 +240,9 @@ def run_llm_and_store(
         status: Status string to store with the response (e.g. "SUMMARIZED", "FIX_ATTEMPT_1")
         tags: Optional tags for graph node
         extra: Optional additional metadata to log
+        validate: Optional response check used for model escalation (see `run_llm_task`)
+        min_route_level: Index in the model cascade to start from
+        cancelled: Stops the task before its LLM call or graph writes (see `run_llm_task`)
 
     Returns:
         Raw LLM response string (unmodified)
@@ -101,9 +256,13 @@ def run_llm_and_store(
         status=status,
         tags=tags,
         extra=extra,
+        validate=validate,
+        min_route_level=min_route_level,
+        cancelled=cancelled,
     )
 
     derived_metadata = postprocess(response)
+    _raise_if_cancelled(cancelled, prompt_template)
     graph.update(node_id, **derived_metadata)
 
     return response, derived_metadata
@@ -158,6 +317,7 @@ def llm_run_and_store(
     tags: Optional[List[str]] = None,
     status: str = "COMPLETED",
     extra: Optional[Dict[str, Any]] = None,
+    validate: Optional[Callable[[str], bool]] = None,
 ) -> Tuple[str, str, Dict[str, Any]]:
     """
     High-level helper to:
@@ -180,5 +340,6 @@ def llm_run_and_store(
         status=status,
         tags=tags,
         extra=extra,
+        validate=validate,
     )
     return response, node_id if graph else None, metadata
@@ -1,10 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from pathlib import Path
+import hashlib
+import json
+import math
+import os
+import threading
+
+import typer
+
 from cybermule.memory.history_utils import extract_chat_history, format_chat_history_as_text
 from cybermule.memory.memory_graph import MemoryGraph
 from cybermule.providers.llm_provider import get_llm_provider
 from cybermule.utils.config_loader import get_prompt_path
+from cybermule.utils.file_utils import file_lock
 from cybermule.utils.parsing import extract_first_json_block
 from cybermule.utils.template_utils import render_template
-import json
+
+PAIRWISE_TEMPLATE = "evaluate_prompt_pair.j2"
+DEFAULT_JUDGE_CACHE = ".cybermule/judge_cache.json"
+DEFAULT_JUDGE_WORKERS = 4
 
 
 def _build_variant_entry(node_id, graph, config):
@@ -23,8 +38,202 @@ def _build_variant_entry(node_id, graph, config):
     }
 
 
+def _variant_hash(variant):
+    material = json.dumps([variant["full_prompt"], variant["response"]])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class JudgeCache:
+    """
+    Persistent pairwise judgements keyed by (goal, first shown hash, second shown hash).
+
+    Variants are hashed by their full prompt and response, so a pair is only judged
+    again when one of them actually changed. Each presentation order has its own entry
+    and the winner is recorded by hash. The file is shared by concurrent evaluations,
+    so writes re-read and merge it under a lock before replacing it atomically.
+    """
+
+    def __init__(self, path=DEFAULT_JUDGE_CACHE):
+        self.path = Path(path).expanduser() if path else None
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def key(goal, hash_first, hash_second):
+        return hashlib.sha256(json.dumps([goal, hash_first, hash_second]).encode("utf-8")).hexdigest()
+
+    def get(self, goal, hash_first, hash_second):
+        with self._lock:
+            return self.entries.get(self.key(goal, hash_first, hash_second))
+
+    def put(self, goal, hash_first, hash_second, judgement):
+        key = self.key(goal, hash_first, hash_second)
+        if self.path is None:
+            with self._lock:
+                self.entries[key] = judgement
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock(self.path.with_name(self.path.name + ".lock")):
+            entries = self._load()
+            entries[key] = judgement
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self.entries = entries
+
+
+def bradley_terry(names, outcomes, iterations=200, prior=0.1):
+    """
+    Fit Bradley-Terry strengths from pairwise outcomes.
+
+    Args:
+        names: Competitors to rate.
+        outcomes: (winner, loser) pairs; a tie is given as (a, b, 0.5) and counts half a win each.
+        prior: Pseudo-wins added in both directions of every compared pair, so
+               unbeaten or winless variants still get finite ratings.
+
+    Returns:
+        dict: Elo-scaled rating per name (1000 is the geometric-mean strength).
+    """
+    wins = {(a, b): 0.0 for a in names for b in names if a != b}
+    for outcome in outcomes:
+        winner, loser = outcome[0], outcome[1]
+        weight = outcome[2] if len(outcome) > 2 else 1.0
+        wins[(winner, loser)] += weight
+        wins[(loser, winner)] += 1.0 - weight
+    compared = {frozenset(pair) for pair, count in wins.items() if count}
+    for pair in compared:
+        a, b = tuple(pair)
+        wins[(a, b)] += prior
+        wins[(b, a)] += prior
+
+    strength = {name: 1.0 for name in names}
+    for _ in range(iterations):
+        updated = {}
+        for i in names:
+            total_wins = sum(wins[(i, j)] for j in names if j != i)
+            denominator = sum((wins[(i, j)] + wins[(j, i)]) / (strength[i] + strength[j])
+                              for j in names if j != i)
+            updated[i] = total_wins / denominator if denominator else strength[i]
+        log_mean = sum(math.log(v) for v in updated.values()) / max(len(updated), 1)
+        strength = {name: v / math.exp(log_mean) for name, v in updated.items()}
+
+    return {name: round(1000 + 400 * math.log10(v), 1) for name, v in strength.items()}
+
+
+def _judge_pair(provider, config, goal, variant_a, variant_b, prompt_template):
+    prompt_path = get_prompt_path(config, name=prompt_template)
+    prompt = render_template(prompt_path, template_vars={
+        "goal": goal, "variant_a": variant_a, "variant_b": variant_b,
+    })
+    verdict = extract_first_json_block(provider.generate(prompt=prompt)) or {}
+    winner = str(verdict.get("winner", "tie")).strip().upper()
+    winner_hash = {"A": variant_a["hash"], "B": variant_b["hash"]}.get(winner, "tie")
+    return {"winner": winner_hash, "justification": verdict.get("justification", "")}
+
+
+def evaluate_prompt_variants_pairwise(node_ids, graph: MemoryGraph, config: dict, goal: str,
+                                      prompt_template=PAIRWISE_TEMPLATE, max_workers=None,
+                                      cache_path=None):
+    """
+    Rank prompt variants by judging every pair separately and fitting a Bradley-Terry model.
+
+    Each judge prompt holds only two variants. Every pair is judged in both orders and
+    the two verdicts are averaged, so a judge that favours the first (or second)
+    position gives a tie rather than a win. Judgements run concurrently and are cached
+    on disk (`prompt_eval.judge_cache`), so adding a variant only costs its
+    comparisons against the existing ones.
+
+    Args:
+        node_ids (List[str]): MemoryGraph node IDs with different prompt variants.
+        graph (MemoryGraph): The memory graph.
+        config (dict): LLM configuration.
+        goal (str): Evaluation goal (e.g., clarity, accuracy).
+        prompt_template (str): Pairwise judge template.
+        max_workers (int): Concurrent judge calls (default `prompt_eval.max_workers`).
+        cache_path (str): Judge cache file (default `prompt_eval.judge_cache`).
+
+    Returns:
+        dict: Ratings per node ("scores"), the "leaderboard", "winner" and individual
+        "comparisons" (each with A's score and the verdict of each order).
+    """
+    eval_cfg = config.get("prompt_eval", {})
+    cache = JudgeCache(cache_path or eval_cfg.get("judge_cache", DEFAULT_JUDGE_CACHE))
+    variants = {}
+    for node_id in node_ids:
+        entry = _build_variant_entry(node_id=node_id, graph=graph, config=config)
+        variants[node_id] = {**entry, "hash": _variant_hash(entry)}
+
+    pairs = list(combinations(node_ids, 2))
+    # Each pair is judged in both orders to cancel the judge's position bias;
+    # identical variants are a tie without asking the judge
+    orders = [order for a, b in pairs if variants[a]["hash"] != variants[b]["hash"]
+              for order in ((a, b), (b, a))]
+    to_judge = [(a, b) for a, b in orders if cache.get(goal, variants[a]["hash"], variants[b]["hash"]) is None]
+    typer.echo(f"[prompt_eval] ⚖️  {len(pairs)} comparisons, "
+               f"{len(orders) - len(to_judge)} of {len(orders)} judgements cached")
+
+    if to_judge:
+        provider = get_llm_provider(config)
+
+        def judge(order):
+            first, second = order
+            judgement = _judge_pair(provider, config, goal, variants[first], variants[second], prompt_template)
+            cache.put(goal, variants[first]["hash"], variants[second]["hash"], judgement)
+
+        workers = max_workers or eval_cfg.get("max_workers", DEFAULT_JUDGE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(judge, to_judge))
+
+    comparisons, outcomes = [], []
+    for a, b in pairs:
+        judgements = []
+        score_a = 0.5
+        if variants[a]["hash"] != variants[b]["hash"]:
+            for first, second in ((a, b), (b, a)):
+                judgement = cache.get(goal, variants[first]["hash"], variants[second]["hash"]) or {"winner": "tie"}
+                winner = {variants[a]["hash"]: a, variants[b]["hash"]: b}.get(judgement["winner"], "tie")
+                judgements.append({"order": [first, second], "winner": winner,
+                                   "justification": judgement.get("justification", "")})
+            # A's share of the two verdicts: 1 per win, 0.5 per tie
+            score_a = sum(1.0 if j["winner"] == a else 0.5 if j["winner"] == "tie" else 0.0
+                          for j in judgements) / len(judgements)
+        winner = a if score_a > 0.5 else b if score_a < 0.5 else "tie"
+        comparisons.append({"a": a, "b": b, "winner": winner, "score_a": score_a, "judgements": judgements})
+        outcomes.append((a, b, score_a))
+
+    ratings = bradley_terry(list(node_ids), outcomes)
+    leaderboard = []
+    for node_id in sorted(node_ids, key=lambda n: ratings[n], reverse=True):
+        record = [c for c in comparisons if node_id in (c["a"], c["b"])]
+        leaderboard.append({
+            "node_id": node_id,
+            "rating": ratings[node_id],
+            "wins": sum(1 for c in record if c["winner"] == node_id),
+            "losses": sum(1 for c in record if c["winner"] not in (node_id, "tie")),
+            "ties": sum(1 for c in record if c["winner"] == "tie"),
+        })
+
+    return {
+        "scores": ratings,
+        "leaderboard": leaderboard,
+        "winner": leaderboard[0]["node_id"] if leaderboard else None,
+        "comparisons": comparisons,
+    }
+
+
 def evaluate_prompt_variants(node_ids, graph: MemoryGraph, config: dict, goal: str,
-                              prompt_template="evaluate_prompt_variants.j2"):
+                              prompt_template="evaluate_prompt_variants.j2", mode="all", **pairwise_options):
     """
     Evaluate multiple prompt variants (identified by node IDs).
 
@@ -34,10 +243,20 @@ def evaluate_prompt_variants(node_ids, graph: MemoryGraph, config: dict, goal: s
         config (dict): LLM configuration.
         goal (str): Evaluation goal (e.g., clarity, accuracy).
         prompt_template (str): Jinja template to use.
+        mode (str): "all" judges every variant in one prompt; "pairwise" runs
+            `evaluate_prompt_variants_pairwise` (pass its options as keywords).
 
     Returns:
         dict: Evaluation result with scores and justification.
     """
+    if mode == "pairwise":
+        if prompt_template == "evaluate_prompt_variants.j2":
+            prompt_template = PAIRWISE_TEMPLATE
+        return evaluate_prompt_variants_pairwise(node_ids, graph, config, goal,
+                                                 prompt_template=prompt_template, **pairwise_options)
+    if mode != "all":
+        raise ValueError(f"Unknown evaluation mode '{mode}', expected 'all' or 'pairwise'")
+
     variant_data = [_build_variant_entry(node_id=node_id, graph=graph, config=config) 
                     for node_id in node_ids]
 
@@ -0,0 +1,165 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import typer
+
+from cybermule.executors.llm_runner import run_llm_and_store, run_llm_task
+from cybermule.memory.memory_graph import MemoryGraph
+
+DEFAULT_MAX_WORKERS = 4
+
+# Variables may be given directly or computed from the results of dependencies
+Variables = Union[Dict[str, Any], Callable[[Dict[str, "TaskResult"]], Dict[str, Any]]]
+
+
+class TaskResult(NamedTuple):
+    name: str
+    status: str                      # "COMPLETED", "FAILED" or "SKIPPED"
+    value: Any = None                # postprocess output, callable return value or raw response
+    response: Optional[str] = None
+    node_id: Optional[str] = None
+    error: Optional[BaseException] = None
+
+
+class _Task(NamedTuple):
+    name: str
+    run: Callable[[Dict[str, TaskResult]], TaskResult]
+    depends_on: Sequence[str]
+
+
+class TaskGraph:
+    """
+    Declare LLM (and plain Python) tasks with dependencies and run independent ones concurrently.
+
+    A task depends on the tasks listed in `depends_on` and on its `parent_task`, whose
+    graph node becomes the parent of the task's node. Variables can be computed from
+    dependency results, e.g. from another task's postprocess output. Results and
+    statuses are written to the MemoryGraph as each task finishes; a failed task
+    skips everything that depends on it.
+
+    Example:
+        tasks = TaskGraph(config, graph)
+        tasks.add_llm_task("summary", task="Summarize", prompt_template="summarize_traceback.j2",
+                           variables={"TRACEBACK": tb}, postprocess=extract_summary)
+        tasks.add_llm_task("fix", task="Fix", prompt_template="fix_traceback.j2",
+                           parent_task="summary",
+                           variables=lambda r: {"SUMMARY": r["summary"].value["summary"]})
+        results = tasks.run()
+    """
+
+    def __init__(self, config: dict, graph: MemoryGraph, max_workers: Optional[int] = None):
+        self.config = config
+        self.graph = graph
+        self.max_workers = max_workers or config.get("scheduler", {}).get("max_workers", DEFAULT_MAX_WORKERS)
+        self.tasks: Dict[str, _Task] = {}
+
+    def _register(self, name: str, run: Callable[[Dict[str, TaskResult]], TaskResult],
+                  depends_on: Sequence[str]) -> str:
+        if name in self.tasks:
+            raise ValueError(f"[task_graph] Duplicate task name: {name}")
+        missing = [dep for dep in depends_on if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"[task_graph] Task '{name}' depends on unknown tasks: {missing}")
+        self.tasks[name] = _Task(name=name, run=run, depends_on=tuple(depends_on))
+        return name
+
+    def add_task(self, name: str, fn: Callable[[Dict[str, TaskResult]], Any],
+                 depends_on: Sequence[str] = ()) -> str:
+        """Add a plain callable; it receives the results of all tasks finished so far."""
+        def run(results: Dict[str, TaskResult]) -> TaskResult:
+            return TaskResult(name=name, status="COMPLETED", value=fn(results))
+
+        return self._register(name, run, depends_on)
+
+    def add_llm_task(
+        self,
+        name: str,
+        *,
+        task: str,
+        prompt_template: str,
+        variables: Variables,
+        postprocess: Optional[Callable[[str], Dict[str, Any]]] = None,
+        parent_task: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        depends_on: Sequence[str] = (),
+        tags: Optional[List[str]] = None,
+        status: str = "COMPLETED",
+        extra: Optional[Dict[str, Any]] = None,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """Add an LLM task; its node is created under `parent_task`'s node (or `parent_id`) when it starts."""
+        dependencies = list(depends_on)
+        if parent_task and parent_task not in dependencies:
+            dependencies.append(parent_task)
+
+        def run(results: Dict[str, TaskResult]) -> TaskResult:
+            parent = results[parent_task].node_id if parent_task else parent_id
+            task_vars = variables(results) if callable(variables) else variables
+            node_id = self.graph.new(task=task, parent_id=parent, tags=tags or [])
+            try:
+                if postprocess is None:
+                    response = run_llm_task(
+                        config=self.config, graph=self.graph, node_id=node_id,
+                        prompt_template=prompt_template, variables=task_vars,
+                        status=status, tags=tags, extra=extra, validate=validate,
+                    )
+                    value = response
+                else:
+                    response, value = run_llm_and_store(
+                        config=self.config, graph=self.graph, node_id=node_id,
+                        prompt_template=prompt_template, variables=task_vars,
+                        postprocess=postprocess, status=status, tags=tags,
+                        extra=extra, validate=validate,
+                    )
+            except Exception as e:
+                self.graph.update(node_id, status="FAILED", error=str(e))
+                return TaskResult(name=name, status="FAILED", node_id=node_id, error=e)
+            return TaskResult(name=name, status="COMPLETED", value=value, response=response, node_id=node_id)
+
+        return self._register(name, run, dependencies)
+
+    def run(self, raise_on_error: bool = False) -> Dict[str, TaskResult]:
+        """
+        Run all tasks, starting each as soon as its dependencies have completed.
+
+        Args:
+            raise_on_error: Re-raise the first task error once running tasks have finished
+
+        Returns:
+            Results keyed by task name
+        """
+        results: Dict[str, TaskResult] = {}
+        pending = dict(self.tasks)
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name, task in list(pending.items()):
+                    dep_results = [results.get(dep) for dep in task.depends_on]
+                    if any(r is not None and r.status != "COMPLETED" for r in dep_results):
+                        typer.echo(f"[task_graph] ⏭️  Skipping {name}: a dependency did not complete")
+                        results[name] = TaskResult(name=name, status="SKIPPED")
+                        del pending[name]
+                    elif all(r is not None for r in dep_results):
+                        running[pool.submit(task.run, dict(results))] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except BaseException as e:
+                        results[name] = TaskResult(name=name, status="FAILED", error=e)
+                    # typer.Exit is a deliberate early exit (e.g. nothing to fix), not a failure
+                    if results[name].error is not None and not isinstance(results[name].error, typer.Exit):
+                        typer.echo(f"[task_graph] ❌ Task {name} failed: {results[name].error}")
+
+        if raise_on_error:
+            for result in results.values():
+                if result.error is not None:
+                    raise result.error
+        return results
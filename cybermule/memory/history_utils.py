@@ -1,10 +1,18 @@
-from typing import List, Dict, Optional, Union
+import re
+from typing import List, Dict, Optional, Tuple, Union
 from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.utils.token_utils import estimate_message_tokens, message_text
+
+# Code-heavy sections of older turns that can be elided when over budget
+_CODE_BLOCK_PATTERN = re.compile(r"<code_context>.*?</code_context>|```.*?```", re.DOTALL)
+
 
 def extract_chat_history(
     node: Optional[Union[str, dict]],
     memory: MemoryGraph,
-    include_root: bool = True
+    include_root: bool = True,
+    token_budget: Optional[int] = None,
+    keep_recent_turns: int = 2,
 ) -> List[Dict]:
     """
     Traverse the ancestry of a node in the MemoryGraph and return a Claude-style
@@ -14,10 +22,16 @@ def extract_chat_history(
         - A "user" message from the 'prompt'
         - An "assistant" message from the 'response'
 
+    The walk stops at the nearest checkpoint node, whose digest stands in for
+    everything above it.
+
     Args:
         node: Node ID (str) or node dict from MemoryGraph.
         memory: The MemoryGraph instance to use.
         include_root: If False, excludes the final node (assumed current step).
+        token_budget: If set, trim the history to roughly this many tokens
+                      (see `trim_chat_history`).
+        keep_recent_turns: Number of most recent turns kept verbatim when trimming.
 
     Returns:
         List of messages, e.g.:
@@ -39,6 +53,10 @@ def extract_chat_history(
     if not include_root:
         path = path[:-1]
 
+    checkpoints = [i for i, n in enumerate(path) if n.get("checkpoint")]
+    if checkpoints:
+        path = path[checkpoints[-1]:]
+
     history = []
     for n in path:
         prompt = n.get("prompt", "").strip()
@@ -56,8 +74,82 @@ def extract_chat_history(
                 "content": [{"type": "text", "text": response}]
             })
 
+    if token_budget is not None:
+        history, _ = trim_chat_history(history, token_budget, keep_recent_turns)
+
     return history
 
+
+def elide_code_blocks(text: str, max_chars: int = 400) -> str:
+    """Replace fenced code and <code_context> blocks longer than `max_chars` with a marker."""
+    def _elide(match: re.Match) -> str:
+        block = match.group(0)
+        if len(block) <= max_chars:
+            return block
+        return f"[... {block.count(chr(10)) + 1} lines of code elided ...]"
+
+    return _CODE_BLOCK_PATTERN.sub(_elide, text)
+
+
+def _group_turns(messages: List[Dict]) -> List[List[Dict]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: List[List[Dict]] = []
+    for msg in messages:
+        if msg["role"] == "user" or not turns:
+            turns.append([])
+        turns[-1].append(msg)
+    return turns
+
+
+def _with_text(message: Dict, text: str) -> Dict:
+    return {**message, "content": [{"type": "text", "text": text}]}
+
+
+def trim_chat_history(
+    messages: List[Dict],
+    token_budget: int,
+    keep_recent_turns: int = 2,
+) -> Tuple[List[Dict], int]:
+    """
+    Fit a chat history into roughly `token_budget` tokens.
+
+    The most recent `keep_recent_turns` turns are always kept verbatim. Older turns
+    first lose their large code blocks; if that is not enough, whole turns are dropped,
+    lowest value first: the oldest intermediate turns go before the root turn, which
+    usually carries the original task.
+
+    Returns:
+        (trimmed_messages, tokens_saved)
+    """
+    original_tokens = estimate_message_tokens(messages)
+    if original_tokens <= token_budget:
+        return list(messages), 0
+
+    turns = _group_turns(messages)
+    split = max(len(turns) - keep_recent_turns, 0)
+    older, recent = turns[:split], turns[split:]
+
+    older = [
+        [_with_text(m, elide_code_blocks(message_text(m))) for m in turn]
+        for turn in older
+    ]
+
+    def total(parts: List[List[Dict]]) -> int:
+        return sum(estimate_message_tokens(turn) for turn in parts)
+
+    # Drop order: intermediate turns oldest-first, then the root turn
+    drop_order = list(range(1, len(older))) + ([0] if older else [])
+    dropped = set()
+    for idx in drop_order:
+        kept = [turn for i, turn in enumerate(older) if i not in dropped]
+        if total(kept) + total(recent) <= token_budget:
+            break
+        dropped.add(idx)
+
+    trimmed = [m for i, turn in enumerate(older) if i not in dropped for m in turn]
+    trimmed += [m for turn in recent for m in turn]
+    return trimmed, original_tokens - estimate_message_tokens(trimmed)
+
 def format_chat_history_as_text(messages: List[dict]) -> str:
     lines = []
     for msg in messages:
@@ -1,4 +1,5 @@
 from datetime import datetime
+import threading
 import uuid
 from pathlib import Path
 import networkx as nx
@@ -13,10 +14,13 @@ class MemoryGraph:
     def __init__(self, storage_path="memory_graph.json"):
         self.storage_path = Path(storage_path)
         self.graph = nx.DiGraph()
+        # Guards graph mutation and saving when steps run on worker threads
+        self._lock = threading.RLock()
         load_graph_from_file(self.graph, self.storage_path)
 
     def _save(self):
-        save_graph_to_file(self.graph, self.storage_path)
+        with self._lock:
+            save_graph_to_file(self.graph, self.storage_path)
 
     def new(self, task, parent_id=None, tags=None, mode=None):
         node_id = str(uuid.uuid4())
@@ -32,35 +36,53 @@ class MemoryGraph:
             "tags": tags or [],
             "mode": mode or ""
         }
-        self.graph.add_node(node_id, **node_attrs)
-        if parent_id and parent_id in self.graph:
-            self.graph.add_edge(parent_id, node_id)
-        self._save()
+        with self._lock:
+            self.graph.add_node(node_id, **node_attrs)
+            if parent_id and parent_id in self.graph:
+                self.graph.add_edge(parent_id, node_id)
+            self._save()
         return node_id
 
     def update(self, node_id, **kwargs):
-        if node_id not in self.graph:
-            raise KeyError(f"Node {node_id} not found.")
-        self.graph.nodes[node_id].update(kwargs)
-        self._save()
+        with self._lock:
+            if node_id not in self.graph:
+                raise KeyError(f"Node {node_id} not found.")
+            self.graph.nodes[node_id].update(kwargs)
+            self._save()
+
+    def reparent(self, node_id, new_parent_id):
+        with self._lock:
+            if node_id not in self.graph or new_parent_id not in self.graph:
+                raise KeyError(f"Node {node_id} or {new_parent_id} not found.")
+            for old_parent in list(self.graph.predecessors(node_id)):
+                self.graph.remove_edge(old_parent, node_id)
+            self.graph.add_edge(new_parent_id, node_id)
+            self.graph.nodes[node_id]["parent"] = new_parent_id
+            self._save()
 
     def get(self, node_id):
-        if node_id not in self.graph:
-            return None
-        node = dict(self.graph.nodes[node_id])
-        node["children"] = list(self.graph.successors(node_id))
-        preds = list(self.graph.predecessors(node_id))
+        with self._lock:
+            if node_id not in self.graph:
+                return None
+            node = dict(self.graph.nodes[node_id])
+            node["children"] = list(self.graph.successors(node_id))
+            preds = list(self.graph.predecessors(node_id))
         node["parent"] = preds[0] if preds else None
         return node
 
     def list(self):
-        return [self.get(nid) for nid in self.graph.nodes]
+        with self._lock:
+            node_ids = list(self.graph.nodes)
+        return [self.get(nid) for nid in node_ids]
 
     def children_of(self, node_id):
-        return [self.get(cid) for cid in self.graph.successors(node_id)]
+        with self._lock:
+            child_ids = list(self.graph.successors(node_id))
+        return [self.get(cid) for cid in child_ids]
 
     def parent_of(self, node_id):
-        preds = list(self.graph.predecessors(node_id))
+        with self._lock:
+            preds = list(self.graph.predecessors(node_id))
         return self.get(preds[0]) if preds else None
     
     def parent_id_of(self, node_id):
@@ -68,13 +90,19 @@ class MemoryGraph:
         return parent_node['id'] if parent_node else None
 
     def get_descendants(self, node_id):
-        return [self.get(nid) for nid in get_descendants(self.graph, node_id)]
+        with self._lock:
+            node_ids = get_descendants(self.graph, node_id)
+        return [self.get(nid) for nid in node_ids]
 
     def get_ancestors(self, node_id):
-        return [self.get(nid) for nid in get_ancestors(self.graph, node_id)]
+        with self._lock:
+            node_ids = get_ancestors(self.graph, node_id)
+        return [self.get(nid) for nid in node_ids]
 
     def get_path_to_root(self, node_id):
-        return [self.get(nid) for nid in get_path_to_root(self.graph, node_id)]
+        with self._lock:
+            node_ids = get_path_to_root(self.graph, node_id)
+        return [self.get(nid) for nid in node_ids]
 
     def get_roots(self):
         return [self.get(nid) for nid in get_roots(self.graph)]
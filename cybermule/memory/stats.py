@@ -0,0 +1,108 @@
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from cybermule.memory.memory_graph import MemoryGraph
+
+# Metrics reported with p50/p95/p99 by `cybermule stats`
+LATENCY_METRICS = ("ttft", "latency", "output_tokens_per_second")
+TOKEN_METRICS = ("input_tokens", "output_tokens", "reasoning_tokens", "cache_read_tokens", "cache_write_tokens")
+
+_WINDOW_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$")
+_WINDOW_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_window(window: str) -> timedelta:
+    """Parse a window such as `30m`, `24h` or `7d` into a timedelta."""
+    match = _WINDOW_PATTERN.match(window)
+    if not match:
+        raise ValueError(f"Invalid time window '{window}', expected e.g. 30m, 24h or 7d")
+    amount, unit = match.groups()
+    return timedelta(**{_WINDOW_UNITS[unit]: float(amount)})
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Linearly interpolated percentile (q in 0-100) of `values`."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def combine_call_stats(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    One `llm_stats` record for a task whose model cascade made several calls.
+
+    Tokens, latency and cost are summed over the calls; the other fields come from
+    the final call. The per-call records are kept under `calls`.
+    """
+    if len(calls) == 1:
+        return calls[0]
+    combined = dict(calls[-1])
+    for metric in TOKEN_METRICS:
+        combined[metric] = sum(call.get(metric) or 0 for call in calls)
+    combined["latency"] = round(sum(call.get("latency") or 0.0 for call in calls), 4)
+    costs = [call["cost"] for call in calls if call.get("cost") is not None]
+    combined["cost"] = sum(costs) if costs else None
+    combined["calls"] = calls
+    return combined
+
+
+def collect_llm_stats(graph: MemoryGraph, since: Optional[timedelta] = None,
+                      now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Gather the `llm_stats` recorded on graph nodes, tagged with their prompt template.
+
+    Tasks that escalated through a model cascade contribute one record per call, so
+    each model is credited with its own tokens and latency. Only calls finished
+    within `since` of `now` are returned when a window is given.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - since if since else None
+    records = []
+    for node in graph.list():
+        stats = node.get("llm_stats")
+        if not isinstance(stats, dict):
+            continue
+        finished_at = _parse_timestamp(stats.get("finished_at") or node.get("timestamp"))
+        if cutoff and (finished_at is None or finished_at < cutoff):
+            continue
+        for call in stats.get("calls") or [stats]:
+            records.append({**call, "template": node.get("prompt_template") or "unknown", "node_id": node["id"]})
+    return records
+
+
+def summarize_llm_stats(records: List[Dict[str, Any]], group_by: str) -> Dict[str, Dict[str, Any]]:
+    """Aggregate call records per `group_by` key (`template` or `model`)."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record.get(group_by) or "unknown", []).append(record)
+
+    summary = {}
+    for name, group in sorted(groups.items()):
+        entry: Dict[str, Any] = {
+            "calls": len(group),
+            "cache_hit_rate": sum(1 for r in group if r.get("cache_hit")) / len(group),
+        }
+        for metric in LATENCY_METRICS:
+            # Cache hits never reached the API, so they would skew latency towards zero
+            values = [r[metric] for r in group if not r.get("cache_hit") and r.get(metric) is not None]
+            entry[metric] = {f"p{q}": percentile(values, q) for q in (50, 95, 99)}
+        for metric in TOKEN_METRICS:
+            entry[metric] = sum(r.get(metric) or 0 for r in group)
+        costs = [r["cost"] for r in group if r.get("cost") is not None]
+        entry["cost"] = sum(costs) if costs else None
+        summary[name] = entry
+    return summary
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from cybermule.utils.file_utils import file_lock
+
+CASSETTE_MODES = ("record", "replay", "passthrough")
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, Any]]:
+    if not usage:
+        return None
+    if isinstance(usage, dict):
+        return dict(usage)
+    if hasattr(usage, "model_dump"):
+        return usage.model_dump()
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "total_tokens": getattr(usage, "total_tokens", None),
+    }
+
+
+def _replay_chunk(entry: Dict[str, Any]) -> SimpleNamespace:
+    """Rebuild a stream chunk exposing the attributes LLMProvider reads."""
+    choices = []
+    if entry.get("content") is not None or entry.get("reasoning_content") is not None:
+        delta = SimpleNamespace(content=entry.get("content"),
+                                reasoning_content=entry.get("reasoning_content"))
+        choices = [SimpleNamespace(delta=delta)]
+    return SimpleNamespace(choices=choices, usage=entry.get("usage"))
+
+
+class Cassette:
+    """
+    Record LLM response streams to a JSON file and replay them deterministically.
+
+    Each interaction keeps the request, every chunk's content, reasoning content,
+    usage and its offset from the start of the request, so replays can optionally
+    reproduce the original timing.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", realtime: bool = False):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"[cassette] Unknown mode '{mode}', expected one of {CASSETTE_MODES}")
+        self.path = Path(path).expanduser()
+        self.mode = mode
+        self.realtime = realtime
+        self._lock = threading.Lock()
+        self._replay_positions: Dict[str, int] = {}
+        self.interactions: Dict[str, List[Dict[str, Any]]] = self._load()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("interactions", {})
+        except FileNotFoundError:
+            return {}
+
+    def _save(self, key: str, interaction: Dict[str, Any]) -> None:
+        """
+        Add one interaction to the file. Other providers (and processes) may record into
+        the same cassette, so the file is re-read and merged under its lock first.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path.with_name(self.path.name + ".lock")):
+            interactions = self._load()
+            interactions.setdefault(key, []).append(interaction)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "interactions": interactions}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        self.interactions = interactions
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        material = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def record(self, request: Dict[str, Any], stream: Iterable[Any]) -> Iterator[Any]:
+        """Pass `stream` through unchanged while capturing it under the request's key."""
+        key = self.request_key(request)
+        started = time.perf_counter()
+        chunks = []
+
+        for chunk in stream:
+            entry = {"t": round(time.perf_counter() - started, 4),
+                     "usage": _usage_dict(getattr(chunk, "usage", None))}
+            if getattr(chunk, "choices", None) and chunk.choices[0].delta:
+                delta = chunk.choices[0].delta
+                entry["content"] = getattr(delta, "content", None)
+                entry["reasoning_content"] = getattr(delta, "reasoning_content", None)
+            chunks.append(entry)
+            yield chunk
+
+        with self._lock:
+            self._save(key, {"request": request, "chunks": chunks})
+
+    def replay(self, request: Dict[str, Any]) -> Iterator[SimpleNamespace]:
+        """Yield the recorded chunks for the request; repeated requests replay in recorded order."""
+        key = self.request_key(request)
+        with self._lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                raise RuntimeError(f"[cassette] No recorded interaction for this request in {self.path}")
+            position = self._replay_positions.get(key, 0)
+            self._replay_positions[key] = position + 1
+            interaction = recorded[min(position, len(recorded) - 1)]
+
+        started = time.perf_counter()
+        for entry in interaction["chunks"]:
+            if self.realtime:
+                delay = entry.get("t", 0) - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            yield _replay_chunk(entry)
+
+
+def get_cassette(settings: Optional[Dict[str, Any]]) -> Optional[Cassette]:
+    """Build a Cassette from the `litellm.cassette` config section, if enabled."""
+    if not settings or settings.get("mode", "passthrough") == "passthrough":
+        return None
+    return Cassette(
+        path=settings.get("path", ".cybermule/cassette.json"),
+        mode=settings["mode"],
+        realtime=settings.get("realtime", False),
+    )
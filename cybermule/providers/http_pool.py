@@ -0,0 +1,207 @@
+"""
+Long-lived, pooled HTTP clients shared by every LLMProvider in the process.
+
+litellm builds its OpenAI-compatible SDK clients around `litellm.client_session` /
+`litellm.aclient_session` when they are set, so installing pooled clients there lets
+keep-alive connections (and TLS sessions) survive across providers and tasks.
+The transports also trace connection setup so it can be reported in call telemetry.
+"""
+import contextvars
+import importlib.util
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import httpx
+import litellm
+import typer
+
+DEFAULT_HTTP_POOL = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 60.0,
+    "http2": True,          # only used when the optional `h2` package is installed
+    "timeout": 600.0,
+    "connect_timeout": 10.0,
+}
+
+# Connection-setup timings for the request currently made by this thread / task
+_connection_trace: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "cybermule_connection_trace", default=None)
+
+_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+_clients_lock = threading.Lock()
+# The (settings key, clients) installed into litellm; litellm holds a single session pair
+_installed: Optional[Tuple[str, Tuple[httpx.Client, httpx.AsyncClient]]] = None
+
+
+def _record_trace_event(event_name: str) -> None:
+    trace = _connection_trace.get()
+    if trace is None:
+        return
+    now = time.perf_counter()
+    for phase, key in (("connect_tcp", "connect_time"), ("start_tls", "tls_time")):
+        if event_name == f"connection.{phase}.started":
+            trace[f"_{phase}_started"] = now
+        elif event_name == f"connection.{phase}.complete" and f"_{phase}_started" in trace:
+            trace[key] = trace.get(key, 0.0) + now - trace.pop(f"_{phase}_started")
+            trace["new_connections"] = trace.get("new_connections", 0) + (phase == "connect_tcp")
+
+
+def _with_trace(request: httpx.Request, trace_callback) -> None:
+    trace = _connection_trace.get()
+    if trace is not None:
+        trace["requests"] = trace.get("requests", 0) + 1
+    if "trace" not in request.extensions:
+        request.extensions = {**request.extensions, "trace": trace_callback}
+
+
+def _ends_sse_stream(chunk: bytes) -> bool:
+    return b"[DONE]" in chunk[-32:]
+
+
+class _SSEDrainingStream(httpx.SyncByteStream):
+    """
+    SDK stream readers stop at `data: [DONE]` and close the response before the
+    end-of-body marker is read, which makes the pool drop an HTTP/1.1 connection.
+    Once `[DONE]` was seen, the remaining (empty) body is read on close so the
+    connection can be reused.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream):
+        self._stream = stream
+        self._iterator = iter(stream)
+        self._done = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._iterator:
+            self._done = self._done or _ends_sse_stream(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        if self._done:
+            for _ in self._iterator:
+                pass
+        self._stream.close()
+
+
+class _AsyncSSEDrainingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self._stream = stream
+        self._iterator = stream.__aiter__()
+        self._done = False
+
+    async def __aiter__(self):
+        async for chunk in self._iterator:
+            self._done = self._done or _ends_sse_stream(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        if self._done:
+            async for _ in self._iterator:
+                pass
+        await self._stream.aclose()
+
+
+def _is_sse(response: httpx.Response) -> bool:
+    return response.headers.get("content-type", "").startswith("text/event-stream")
+
+
+class _TracingTransport(httpx.HTTPTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _with_trace(request, lambda event_name, info: _record_trace_event(event_name))
+        response = super().handle_request(request)
+        if _is_sse(response):
+            response.stream = _SSEDrainingStream(response.stream)
+        return response
+
+
+class _AsyncTracingTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async def trace(event_name, info):
+            _record_trace_event(event_name)
+
+        _with_trace(request, trace)
+        response = await super().handle_async_request(request)
+        if _is_sse(response):
+            response.stream = _AsyncSSEDrainingStream(response.stream)
+        return response
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def pool_settings(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the `litellm.http_pool` config section over the defaults."""
+    merged = {**DEFAULT_HTTP_POOL, **(settings or {})}
+    merged["http2"] = bool(merged["http2"]) and http2_available()
+    return merged
+
+
+def _build_clients(settings: Dict[str, Any]) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    limits = httpx.Limits(
+        max_connections=settings["max_connections"],
+        max_keepalive_connections=settings["max_keepalive_connections"],
+        keepalive_expiry=settings["keepalive_expiry"],
+    )
+    timeout = httpx.Timeout(settings["timeout"], connect=settings["connect_timeout"])
+    client = httpx.Client(
+        transport=_TracingTransport(limits=limits, http2=settings["http2"]),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+    aclient = httpx.AsyncClient(
+        transport=_AsyncTracingTransport(limits=limits, http2=settings["http2"]),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+    return client, aclient
+
+
+def get_http_clients(settings: Optional[Dict[str, Any]] = None) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the process-wide (sync, async) clients for these pool settings, creating them once."""
+    resolved = pool_settings(settings)
+    key = json.dumps(resolved, sort_keys=True)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = _build_clients(resolved)
+        return _clients[key]
+
+
+def install_http_clients(settings: Optional[Dict[str, Any]] = None) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Route litellm's OpenAI-compatible calls through the shared pooled clients, once per
+    process. Later calls reuse the installed pair, even with other settings, so clients
+    that requests may still be using are never replaced.
+    """
+    global _installed
+    resolved = pool_settings(settings)
+    key = json.dumps(resolved, sort_keys=True)
+    with _clients_lock:
+        if _installed is None:
+            if key not in _clients:
+                _clients[key] = _build_clients(resolved)
+            _installed = (key, _clients[key])
+            litellm.client_session, litellm.aclient_session = _installed[1]
+        elif _installed[0] != key:
+            typer.echo("[http_pool] ⚠️  HTTP clients are already installed; ignoring different pool settings")
+        return _installed[1]
+
+
+@contextmanager
+def trace_connections() -> Iterator[Dict[str, Any]]:
+    """
+    Collect connection-setup timings for requests made inside the block.
+
+    The yielded dict gains `requests`, `connect_time`, `tls_time` and `new_connections`;
+    requests sent without opening a new connection reused a pooled one.
+    """
+    trace: Dict[str, Any] = {}
+    token = _connection_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _connection_trace.reset(token)
@@ -1,12 +1,19 @@
 import hashlib
 import json
+import os
+import threading
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import NamedTuple, Optional, Dict, Any, List, Sequence
 
 import typer
 from litellm import completion, token_counter
 
+from cybermule.providers.cassette import get_cassette
+from cybermule.providers.http_pool import install_http_clients, trace_connections
+from cybermule.utils.file_utils import file_lock
+
 # -------------------------------
 # Named result for consistent returns
 # -------------------------------
@@ -15,6 +22,40 @@ class LLMResult(NamedTuple):
     input_tokens: int = 0
     output_tokens: int = 0
     reasoning_text: str = ''
+    ttft: Optional[float] = None
+    latency: float = 0.0
+    reasoning_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    connect_time: float = 0.0
+    tls_time: float = 0.0
+    connection_reused: Optional[bool] = None
+
+
+def _usage_field(usage: Any, *path: str) -> int:
+    """Read a (possibly nested) usage counter from a dict or litellm Usage object."""
+    value = usage
+    for key in path:
+        if value is None:
+            return 0
+        value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+    return value if isinstance(value, int) else 0
+
+
+# -------------------------------
+# Single-flight bookkeeping shared by all providers in the process
+# -------------------------------
+class _InFlightCall:
+    """A request currently being executed; concurrent callers wait on `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+_inflight_calls: Dict[str, _InFlightCall] = {}
+_inflight_lock = threading.Lock()
 
 
 # === Self-contained LLM Provider === #
@@ -26,30 +67,67 @@ class LLMProvider:
         max_tokens: int = 8192,
         system_prompt: str = '',
         api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
         mock_response: Optional[str] = None,
         cache_path: Optional[str] = ".llm_cache.json",
         show_token_summary: bool = True,
         debug_prompt: bool = False,
         thinking_budget_tokens: int = 0,
+        cassette: Optional[Dict[str, Any]] = None,
+        http_pool: Optional[Dict[str, Any]] = None,
     ):
         self.model = model
         self.api_key = api_key
+        self.api_base = api_base
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.system_prompt = system_prompt
         self.thinking_budget_tokens = thinking_budget_tokens
         self.mock_response = mock_response
+        self.cassette = get_cassette(cassette)
+        # Shared keep-alive pool, reused by every provider built with the same settings
+        self.http_client, self.async_http_client = install_http_clients(http_pool)
 
         self.cache_path = Path(cache_path).expanduser() if cache_path else None
+        self._lock = threading.RLock()
         self.cache = self._load_cache()
         self.input_tokens = 0
         self.output_tokens = 0
         self.total_calls = 0
         self.show_token_summary = show_token_summary
         self.debug_prompt = debug_prompt
+        self._local = threading.local()
+
+    @property
+    def last_call_stats(self) -> Optional[Dict[str, Any]]:
+        """Telemetry of the most recent `generate` call made from the current thread."""
+        return getattr(self._local, "last_call_stats", None)
+
+    def _record_call_stats(self, result: Optional[LLMResult] = None, cache_hit: bool = False) -> None:
+        result = result or LLMResult(text="")
+        generation_time = result.latency - (result.ttft or 0.0)
+        self._local.last_call_stats = {
+            "model": self.model,
+            "cache_hit": cache_hit,
+            "ttft": round(result.ttft, 4) if result.ttft is not None else None,
+            "latency": round(result.latency, 4),
+            "output_tokens_per_second": (round(result.output_tokens / generation_time, 2)
+                                         if result.output_tokens and generation_time > 0 else None),
+            "input_tokens": result.input_tokens,
+            "output_tokens": result.output_tokens,
+            "reasoning_tokens": result.reasoning_tokens,
+            "cache_read_tokens": result.cache_read_tokens,
+            "cache_write_tokens": result.cache_write_tokens,
+            "connect_time": round(result.connect_time, 4),
+            "tls_time": round(result.tls_time, 4),
+            "connection_reused": result.connection_reused,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        }
 
     def _hash_prompt(self, prompt: str, respond_prefix: str, history: Sequence[Dict[str, Any]]) -> str:
         key_material = json.dumps({
+            "model": self.model,
+            "temperature": self.temperature,
             "prompt": prompt,
             "respond_prefix": respond_prefix,
             "history": history,
@@ -65,11 +143,35 @@ class LLMProvider:
         except FileNotFoundError:
             return {}
 
+    def _cache_lock_path(self) -> Optional[Path]:
+        if self.cache_path is None:
+            return None
+        return self.cache_path.with_name(self.cache_path.name + ".lock")
+
+    def _key_lock_path(self, key: str) -> Optional[Path]:
+        if self.cache_path is None:
+            return None
+        return self.cache_path.with_name(self.cache_path.name + ".locks") / f"{key}.lock"
+
+    def _refresh_cache(self) -> None:
+        """Merge entries written to the cache file by other processes."""
+        with self._lock:
+            on_disk = self._load_cache()
+            on_disk.update(self.cache)
+            self.cache = on_disk
+
     def _save_cache(self):
         if self.cache_path is None:
             return
-        with open(self.cache_path, "w", encoding="utf-8") as f:
-            json.dump(self.cache, f, indent=2)
+        # Read-merge-write under the on-disk lock so concurrent writers don't drop entries,
+        # then swap the file in atomically so readers never see a partial JSON document.
+        with self._lock, file_lock(self._cache_lock_path()):
+            self._refresh_cache()
+            tmp_path = self.cache_path.with_name(
+                f"{self.cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
 
     def _build_messages(self, prompt: str, respond_prefix: str = '', history: Sequence[Dict[str, Any]] = (),
                         system_prompt: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -85,23 +187,84 @@ class LLMProvider:
     def generate(self, prompt: str, respond_prefix: str = '', history: Sequence[Dict[str, Any]] = ()) -> str:
         key = self._hash_prompt(prompt, respond_prefix, history)
         if key in self.cache:
+            self._record_call_stats(cache_hit=True)
             return self.cache[key]
 
-        if self.debug_prompt:
-            typer.echo("\n--- Prompt ---\n" + prompt + "\n--- End Prompt ---\n")
-
-        messages = self._build_messages(prompt, respond_prefix, history)
-        result = self._call_api(messages)
+        # Single-flight: the first caller for a key performs the request,
+        # concurrent callers with the same key wait for its result.
+        with _inflight_lock:
+            call = _inflight_calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _inflight_calls[key] = _InFlightCall()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            with self._lock:
+                self.cache[key] = call.result
+            self._record_call_stats(cache_hit=True)
+            return call.result
 
-        self._track_token_usage(result.input_tokens, result.output_tokens)
-        self.cache[key] = result.text
-        self._save_cache()
+        try:
+            call.result = self._generate_uncached(key, prompt, respond_prefix, history)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight_calls.pop(key, None)
+            call.done.set()
+
+    def _generate_uncached(self, key: str, prompt: str, respond_prefix: str,
+                           history: Sequence[Dict[str, Any]]) -> str:
+        key_lock_path = self._key_lock_path(key)
+        # Other processes sharing the cache file coordinate through a per-key lock:
+        # whoever gets it first calls the API, the others find the result on disk.
+        with file_lock(key_lock_path):
+            if self.cache_path is not None:
+                self._refresh_cache()
+                if key in self.cache:
+                    self._record_call_stats(cache_hit=True)
+                    return self.cache[key]
+
+            if self.debug_prompt:
+                typer.echo("\n--- Prompt ---\n" + prompt + "\n--- End Prompt ---\n")
+
+            messages = self._build_messages(prompt, respond_prefix, history)
+            result = self._call_api(messages)
+
+            self._track_token_usage(result.input_tokens, result.output_tokens)
+            self._record_call_stats(result)
+            with self._lock:
+                self.cache[key] = result.text
+            self._save_cache()
+
+        if key_lock_path is not None:
+            # Worst case another process re-creates the file and repeats the call;
+            # the cached result stays correct either way.
+            key_lock_path.unlink(missing_ok=True)
         return result.text
 
     def _call_api(self, messages: List[Dict[str, Any]]) -> LLMResult:
         if self.mock_response is not None:
             return LLMResult(text=self.mock_response, input_tokens=0, output_tokens=0)
 
+        started = time.perf_counter()
+        with trace_connections() as trace:
+            result = self._stream_completion(messages, started)
+        # Providers litellm doesn't route through the shared pool leave the trace empty
+        traced = bool(trace.get("requests"))
+        return result._replace(
+            latency=time.perf_counter() - started,
+            connect_time=trace.get("connect_time", 0.0),
+            tls_time=trace.get("tls_time", 0.0),
+            connection_reused=(not trace.get("new_connections")) if traced else None,
+        )
+
+    def _stream_completion(self, messages: List[Dict[str, Any]], started: float) -> LLMResult:
         # Count prompt tokens before streaming
         input_tokens = token_counter(model=self.model, messages=messages)
 
@@ -111,23 +274,10 @@ class LLMProvider:
         output_tokens = 0
         usage_tokens = None  # To store usage info from the final chunk
 
-        thinking = None
-        if self.thinking_budget_tokens:
-            thinking = {"type": "enabled", "budget_tokens": self.thinking_budget_tokens}
-
-        # Initiate streaming with usage tracking
-        response = completion(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            api_key=self.api_key,
-            stream=True,
-            stream_options={"include_usage": True},  # Enables usage info in the final chunk
-            thinking=thinking,
-        )
+        response = self._open_stream(messages)
 
         is_thinking = False
+        ttft = None
 
         for chunk in response:
             # Check if the chunk contains usage information
@@ -139,6 +289,8 @@ class LLMProvider:
 
             delta = chunk.choices[0].delta
             delta_reasoning_content = getattr(delta, 'reasoning_content', '')
+            if ttft is None and (delta_reasoning_content or delta.content):
+              ttft = time.perf_counter() - started
 
             # Check if the chunk contains content
             if delta_reasoning_content:
@@ -167,13 +319,48 @@ class LLMProvider:
             text=content,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            reasoning_text=reasoning_content
+            reasoning_text=reasoning_content,
+            ttft=ttft,
+            reasoning_tokens=_usage_field(usage_tokens, "completion_tokens_details", "reasoning_tokens"),
+            # OpenAI reports prompt-cache reads in prompt_tokens_details, Anthropic in cache_*_input_tokens
+            cache_read_tokens=(_usage_field(usage_tokens, "prompt_tokens_details", "cached_tokens")
+                               or _usage_field(usage_tokens, "cache_read_input_tokens")),
+            cache_write_tokens=_usage_field(usage_tokens, "cache_creation_input_tokens"),
+        )
+
+    def _open_stream(self, messages: List[Dict[str, Any]]):
+        """Start a streaming completion, recording or replaying it through the cassette if enabled."""
+        thinking = None
+        if self.thinking_budget_tokens:
+            thinking = {"type": "enabled", "budget_tokens": self.thinking_budget_tokens}
+
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "thinking": thinking,
+        }
+        if self.cassette and self.cassette.mode == "replay":
+            return self.cassette.replay(request)
+
+        # Initiate streaming with usage tracking
+        response = completion(
+            **request,
+            api_key=self.api_key,
+            api_base=self.api_base,
+            stream=True,
+            stream_options={"include_usage": True},  # Enables usage info in the final chunk
         )
+        if self.cassette and self.cassette.mode == "record":
+            return self.cassette.record(request, response)
+        return response
 
     def _track_token_usage(self, input_tokens: int, output_tokens: int) -> None:
-        self.input_tokens += input_tokens
-        self.output_tokens += output_tokens
-        self.total_calls += 1
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.total_calls += 1
         if self.show_token_summary:
             typer.echo(f"💸 Token Summary: {self.token_summary}")
 
@@ -3,13 +3,16 @@ from typing import Optional, Dict
 
 import typer
 
-from .ctags_index import _lookup_symbol
+from .symbol_index import _lookup_symbol, configure_symbol_index, get_symbol_index, normalize_symbol
 from .tree_sitter_lookup import (
     extract_symbol_definition,
     extract_function_at_line, 
     extract_called_symbols_on_line,
     extract_called_symbols_in_function,
-    extract_test_definitions
+    extract_test_definitions,
+    configure_parse_cache,
+    parse_batch,
+    parse_cache_stats,
 )
 
 def resolve_symbol_in_function(ref_path: Path, ref_function: str, symbol: str, project_root: Optional[Path] = None) -> Optional[Dict[str, str]]:
@@ -21,22 +24,25 @@ def resolve_symbol_in_function(ref_path: Path, ref_function: str, symbol: str, p
 
     try:
         candidates = extract_called_symbols_in_function(ref_path, ref_function)
-        if symbol in candidates:
-            return resolve_symbol(symbol, project_root)
+        if symbol in candidates or normalize_symbol(symbol).split(".")[-1] in candidates:
+            return resolve_symbol(symbol, project_root, ref_path=ref_path)
     except Exception as e:
         typer.echo(f"[resolve_symbol_in_function] Error for {symbol} in {ref_path}:{ref_function} – {e}")
     return None
 
-def resolve_symbol(symbol: str, project_root: Path) -> Optional[Dict[str, str]]:
+def resolve_symbol(symbol: str, project_root: Path, ref_path: Optional[Path] = None) -> Optional[Dict[str, str]]:
     """
     Resolves a symbol to its code definition.
-    Falls back from ctags → Tree-sitter.
+    Looks the symbol up in the project's symbol index, then extracts it with Tree-sitter.
+    `symbol` may be qualified (`Class.method`, `module.func`); among several definitions
+    the one nearest to `ref_path` (same file, imported modules, nearby packages) wins.
     Returns dict with keys: file, symbol, start_line, snippet, etc.
     """
-    result = _lookup_symbol(symbol, project_root)
+    result = _lookup_symbol(symbol, project_root, ref_path=ref_path)
     if result:
         file_path = Path(project_root) / result["file"]
-        definition = extract_symbol_definition(file_path, symbol)
+        name = result.get("name") or normalize_symbol(symbol).split(".")[-1]
+        definition = extract_symbol_definition(file_path, name, line=result.get("line"))
         if definition:
             return definition
     return None
@@ -55,10 +61,11 @@ def extract_definition_by_callsite(
     project_root = project_root or Path(".").resolve()
     try:
         symbols = extract_called_symbols_on_line(path, line)
+        name = normalize_symbol(symbol).split(".")[-1] if symbol else None
         for sym in symbols:
-            if symbol and sym != symbol:
+            if name and sym != name:
                 continue
-            result = resolve_symbol(symbol=sym, project_root=project_root)
+            result = resolve_symbol(symbol=symbol or sym, project_root=project_root, ref_path=path)
             if result:
                 return result
     except Exception as e:
@@ -68,10 +75,17 @@ def extract_definition_by_callsite(
 
 
 __all__ = [
+    "configure_parse_cache",
+    "parse_cache_stats",
+    "configure_symbol_index",
+    "get_symbol_index",
+    "extract_called_symbols_in_function",
+    "extract_called_symbols_on_line",
     "resolve_symbol",
     "resolve_symbol_in_function",
     "extract_definition_by_callsite",
     "extract_function_at_line",
     "extract_symbol_definition",
     "extract_test_definitions",
+    "parse_batch",
 ]
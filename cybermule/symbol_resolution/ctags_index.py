@@ -1,57 +1,49 @@
 import json
 import subprocess
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List
 
 import typer
 
-_symbol_index_cache: Dict[str, Dict[str, Dict]] = {}
+# Files per ctags invocation, to stay below command-line length limits
+CTAGS_BATCH_SIZE = 500
 
 
-def _generate_symbol_index(project_root: Path) -> Dict[str, Dict[str, str]]:
+def ctags_file_symbols(files: List[str], project_root: Path) -> Dict[str, List[Dict]]:
     """
-    Uses ctags to generate a symbol index for Python files in the given directory.
-    Returns a dict: symbol -> {file, line, kind}
+    Uses ctags to index the given Python files (relative to `project_root`).
+    Returns a dict: file -> [{name, line, kind, scope}], scope being the enclosing
+    class or function (e.g. `Outer.Inner`) or None at module level
     """
-    if str(project_root) in _symbol_index_cache:
-        return _symbol_index_cache[str(project_root)]
-
-    cmd = [
-        "ctags",
-        "-R",
-        "--fields=+n",  # include line numbers
-        "--languages=Python",
-        "--output-format=json",
-        str(project_root)
-    ]
-    try:
-        output = subprocess.check_output(cmd, universal_newlines=True)
-    except subprocess.CalledProcessError as e:#
-        typer.echo(f"[ctags] Failed: {e}")
-        return {}
-
-    index: Dict[str, Dict[str, str]] = {}
-
-    for line in output.strip().splitlines():
+    symbols: Dict[str, List[Dict]] = {}
+    for start in range(0, len(files), CTAGS_BATCH_SIZE):
+        cmd = [
+            "ctags",
+            "--fields=+n",  # include line numbers
+            "--languages=Python",
+            "--output-format=json",
+            "-f", "-",
+            *files[start:start + CTAGS_BATCH_SIZE],
+        ]
         try:
-            tag = json.loads(line)
-            name = tag.get("name")
-            path = tag.get("path")
-            line = str(tag.get("line", ""))
-            kind = tag.get("kind")
-
-            if name and path:
-                index[name] = {
-                    "file": path,
-                    "line": line,
-                    "kind": kind
-                }
-        except Exception as e:
-            typer.echo(f"[WARN] Failed to parse ctags JSON line: {e}")
-
-    return index
-
-
-def _lookup_symbol(symbol: str, project_root: Path) -> Optional[Dict[str, str]]:
-    index = _generate_symbol_index(project_root)
-    return index.get(symbol)
+            output = subprocess.check_output(cmd, cwd=project_root, universal_newlines=True)
+        except subprocess.CalledProcessError as e:
+            typer.echo(f"[ctags] Failed: {e}")
+            continue
+
+        for line in output.strip().splitlines():
+            try:
+                tag = json.loads(line)
+                name = tag.get("name")
+                path = tag.get("path")
+                if name and path:
+                    symbols.setdefault(path, []).append({
+                        "name": name,
+                        "line": tag.get("line"),
+                        "kind": tag.get("kind"),
+                        "scope": tag.get("scope"),
+                    })
+            except Exception as e:
+                typer.echo(f"[WARN] Failed to parse ctags JSON line: {e}")
+
+    return symbols
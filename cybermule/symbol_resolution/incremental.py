@@ -0,0 +1,160 @@
+"""
+Keep parsed trees and the symbol index in sync with code edits.
+
+After a change is applied, the edited line ranges are read from `git diff -U0`.
+The cached tree of each edited file is told about the edits (`Tree.edit`) and
+then re-parsed incrementally, which reuses every subtree outside the edited
+ranges. Definitions are then re-extracted from the new trees and written to the
+symbol index for the edited files only.
+"""
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import typer
+
+from cybermule.utils.git_utils import run_git_command
+
+from .native_index import index_tree
+from .symbol_index import blob_hash, refresh_symbol_index
+from .tree_sitter_lookup import ParsedFile, compute_line_offsets, get_parser, parse_cache
+
+_HUNK_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_INDEX_PATTERN = re.compile(r"^index ([0-9a-f]+)\.\.([0-9a-f]+)")
+
+
+class Hunk(NamedTuple):
+    old_start: int      # 1-based; for pure insertions the line after which lines were added
+    old_count: int
+    new_start: int      # 1-based; for pure deletions the line after which lines were removed
+    new_count: int
+
+
+class FileDiff(NamedTuple):
+    path: str
+    hunks: List[Hunk]
+    old_blob: Optional[str] = None      # abbreviated blob hashes from the `index` line
+    new_blob: Optional[str] = None
+
+
+def parse_diff_hunks(diff: str) -> Dict[str, FileDiff]:
+    """
+    Parse a unified diff (ideally `-U0`) into hunks per file, keyed by the new path.
+    Deleted files are keyed by their old path with no hunks.
+    """
+    files: Dict[str, FileDiff] = {}
+    old_path = path = None
+    blobs: Tuple[Optional[str], Optional[str]] = (None, None)
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            old_path = path = None
+            blobs = (None, None)
+        elif match := _INDEX_PATTERN.match(line):
+            blobs = (match.group(1), match.group(2))
+        elif line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            path = line[6:] if line.startswith("+++ b/") else None
+            key = path or old_path
+            if key:
+                files[key] = FileDiff(key, [], *blobs)
+        elif (match := _HUNK_PATTERN.match(line)) and (path or old_path) in files:
+            old_start, old_count, new_start, new_count = match.groups()
+            files[path or old_path].hunks.append(Hunk(
+                int(old_start), 1 if old_count is None else int(old_count),
+                int(new_start), 1 if new_count is None else int(new_count),
+            ))
+    return files
+
+
+def _line_offset(offsets: List[int], line: int, total: int) -> int:
+    return offsets[line] if line < len(offsets) else total
+
+
+def edit_tree(old: ParsedFile, new_bytes: bytes, hunks: List[Hunk]):
+    """
+    A copy of `old.tree` with the hunks applied as tree edits, ready to be passed to
+    `parser.parse(new_bytes, old_tree)`. Edits are line-aligned and applied in order,
+    so each one is expressed in the coordinates of the partially edited document.
+    """
+    tree = old.tree.copy()
+    new_offsets = compute_line_offsets(new_bytes)
+    for hunk in hunks:
+        # 0-based first line of the hunk on each side
+        old_line = hunk.old_start if hunk.old_count == 0 else hunk.old_start - 1
+        new_line = hunk.new_start if hunk.new_count == 0 else hunk.new_start - 1
+        old_length = (_line_offset(old.line_offsets, old_line + hunk.old_count, len(old.source_bytes))
+                      - _line_offset(old.line_offsets, old_line, len(old.source_bytes)))
+
+        # Text before the hunk already matches the new document
+        start_byte = _line_offset(new_offsets, new_line, len(new_bytes))
+        tree.edit(
+            start_byte=start_byte,
+            old_end_byte=start_byte + old_length,
+            new_end_byte=_line_offset(new_offsets, new_line + hunk.new_count, len(new_bytes)),
+            start_point=(new_line, 0),
+            old_end_point=(new_line + hunk.old_count, 0),
+            new_end_point=(new_line + hunk.new_count, 0),
+        )
+    return tree
+
+
+def reparse_file(path: Path, file_diff: FileDiff) -> Tuple[ParsedFile, bool]:
+    """
+    Parse the edited file, incrementally when the parse cache holds the tree of the
+    version the diff was taken against. Returns (parsed file, whether it was incremental).
+    """
+    old = parse_cache.peek(path)
+    stat = path.stat()
+    source = path.read_text(encoding="utf-8")
+    source_bytes = source.encode("utf8")
+
+    # The hunks only describe the edit if both ends are the versions the diff saw
+    usable = (
+        old is not None and file_diff.old_blob and file_diff.new_blob
+        and blob_hash(old.source_bytes).startswith(file_diff.old_blob)
+        and blob_hash(source_bytes).startswith(file_diff.new_blob)
+    )
+    if not usable:
+        parse_cache.invalidate(path)
+        return parse_cache.get(path), False
+
+    tree = get_parser().parse(source_bytes, edit_tree(old, source_bytes, file_diff.hunks))
+    parsed = ParsedFile(source, source_bytes, tree, compute_line_offsets(source_bytes),
+                        stat.st_mtime_ns, stat.st_size, {})
+    parse_cache.put(path, parsed)
+    return parsed, True
+
+
+def refresh_after_change(since_sha: str, project_root: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Bring cached trees and the symbol index up to date with everything changed since
+    `since_sha` (commits and working tree) in Python files under `project_root`.
+
+    Returns:
+        Counts of `incremental` and `full` re-parses, `deleted` files and `indexed` files
+    """
+    root = Path(project_root or ".").resolve()
+    diff = run_git_command(["diff", "-U0", "--no-color", "--no-ext-diff", "--relative",
+                            since_sha, "--", "*.py"], capture_output=True, cwd=str(root))
+
+    counts = {"incremental": 0, "full": 0, "deleted": 0, "indexed": 0}
+    files = parse_diff_hunks(diff)
+    prepared: Dict[str, List[Dict]] = {}
+    for rel, file_diff in files.items():
+        path = root / rel
+        if not path.is_file():
+            parse_cache.invalidate(path)
+            counts["deleted"] += 1
+            continue
+        try:
+            parsed, incremental = reparse_file(path, file_diff)
+        except (OSError, UnicodeDecodeError) as e:
+            typer.echo(f"[incremental] ⚠️  Could not re-parse {rel}: {e}")
+            continue
+        counts["incremental" if incremental else "full"] += 1
+        prepared[rel] = index_tree(parsed.tree, parsed.source_bytes)
+
+    if files:
+        counts["indexed"] = refresh_symbol_index(root, list(files), prepared=prepared)
+    return counts
@@ -0,0 +1,117 @@
+"""
+Project symbol indexer built on the tree-sitter parser used for lookups, so
+symbol resolution needs no external ctags binary. Large file sets are indexed
+on a process pool.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .tree_sitter_lookup import get_node_text, get_parser
+
+# Below this many files the pool's start-up cost outweighs the parallelism
+MIN_FILES_FOR_POOL = 200
+FILES_PER_TASK = 64
+# The index is often first built from a worker thread while other threads run; forking
+# then could copy locks held by those threads into the children
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Statements whose bodies can hold definitions (if/try/with blocks at module or class level)
+_CONTAINER_SUFFIXES = ("_statement", "_clause", "block")
+
+
+def _assignment_names(node, source_bytes: bytes) -> List[str]:
+    assignment = node.named_children[0] if node.named_children else None
+    if assignment is None or assignment.type != "assignment":
+        return []
+    left = assignment.child_by_field_name("left")
+    return [get_node_text(left, source_bytes)] if left is not None and left.type == "identifier" else []
+
+
+def _collect(node, source_bytes: bytes, scope: List[str], scope_kind: Optional[str], symbols: List[Dict]) -> None:
+    for child in node.named_children:
+        if child.type == "decorated_definition":
+            child = child.child_by_field_name("definition") or child
+
+        if child.type in ("function_definition", "class_definition"):
+            name_node = child.child_by_field_name("name")
+            if name_node is None:
+                continue
+            name = get_node_text(name_node, source_bytes)
+            if child.type == "class_definition":
+                kind = "class"
+            else:
+                kind = "member" if scope_kind == "class" else "function"
+            symbols.append({
+                "name": name,
+                "line": child.start_point[0] + 1,
+                "end_line": child.end_point[0] + 1,
+                "start_byte": child.start_byte,
+                "end_byte": child.end_byte,
+                "kind": kind,
+                "scope": ".".join(scope) or None,
+            })
+            body = child.child_by_field_name("body")
+            if body is not None:
+                _collect(body, source_bytes, scope + [name], "class" if kind == "class" else "function", symbols)
+        elif child.type == "expression_statement" and scope_kind != "function":
+            # Module and class attributes; locals inside functions are not indexed
+            for name in _assignment_names(child, source_bytes):
+                symbols.append({
+                    "name": name,
+                    "line": child.start_point[0] + 1,
+                    "end_line": child.end_point[0] + 1,
+                    "start_byte": child.start_byte,
+                    "end_byte": child.end_byte,
+                    "kind": "variable",
+                    "scope": ".".join(scope) or None,
+                })
+        elif child.type.endswith(_CONTAINER_SUFFIXES):
+            _collect(child, source_bytes, scope, scope_kind, symbols)
+
+
+def index_tree(tree, source_bytes: bytes) -> List[Dict]:
+    """Definitions in an already parsed source (see `index_source`)."""
+    symbols: List[Dict] = []
+    _collect(tree.root_node, source_bytes, [], None, symbols)
+    return symbols
+
+
+def index_source(source_bytes: bytes) -> List[Dict]:
+    """
+    Definitions in a Python source: classes, functions, methods and module/class
+    level variables, with line spans, byte ranges, kind and enclosing scope.
+    """
+    return index_tree(get_parser().parse(source_bytes), source_bytes)
+
+
+def _index_files(project_root: str, files: List[str]) -> List[Tuple[str, List[Dict]]]:
+    results = []
+    for rel in files:
+        try:
+            source_bytes = (Path(project_root) / rel).read_bytes()
+        except OSError:
+            continue
+        results.append((rel, index_source(source_bytes)))
+    return results
+
+
+def tree_sitter_file_symbols(files: List[str], project_root: Path,
+                             workers: Optional[int] = None) -> Dict[str, List[Dict]]:
+    """
+    Index the given Python files (relative to `project_root`) with tree-sitter.
+    Returns a dict: file -> [{name, line, end_line, start_byte, end_byte, kind, scope}]
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < MIN_FILES_FOR_POOL:
+        return dict(_index_files(str(project_root), files))
+
+    chunks = [files[i:i + FILES_PER_TASK] for i in range(0, len(files), FILES_PER_TASK)]
+    symbols: Dict[str, List[Dict]] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+        for results in pool.map(_index_files, [str(project_root)] * len(chunks), chunks):
+            symbols.update(results)
+    return symbols
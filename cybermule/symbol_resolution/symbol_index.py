@@ -0,0 +1,409 @@
+"""
+Persistent, incrementally updated symbol index.
+
+The index lives in `<project_root>/.cybermule/symbol_index.json` and keeps, per
+source file, its mtime, size, content hash and the definitions found in it.
+A refresh only re-indexes files whose content changed: unchanged stat data is
+trusted, and for files git reports as clean the blob hash from git's index
+stands in for reading the file.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import typer
+
+INDEX_VERSION = 2
+DEFAULT_INDEX_PATH = Path(".cybermule") / "symbol_index.json"
+DEFAULT_SYMBOL_INDEX = {
+    "indexer": "tree-sitter",   # or "ctags" (needs universal-ctags installed)
+    "workers": None,            # tree-sitter indexing processes; default: CPU count
+}
+# Directories never indexed when the project is not a git checkout
+SKIP_DIRS = {".git", ".cybermule", "__pycache__", ".venv", "venv", ".tox", "node_modules", "site-packages"}
+
+# files (relative to the project root) -> {relative path: [{name, line, kind, scope, ...}]}
+Indexer = Callable[[List[str], Path], Dict[str, List[Dict]]]
+
+# Kinds that only bind a name (imports, variables), ranked after real definitions
+WEAK_KINDS = {"variable", "unknown", "namespace", "module", "import"}
+# Receivers the LLM prefixes to method names
+_RECEIVERS = {"self", "cls", "super()"}
+
+_IMPORT_PATTERN = re.compile(
+    r"^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+(?:\(([^)]*)\)|([\w \t,*]+))"
+    r"|import[ \t]+([\w.]+(?:[ \t]*,[ \t]*[\w.]+)*))",
+    re.MULTILINE)
+
+
+def blob_hash(data: bytes) -> str:
+    """Content hash in git's blob format, comparable with `git ls-files -s`."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _git_lines(project_root: Path, *args: str) -> Optional[List[str]]:
+    try:
+        output = subprocess.run(["git", *args], cwd=project_root, capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [line for line in output.decode("utf-8", "surrogateescape").split("\0") if line]
+
+
+def list_source_files(project_root: Path) -> List[str]:
+    """Python files under the project, relative to it; honours .gitignore in git checkouts."""
+    files = _git_lines(project_root, "ls-files", "-z", "-co", "--exclude-standard", "--", "*.py")
+    if files is not None:
+        return sorted(f for f in files if (project_root / f).is_file())
+
+    found = []
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        found.extend(os.path.relpath(os.path.join(dirpath, f), project_root)
+                     for f in filenames if f.endswith(".py"))
+    return sorted(found)
+
+
+def git_clean_blobs(project_root: Path) -> Dict[str, str]:
+    """Blob hashes from git's index for tracked python files without worktree changes."""
+    staged = _git_lines(project_root, "ls-files", "-z", "-s", "--", "*.py") or []
+    modified = set(_git_lines(project_root, "ls-files", "-z", "-m", "--", "*.py") or [])
+    blobs = {}
+    for line in staged:
+        meta, _, path = line.partition("\t")
+        if path not in modified:
+            blobs[path] = meta.split()[1]
+    return blobs
+
+
+def module_name(rel: str) -> str:
+    """Dotted module name of a file relative to the project root (`pkg/mod.py` -> `pkg.mod`)."""
+    parts = list(Path(rel).with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def qualified_name(rel: str, symbol: Dict) -> str:
+    """`module.Scope.name` for an index entry."""
+    scoped = f"{symbol['scope']}.{symbol['name']}" if symbol.get("scope") else symbol["name"]
+    module = module_name(rel)
+    return f"{module}.{scoped}" if module else scoped
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Strip call parentheses and receivers from a symbol as the LLM writes it, e.g. `self.run()`."""
+    symbol = symbol.strip().strip("`")
+    symbol = re.sub(r"\(.*\)$", "", symbol)
+    parts = [p for p in symbol.split(".") if p]
+    while len(parts) > 1 and parts[0] in _RECEIVERS:
+        parts.pop(0)
+    return ".".join(parts)
+
+
+def _module_files(module: str, project_root: Path) -> List[str]:
+    base = Path(*module.split(".")) if module else Path()
+    return [str(candidate) for candidate in (base.with_suffix(".py"), base / "__init__.py")
+            if (project_root / candidate).is_file()]
+
+
+def imported_files(ref_path: Path, project_root: Path) -> Dict[str, List[str]]:
+    """
+    Project files imported by `ref_path`, relative to the project root, with the names
+    each import brings in (empty for `import module`).
+    """
+    project_root = Path(project_root).resolve()
+    path = Path(ref_path)
+    path = path if path.is_absolute() else project_root / path
+    try:
+        source = path.read_text(encoding="utf-8")
+        package = Path(os.path.relpath(path.resolve(), project_root)).parent
+    except (OSError, ValueError):
+        return {}
+
+    imports: Dict[str, List[str]] = {}
+    for match in _IMPORT_PATTERN.finditer(source):
+        from_module, parenthesized, names, plain = match.groups()
+        if plain:
+            for module in plain.split(","):
+                module = module.strip()
+                # `import a.b` makes a.b and its parent packages available
+                for i in range(module.count(".") + 1):
+                    for rel in _module_files(".".join(module.split(".")[:i + 1]), project_root):
+                        imports.setdefault(rel, [])
+            continue
+
+        dots = len(from_module) - len(from_module.lstrip("."))
+        module = from_module.lstrip(".")
+        if dots:
+            anchor = package
+            for _ in range(dots - 1):
+                anchor = anchor.parent
+            prefix = ".".join(p for p in anchor.parts if p not in ("", "."))
+            module = ".".join(p for p in (prefix, module) if p)
+        names = (parenthesized or names).replace("\n", " ")
+        imported = [n.split(" as ")[0].strip() for n in names.split(",") if n.strip()]
+        for rel in _module_files(module, project_root):
+            imports.setdefault(rel, []).extend(imported)
+        # `from pkg import mod` imports a submodule
+        for name in imported:
+            for rel in _module_files(f"{module}.{name}" if module else name, project_root):
+                imports.setdefault(rel, [])
+    return imports
+
+
+def _path_distance(a: str, b: str) -> int:
+    a_parts, b_parts = Path(a).parts, Path(b).parts
+    common = 0
+    for x, y in zip(a_parts, b_parts):
+        if x != y:
+            break
+        common += 1
+    return len(a_parts) + len(b_parts) - 2 * common
+
+
+class SymbolIndex:
+    """
+    Definitions per file, persisted across processes and refreshed incrementally.
+
+    Example:
+        index = SymbolIndex(project_root, indexer=tree_sitter_file_symbols)
+        index.refresh()             # re-indexes only changed files
+        index.lookup("parse_args")  # {"file": "cli/args.py", "line": 12, "kind": "function"}
+    """
+
+    def __init__(self, project_root: Path, indexer: Indexer, path: Optional[Path] = None):
+        self.project_root = Path(project_root).resolve()
+        self.indexer = indexer
+        self.path = Path(path) if path else self.project_root / DEFAULT_INDEX_PATH
+        self._lock = threading.RLock()
+        self.files: Dict[str, Dict] = self._load()
+        self._names: Optional[Dict[str, Dict]] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # The indexer name is part of the format: entries from another indexer are rebuilt
+        if data.get("version") != INDEX_VERSION or data.get("indexer") != self._indexer_name():
+            return {}
+        return data.get("files", {})
+
+    def _indexer_name(self) -> str:
+        indexer = getattr(self.indexer, "func", self.indexer)   # unwrap functools.partial
+        return getattr(indexer, "__name__", type(indexer).__name__)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "indexer": self._indexer_name(), "files": self.files}, f)
+        os.replace(tmp_path, self.path)
+
+    def _changed_files(self, paths: Iterable[str]) -> Tuple[List[str], bool]:
+        """
+        Files whose content differs from the index, and whether any entry was updated
+        (stat data of files whose content turned out unchanged is refreshed in place).
+        """
+        changed, updated, blobs = [], False, None
+        for rel in paths:
+            try:
+                stat = (self.project_root / rel).stat()
+            except FileNotFoundError:
+                updated |= self.files.pop(rel, None) is not None
+                continue
+            entry = self.files.get(rel)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+
+            if blobs is None:
+                blobs = git_clean_blobs(self.project_root)
+            sha = blobs.get(rel) or blob_hash((self.project_root / rel).read_bytes())
+            updated = True
+            if entry and entry["sha"] == sha:
+                entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+            else:
+                changed.append(rel)
+                self.files[rel] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha": sha, "symbols": []}
+        return changed, updated
+
+    def refresh(self, paths: Optional[Iterable[str]] = None,
+                prepared: Optional[Dict[str, List[Dict]]] = None) -> int:
+        """
+        Bring the index up to date and save it if anything changed.
+
+        Args:
+            paths: Only check these files (relative or absolute); default is the whole project
+            prepared: Symbols already extracted for some files (relative path -> symbols, in
+                this index's format), e.g. from an incremental re-parse; the indexer only
+                runs for the other changed files
+
+        Returns:
+            Number of files re-indexed
+        """
+        started = time.perf_counter()
+        with self._lock:
+            removed = []
+            if paths is None:
+                current = list_source_files(self.project_root)
+                removed = set(self.files) - set(current)
+                for rel in removed:
+                    del self.files[rel]
+            else:
+                current = [os.path.relpath(self.project_root / p, self.project_root) for p in paths]
+
+            changed, updated = self._changed_files(current)
+            if changed:
+                prepared = prepared or {}
+                remaining = [rel for rel in changed if rel not in prepared]
+                symbols = {**(self.indexer(remaining, self.project_root) if remaining else {}), **prepared}
+                for rel in changed:
+                    self.files[rel]["symbols"] = symbols.get(rel, [])
+            if updated or removed:
+                self._names = None
+                self.save()
+
+        if changed:
+            typer.echo(f"[symbol_index] Re-indexed {len(changed)} of {len(current)} file(s) "
+                       f"in {time.perf_counter() - started:.2f}s")
+        return len(changed)
+
+    def definitions(self) -> Dict[str, List[Dict]]:
+        """name -> every definition of it: [{name, qualname, file, line, kind, scope}]"""
+        with self._lock:
+            if self._names is None:
+                names: Dict[str, List[Dict]] = {}
+                for rel, entry in sorted(self.files.items()):
+                    for symbol in entry["symbols"]:
+                        names.setdefault(symbol["name"], []).append(
+                            {**symbol, "file": rel, "qualname": qualified_name(rel, symbol)})
+                self._names = names
+            return self._names
+
+    def names(self) -> Dict[str, Dict]:
+        """symbol -> {file, line, kind} of its first definition (see `candidates` for all)."""
+        return {name: defs[0] for name, defs in self.definitions().items()}
+
+    def candidates(self, symbol: str, ref_path: Optional[Path] = None) -> List[Dict]:
+        """
+        Definitions matching a bare, qualified (`Class.method`, `pkg.mod.func`) or
+        loosely written (`self.run()`) symbol, best first.
+
+        Ranking: how much of the qualifier matches the definition's qualified name,
+        then the reference file itself, files it imports (names it imports first),
+        path proximity to it, and real definitions before variables and imports.
+        """
+        normalized = normalize_symbol(symbol)
+        if not normalized:
+            return []
+        parts = normalized.split(".")
+        definitions = self.definitions()
+        matches = definitions.get(parts[-1])
+        if not matches:
+            lowered = parts[-1].lower()
+            matches = [d for name, defs in definitions.items() if name.lower() == lowered for d in defs]
+        if not matches:
+            return []
+
+        ref_rel, imports = None, {}
+        if ref_path is not None:
+            ref = Path(ref_path)
+            ref = ref if ref.is_absolute() else self.project_root / ref
+            ref_rel = os.path.relpath(ref.resolve(), self.project_root)
+            imports = imported_files(ref, self.project_root)
+
+        qualifier = parts[:-1]
+
+        def rank(definition: Dict) -> tuple:
+            qualified = definition["qualname"].split(".")
+            if qualifier and qualified[-len(parts):] == parts:
+                qualifier_rank = 0
+            elif qualifier:
+                qualifier_rank = 2 - bool(set(qualifier) & set(qualified[:-1]))
+            else:
+                qualifier_rank = 0
+            rel = definition["file"]
+            if ref_rel is None:
+                location_rank = (0, 0)
+            elif rel == ref_rel:
+                location_rank = (0, 0)
+            elif rel in imports:
+                location_rank = (1, 0 if parts[-1] in imports[rel] or not imports[rel] else 1)
+            else:
+                location_rank = (2, _path_distance(rel, ref_rel))
+            weak = definition.get("kind") in WEAK_KINDS
+            return qualifier_rank, location_rank, weak, rel, definition.get("line") or 0
+
+        return sorted(matches, key=rank)
+
+    def lookup(self, symbol: str, ref_path: Optional[Path] = None) -> Optional[Dict]:
+        ranked = self.candidates(symbol, ref_path)
+        return ranked[0] if ranked else None
+
+
+_settings: Dict[str, Any] = dict(DEFAULT_SYMBOL_INDEX)
+_indexes: Dict[str, SymbolIndex] = {}
+# Held while loading an index so concurrent lookups refresh it once per process
+_indexes_lock = threading.Lock()
+
+
+def configure_symbol_index(settings: Optional[Dict[str, Any]] = None) -> None:
+    """Apply the `symbol_index` config section; indexes loaded so far are dropped."""
+    global _settings
+    with _indexes_lock:
+        _settings = {**DEFAULT_SYMBOL_INDEX, **(settings or {})}
+        _indexes.clear()
+
+
+def get_indexer(name: Optional[str] = None) -> Indexer:
+    name = name or _settings["indexer"]
+    if name == "ctags":
+        from .ctags_index import ctags_file_symbols
+        return ctags_file_symbols
+    if name == "tree-sitter":
+        from .native_index import tree_sitter_file_symbols
+        return functools.partial(tree_sitter_file_symbols, workers=_settings.get("workers"))
+    raise ValueError(f"[symbol_index] Unknown indexer '{name}', expected 'tree-sitter' or 'ctags'")
+
+
+def get_symbol_index(project_root: Path) -> SymbolIndex:
+    """
+    The project's persistent symbol index, brought up to date on first use in this process.
+    """
+    key = str(Path(project_root).resolve())
+    if key in _indexes:
+        return _indexes[key]
+
+    with _indexes_lock:
+        if key not in _indexes:
+            index = SymbolIndex(Path(key), indexer=get_indexer())
+            index.refresh()
+            _indexes[key] = index
+        return _indexes[key]
+
+
+def refresh_symbol_index(project_root: Path, paths: Iterable[str],
+                         prepared: Optional[Dict[str, List[Dict]]] = None) -> int:
+    """
+    Re-index edited files in the project's index if this process already loaded it
+    (an index loaded later is refreshed on load anyway). Returns files re-indexed.
+    """
+    index = _indexes.get(str(Path(project_root).resolve()))
+    if index is None:
+        return 0
+    if prepared and index._indexer_name() != "tree_sitter_file_symbols":
+        prepared = None
+    return index.refresh(paths=paths, prepared=prepared)
+
+
+def _lookup_symbol(symbol: str, project_root: Path, ref_path: Optional[Path] = None) -> Optional[Dict[str, str]]:
+    """Best definition of a bare or qualified symbol, ranked relative to `ref_path` if given."""
+    return get_symbol_index(project_root).lookup(symbol, ref_path=ref_path)
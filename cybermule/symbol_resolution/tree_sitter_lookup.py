@@ -1,48 +1,275 @@
+import bisect
+import contextvars
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, List
-from tree_sitter import Language, Parser, Node
+from typing import Any, Optional, Dict, Iterator, List, NamedTuple, Tuple
+from tree_sitter import Language, Parser, Node, Query, QueryCursor, Tree
 import tree_sitter_python as tspython
 import typer
 
 PY_LANGUAGE = Language(tspython.language())
 
-parser = Parser(PY_LANGUAGE)
+# Parsers are not shareable across threads; each thread gets its own
+_local = threading.local()
+
+
+def get_parser() -> Parser:
+    if not hasattr(_local, "parser"):
+        _local.parser = Parser(PY_LANGUAGE)
+    return _local.parser
+
 
 def parse_source(source: str):
-    return parser.parse(bytes(source, "utf8"))
+    return get_parser().parse(bytes(source, "utf8"))
+
+
+class ParsedFile(NamedTuple):
+    source: str
+    source_bytes: bytes
+    tree: Tree
+    line_offsets: List[int]     # byte offset of the start of each line
+    mtime_ns: int
+    size: int
+    queries: Dict[str, Any]     # query results over `tree`, computed on first use
+
+
+def compute_line_offsets(source_bytes: bytes) -> List[int]:
+    offsets = [0]
+    index = source_bytes.find(b"\n")
+    while index != -1:
+        offsets.append(index + 1)
+        index = source_bytes.find(b"\n", index + 1)
+    return offsets
+
+
+DEFAULT_PARSE_CACHE_MB = 256
+# Rough in-memory size of a tree node, for the cache's memory cap
+_NODE_BYTES = 48
+
+
+def _entry_size(parsed: ParsedFile) -> int:
+    return 2 * len(parsed.source_bytes) + 8 * len(parsed.line_offsets) + \
+        _NODE_BYTES * parsed.tree.root_node.descendant_count
+
+
+class ParseCache:
+    """
+    LRU cache of parsed files keyed by path, mtime and size, shared by every lookup in
+    the process and capped by the estimated memory of its sources and trees.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_PARSE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[ParsedFile, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, path: Path) -> ParsedFile:
+        key = str(Path(path).resolve())
+        stat = Path(key).stat()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and (cached[0].mtime_ns, cached[0].size) == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        source = Path(key).read_text(encoding="utf-8")
+        source_bytes = source.encode("utf8")
+        parsed = ParsedFile(source, source_bytes, get_parser().parse(source_bytes),
+                            compute_line_offsets(source_bytes), stat.st_mtime_ns, stat.st_size, {})
+        self.put(key, parsed)
+        return parsed
+
+    def peek(self, path: Path) -> Optional[ParsedFile]:
+        """The cached parse of a file, even if the file changed since; no LRU or stats update."""
+        with self._lock:
+            cached = self._entries.get(str(Path(path).resolve()))
+        return cached[0] if cached else None
+
+    def put(self, path: Path, parsed: ParsedFile) -> None:
+        key = str(Path(path).resolve())
+        size = _entry_size(parsed)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._bytes -= previous[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (parsed, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            previous = self._entries.pop(str(Path(path).resolve()), None)
+            if previous:
+                self._bytes -= previous[1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+parse_cache = ParseCache()
+
+
+def configure_parse_cache(settings: Optional[Dict[str, Any]] = None) -> None:
+    """Apply the `parse_cache` config section (`max_mb`)."""
+    parse_cache.max_bytes = int((settings or {}).get("max_mb", DEFAULT_PARSE_CACHE_MB) * 1024 * 1024)
+    parse_cache.invalidate()
+
+
+def parse_cache_stats() -> Dict[str, Any]:
+    """Hits, misses, hit rate, evictions and size of the shared parse cache."""
+    return parse_cache.stats()
+
+
+class ParseMemo:
+    """
+    Files read within one batch of lookups, loaded once: the batch sees one consistent
+    version of each file even if it changes on disk meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[threading.Lock, list]] = {}
+
+    def load(self, path: Path) -> ParsedFile:
+        key = str(Path(path).resolve())
+        with self._lock:
+            lock, slot = self._entries.setdefault(key, (threading.Lock(), []))
+        with lock:
+            if not slot:
+                slot.append(_read_and_parse(path))
+        return slot[0]
+
+
+_parse_memo: contextvars.ContextVar[Optional[ParseMemo]] = contextvars.ContextVar(
+    "cybermule_parse_memo", default=None)
+
+
+@contextmanager
+def parse_batch() -> Iterator[ParseMemo]:
+    """
+    Share parsed files between lookups made inside the block (including lookups on
+    worker threads started with a copy of this context).
+    """
+    memo = _parse_memo.get() or ParseMemo()
+    token = _parse_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _parse_memo.reset(token)
+
+
+def _read_and_parse(path: Path) -> ParsedFile:
+    return parse_cache.get(path)
+
+
+def load_parsed(path: Path) -> ParsedFile:
+    """The parsed file, from the current batch or the shared parse cache."""
+    memo = _parse_memo.get()
+    return memo.load(path) if memo else _read_and_parse(path)
+
+
+def load_tree(path: Path) -> Tuple[str, bytes, Tree]:
+    """Return (source, source_bytes, tree) for a file, reusing cached parses."""
+    parsed = load_parsed(path)
+    return parsed.source, parsed.source_bytes, parsed.tree
 
 
 def get_node_text(node, source_bytes) -> str:
     return source_bytes[node.start_byte:node.end_byte].decode("utf8")
 
 
-def walk_tree(node):
-    yield node
-    for child in node.children:
-        yield from walk_tree(child)
+# One pass over a file captures every definition and every call to a named function
+OUTLINE_QUERY = Query(PY_LANGUAGE, """
+(function_definition name: (identifier) @name) @definition
+(class_definition name: (identifier) @name) @definition
+(call function: [(identifier) @callee
+                 (attribute attribute: (identifier) @callee)]) @call
+""")
+
+
+class Definition(NamedTuple):
+    node: Node
+    name: str
+
+
+class Call(NamedTuple):
+    node: Node
+    callee: str     # called name; the attribute for method calls
+
+
+class FileOutline(NamedTuple):
+    definitions: List[Definition]   # functions and classes, in document order
+    calls: List[Call]               # in document order
+    call_lines: List[int]           # 1-based start line of each call, for bisecting
 
 
-def extract_symbol_definition(path: Path, symbol: str) -> Optional[Dict[str, str]]:
+def _query_outline(tree: Tree, source_bytes: bytes) -> FileOutline:
+    definitions, calls = [], []
+    for _, captures in QueryCursor(OUTLINE_QUERY).matches(tree.root_node):
+        if "definition" in captures:
+            definitions.append(Definition(captures["definition"][0],
+                                          get_node_text(captures["name"][0], source_bytes)))
+        else:
+            calls.append(Call(captures["call"][0], get_node_text(captures["callee"][0], source_bytes)))
+    # Outer calls first when calls start together, as in `str(x).strip()`
+    calls.sort(key=lambda call: (call.node.start_byte, -call.node.end_byte))
+    return FileOutline(definitions, calls, [call.node.start_point[0] + 1 for call in calls])
+
+
+def file_outline(parsed: ParsedFile) -> FileOutline:
+    """Definitions and calls of a parsed file, queried once and kept with the parse."""
+    outline = parsed.queries.get("outline")
+    if outline is None:
+        outline = parsed.queries["outline"] = _query_outline(parsed.tree, parsed.source_bytes)
+    return outline
+
+
+def extract_symbol_definition(path: Path, symbol: str, line: Optional[int] = None) -> Optional[Dict[str, str]]:
+    """
+    Definition of `symbol` in a file; with `line`, the definition starting on that line
+    is preferred over the first one with the name.
+    """
     try:
-        source = path.read_text(encoding="utf-8")
-        source_bytes = source.encode("utf8")
-        tree = parse_source(source)
-        root = tree.root_node
-
-        for node in walk_tree(root):
-            if node.type in {"function_definition", "class_definition"}:
-                name_node = node.child_by_field_name("name")
-                if name_node and get_node_text(name_node, source_bytes) == symbol:
-                    start_line = node.start_point[0] + 1
-                    end_line = node.end_point[0] + 1
-                    snippet = "\n".join(source.splitlines()[start_line - 1:end_line])
-                    return {
-                        "file": str(path),
-                        "symbol": symbol,
-                        "start_line": start_line,
-                        "traceback_line": start_line,
-                        "snippet": snippet,
-                    }
+        parsed = load_parsed(path)
+        matches = [d.node for d in file_outline(parsed).definitions if d.name == symbol]
+
+        if matches:
+            node = min(matches, key=lambda n: line is not None and n.start_point[0] + 1 != line)
+            start_line = node.start_point[0] + 1
+            end_line = node.end_point[0] + 1
+            snippet = "\n".join(parsed.source.splitlines()[start_line - 1:end_line])
+            return {
+                "file": str(path),
+                "symbol": symbol,
+                "start_line": start_line,
+                "traceback_line": start_line,
+                "snippet": snippet,
+            }
     except Exception as e:
         typer.echo(f"[tree_sitter] Failed to extract {symbol} from {path}: {e}")
     return None
@@ -50,29 +277,23 @@ def extract_symbol_definition(path: Path, symbol: str) -> Optional[Dict[str, str
 
 def extract_function_at_line(source_path: Path, line_number: int) -> Optional[Dict[str, str]]:
     try:
-        source = source_path.read_text(encoding="utf-8")
-        source_bytes = source.encode("utf8")
-        tree = parse_source(source)
-        root = tree.root_node
-
-        best_node = None
-        for node in walk_tree(root):
-            if node.type in {"function_definition", "class_definition"}:
-                start = node.start_point[0] + 1
-                end = node.end_point[0] + 1
-                if start <= line_number <= end:
-                    if best_node is None or start > best_node.start_point[0]:
-                        best_node = node
-
-        if best_node:
-            start_line = best_node.start_point[0] + 1
-            end_line = best_node.end_point[0] + 1
-            snippet = "\n".join(source.splitlines()[start_line - 1:end_line])
-            name_node = best_node.child_by_field_name("name")
-            symbol = get_node_text(name_node, source_bytes) if name_node else "<unknown>"
+        parsed = load_parsed(source_path)
+
+        best = None
+        for definition in file_outline(parsed).definitions:
+            start = definition.node.start_point[0] + 1
+            end = definition.node.end_point[0] + 1
+            if start <= line_number <= end:
+                if best is None or start > best.node.start_point[0]:
+                    best = definition
+
+        if best:
+            start_line = best.node.start_point[0] + 1
+            end_line = best.node.end_point[0] + 1
+            snippet = "\n".join(parsed.source.splitlines()[start_line - 1:end_line])
             return {
                 "file": str(source_path),
-                "symbol": symbol,
+                "symbol": best.name,
                 "start_line": start_line,
                 "traceback_line": line_number,
                 "snippet": snippet,
@@ -86,40 +307,22 @@ def extract_function_at_line(source_path: Path, line_number: int) -> Optional[Di
 def extract_called_symbols_on_line(path: Path, lineno: int) -> List[str]:
     results = []
     try:
-        source = path.read_text(encoding="utf-8")
-        source_bytes = source.encode("utf8")
-        tree = parse_source(source)
-        root = tree.root_node
-
-        for node in walk_tree(root):
-            if node.type == "call":
-                line = node.start_point[0] + 1
-                if line == lineno:
-                    func_node = node.child_by_field_name("function")
-                    if func_node:
-                        if func_node.type == "identifier":
-                            results.append(get_node_text(func_node, source_bytes))
-                        elif func_node.type == "attribute":
-                            name_node = func_node.child_by_field_name("attribute")
-                            if name_node:
-                                results.append(get_node_text(name_node, source_bytes))
+        outline = file_outline(load_parsed(path))
+        first = bisect.bisect_left(outline.call_lines, lineno)
+        last = bisect.bisect_right(outline.call_lines, lineno)
+        results = [call.callee for call in outline.calls[first:last]]
 
     except Exception as e:
         typer.echo(f"[tree_sitter] Failed to extract calls on line {lineno} in {path}: {e}")
     return results
 
 def extract_function_by_name(path: Path, func_name: str):
-    source = path.read_text(encoding="utf-8")
-    source_bytes = source.encode("utf-8")
-    tree = parse_source(source)
-    root = tree.root_node
+    parsed = load_parsed(path)
 
-    for node in walk_tree(root):
-        if node.type == "function_definition":
-            name_node = node.child_by_field_name("name")
-            if name_node and get_node_text(name_node, source_bytes) == func_name:
-                return node, source, source_bytes
-    return None, source, source_bytes
+    for definition in file_outline(parsed).definitions:
+        if definition.node.type == "function_definition" and definition.name == func_name:
+            return definition.node, parsed.source, parsed.source_bytes
+    return None, parsed.source, parsed.source_bytes
 
 
 def extract_called_symbols_in_function(path: Path, func_name: str) -> List[str]:
@@ -128,16 +331,13 @@ def extract_called_symbols_in_function(path: Path, func_name: str) -> List[str]:
     if not node:
         return results
 
-    for child in walk_tree(node):
-        if child.type == "call":
-            func_node = child.child_by_field_name("function")
-            if func_node:
-                if func_node.type == "identifier":
-                    results.append(get_node_text(func_node, source_bytes))
-                elif func_node.type == "attribute":
-                    name_node = func_node.child_by_field_name("attribute")
-                    if name_node:
-                        results.append(get_node_text(name_node, source_bytes))
+    outline = file_outline(load_parsed(path))
+    first = bisect.bisect_left(outline.call_lines, node.start_point[0] + 1)
+    for call in outline.calls[first:]:
+        if call.node.start_byte >= node.end_byte:
+            break
+        if call.node.start_byte >= node.start_byte:
+            results.append(call.callee)
     return results
 
 
@@ -151,19 +351,8 @@ def extract_test_definitions(file_path: Path, test_identifier: Optional[str] = N
     test_identifier = extract_function_symbol(test_identifier)
 
     try:
-        source = file_path.read_text(encoding="utf-8")
-        source_bytes = source.encode("utf-8")
-        tree = parse_source(source)
-        root = tree.root_node
-
-        def is_test_function(node: Node) -> bool:
-            if node.type != "function_definition":
-                return False
-            name_node = node.child_by_field_name("name")
-            if not name_node:
-                return False
-            name = get_node_text(name_node, source_bytes)
-            return name.startswith("test_")
+        parsed = load_parsed(file_path)
+        source_lines = parsed.source.splitlines()
 
         def is_directly_within_class_or_module(node: Node) -> bool:
             ancestor = node.parent
@@ -175,18 +364,18 @@ def extract_test_definitions(file_path: Path, test_identifier: Optional[str] = N
                 ancestor = ancestor.parent
             return False
 
-        for node in walk_tree(root):
-            if not is_test_function(node) or not is_directly_within_class_or_module(node):
+        for definition in file_outline(parsed).definitions:
+            node, symbol = definition
+            if node.type != "function_definition" or not symbol.startswith("test_"):
                 continue
-
-            name_node = node.child_by_field_name("name")
-            symbol = get_node_text(name_node, source_bytes)
             if test_identifier is not None and symbol != test_identifier:
                 continue
+            if not is_directly_within_class_or_module(node):
+                continue
 
             start_line = node.start_point[0] + 1
             end_line = node.end_point[0] + 1
-            snippet = "\n".join(source.splitlines()[start_line - 1:end_line])
+            snippet = "\n".join(source_lines[start_line - 1:end_line])
             results.append({
                 "file": str(file_path),
                 "symbol": symbol,
@@ -0,0 +1,277 @@
+"""
+A local, OpenAI-compatible stand-in for a real LLM API.
+
+litellm can target it through `api_base`, so the provider's streaming, usage
+chunks, token counting, error handling and concurrency are exercised end to end without
+calling (or paying for) a real model:
+
+    litellm:
+      model: "openai/mock"
+      api_base: "http://127.0.0.1:8765/v1"
+      api_key: "mock"
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import yaml
+
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+class MockServerSettings(NamedTuple):
+    ttft: float = 0.0                # seconds before the first content chunk
+    tokens_per_second: float = 0.0   # 0 streams as fast as possible
+    error_rate: float = 0.0          # fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0     # fraction of requests answered with HTTP 429
+    seed: Optional[int] = None
+
+
+def load_script(path: Path) -> List[Dict[str, str]]:
+    """
+    Load scripted responses from a YAML/JSON file.
+
+    The file holds a list of entries, either plain strings (served in order, cycling)
+    or `{match: <substring>, response: <text>}` rules checked against the last user message.
+    """
+    entries = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or []
+    return [e if isinstance(e, dict) else {"response": str(e)} for e in entries]
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word-sized pieces that stand in for model tokens."""
+    return _TOKEN_PATTERN.findall(text)
+
+
+def template_response(prompt: str) -> str:
+    """Return a well-formed answer for the cybermule prompt template that produced `prompt`."""
+    if "<traceback>" in prompt:
+        return ("<error_summary>\n"
+                "Exception Type: AssertionError\n"
+                "Error Cause: Mock failure produced by the stand-in server\n"
+                "Location: unknown\n"
+                "Context: unknown\n"
+                "Details: none\n"
+                "</error_summary>")
+
+    if "<code_context>" in prompt:
+        match = re.search(r"\[file\] (.+)\n\[symbol\] (.+)\n", prompt)
+        file, symbol = (match.group(1), match.group(2)) if match else ("unknown.py", "unknown")
+        plan = {
+            "fix_description": "Mock fix from the stand-in server",
+            "edits": [{
+                "file": file,
+                "symbol": symbol,
+                "fix_description": "Apply the mock fix.",
+                "justification": "Scripted by the stand-in server.",
+            }],
+        }
+        return "<error_analysis>Mock analysis.</error_analysis>\n```json\n" + json.dumps(plan, indent=2) + "\n```"
+
+    if "<conversation>" in prompt:
+        return "<digest>\nMock digest of the conversation so far.\n</digest>"
+
+    if "<existing_tests>" in prompt:
+        return "```python\ndef test_mock_suggestion():\n    assert True\n```"
+
+    if "prompt evaluator" in prompt and "<variant_a>" in prompt:
+        result = {"winner": "A", "justification": "Mock."}
+        return "```json\n" + json.dumps(result) + "\n```"
+
+    if "prompt evaluator" in prompt:
+        node_ids = re.findall(r"Node ID: ([\w-]+)", prompt)
+        scores = {node_id: 3 for node_id in node_ids}
+        result = {"scores": scores, "winner": node_ids[0] if node_ids else "", "justification": "Mock."}
+        return "```json\n" + json.dumps(result) + "\n```"
+
+    return "Mock response from the stand-in LLM server."
+
+
+class MockLLMServer:
+    """Serve `/v1/chat/completions` from a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 settings: MockServerSettings = MockServerSettings(),
+                 script: Optional[List[Dict[str, str]]] = None):
+        self.settings = settings
+        self.script = script or []
+        self.request_count = 0
+        self._script_pos = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(settings.seed)
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def pick_response(self, prompt: str) -> str:
+        with self._lock:
+            for entry in self.script:
+                if entry.get("match") and entry["match"] in prompt:
+                    return entry["response"]
+            ordered = [e for e in self.script if not e.get("match")]
+            if ordered:
+                response = ordered[self._script_pos % len(ordered)]["response"]
+                self._script_pos += 1
+                return response
+        return template_response(prompt)
+
+    def roll_failure(self) -> Optional[int]:
+        with self._lock:
+            self.request_count += 1
+            roll = self._random.random()
+        if roll < self.settings.rate_limit_rate:
+            return 429
+        if roll < self.settings.rate_limit_rate + self.settings.error_rate:
+            return 500
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):  # keep benchmark output quiet
+                pass
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                status = server.roll_failure()
+                if status == 429:
+                    self._send_json(429, {"error": {"message": "Rate limited by stand-in server",
+                                                    "type": "rate_limit_error"}},
+                                    headers={"Retry-After": "1"})
+                    return
+                if status == 500:
+                    self._send_json(500, {"error": {"message": "Injected stand-in server error",
+                                                    "type": "server_error"}})
+                    return
+
+                messages = body.get("messages", [])
+                prompt = _last_user_text(messages)
+                text = server.pick_response(prompt)
+                tokens = split_tokens(text)
+                usage = {
+                    "prompt_tokens": sum(len(split_tokens(_content_text(m))) for m in messages),
+                    "completion_tokens": len(tokens),
+                }
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                model = body.get("model", "mock")
+
+                if body.get("stream"):
+                    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+                    self._stream(model, tokens, usage if include_usage else None)
+                else:
+                    time.sleep(server.settings.ttft + _stream_seconds(server.settings, len(tokens)))
+                    self._send_json(200, {
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": text}}],
+                        "usage": usage,
+                    })
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, model: str, tokens: List[str], usage: Optional[Dict[str, int]]):
+                # Chunked transfer encoding keeps the connection reusable, like a real API
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+                created = int(time.time())
+
+                def write_event(data: bytes):
+                    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+
+                def send(choices, extra=None):
+                    chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": created,
+                             "model": model, "choices": choices, **(extra or {})}
+                    write_event(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+
+                time.sleep(server.settings.ttft)
+                send([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+                delay = _stream_seconds(server.settings, 1)
+                for token in tokens:
+                    send([{"index": 0, "delta": {"content": token}, "finish_reason": None}])
+                    if delay:
+                        time.sleep(delay)
+                send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+                if usage is not None:
+                    send([], {"usage": usage})
+                write_event(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def _stream_seconds(settings: MockServerSettings, token_count: int) -> float:
+    if not settings.tokens_per_second:
+        return 0.0
+    return token_count / settings.tokens_per_second
+
+
+def _content_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+def _last_user_text(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return _content_text(message)
+    return ""
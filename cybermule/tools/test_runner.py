@@ -1,8 +1,44 @@
+import hashlib
 import re
 import subprocess
 from pathlib import Path
+from typing import NamedTuple
 import typer
 
+# Innermost frames that make up a failure signature
+SIGNATURE_FRAMES = 3
+# Tracebacks sent to the LLM per failure cluster
+CLUSTER_SAMPLES = 2
+
+_NORMALIZE_PATTERNS = [
+    # Temporary files and directories (pytest tmp_path, tempfile, macOS per-user temp)
+    (re.compile(r"(?:/private)?(?:/var/folders/[^/\s]+/[^/\s]+/T|/tmp)(?:/[^/\s'\":,)]+)+"), "<tmp>"),
+    # Object addresses and ids
+    (re.compile(r"0x[0-9a-fA-F]+"), "0x?"),
+    # Line numbers in python and pytest frame locations
+    (re.compile(r"(File \"[^\"]+\", line )\d+"), r"\1N"),
+    (re.compile(r"(\.py):\d+"), r"\1:N"),
+    # Parametrization ids, e.g. test_parse[case-3]
+    (re.compile(r"(test\w*)\[[^\]\n]*\]"), r"\1[*]"),
+]
+
+_PYTHON_FRAME = re.compile(r'File "([^"]+)", line \w+, in (\S+)')
+_PYTEST_LOCATION = re.compile(r"^(\S+\.py):N: ?(?:in (\S+)|([A-Za-z_][\w.]*))?\s*$", re.MULTILINE)
+_DEF_LINE = re.compile(r"^\s*(?:async\s+)?def (\w+)\(", re.MULTILINE)
+_E_LINE = re.compile(r"^E\s+([A-Za-z_][\w.]*)(?::|\s*$)", re.MULTILINE)
+_EXCEPTION_LINE = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt|Failed))(?::|\s*$)", re.MULTILINE)
+
+
+class FailureCluster(NamedTuple):
+    signature: str
+    exception: str
+    names: list[str]        # every failing test sharing the signature
+    samples: list[str]      # up to CLUSTER_SAMPLES representative tracebacks
+
+    @property
+    def count(self) -> int:
+        return len(self.names)
+
 
 def run_shell_block(label: str, script_path: str | None = None,
                     command_block: str | None = None, may_fail=False) -> str:
@@ -93,6 +129,96 @@ def extract_failures_blocks(output):
   return len(failure_blocks), failure_blocks
 
 
+def failure_name(block: str) -> str:
+    """Return the test name heading a failure block from `extract_failures_blocks`."""
+    return block.split("\n", 1)[0].strip() or "unknown"
+
+
+def normalize_traceback(traceback: str) -> str:
+    """
+    Strip run-specific noise from a traceback: memory addresses, temp paths,
+    line numbers and parametrization ids.
+    """
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        traceback = pattern.sub(replacement, traceback)
+    return traceback
+
+
+def _frames(normalized: str) -> list[tuple[str, str]]:
+    """(file, function) pairs from a normalized python or pytest traceback, outermost first."""
+    frames = [(path, func) for path, func in _PYTHON_FRAME.findall(normalized)]
+    start = 0
+    for match in _PYTEST_LOCATION.finditer(normalized):
+        func = match.group(2)
+        if not func:
+            # Long tracebacks show the frame's source instead of "in <func>"
+            defs = _DEF_LINE.findall(normalized, start, match.start())
+            func = defs[-1] if defs else "?"
+        frames.append((match.group(1), func))
+        start = match.end()
+    return frames
+
+
+def _exception_type(normalized: str) -> str:
+    for match in reversed(list(_PYTEST_LOCATION.finditer(normalized))):
+        if match.group(3):
+            return match.group(3)
+    for pattern in (_E_LINE, _EXCEPTION_LINE):
+        found = pattern.findall(normalized)
+        if found:
+            return found[-1] if pattern is _EXCEPTION_LINE else found[0]
+    return "unknown"
+
+
+def failure_signature(block: str, frames: int = SIGNATURE_FRAMES) -> tuple[str, str]:
+    """
+    Signature of a failure block: a hash of its innermost frames and exception type.
+
+    Failures with the same root cause (e.g. a broken import hit by many tests) share
+    a signature even when their test names, temp paths and line numbers differ.
+
+    Returns:
+        Tuple of (signature, exception type).
+    """
+    normalized = normalize_traceback(block.split("\n", 1)[1] if "\n" in block else block)
+    exception = _exception_type(normalized)
+    innermost = _frames(normalized)[-frames:]
+    # Without recognizable frames fall back to the whole normalized traceback
+    material = repr((exception, innermost)) if innermost else normalized.strip()
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()[:12], exception
+
+
+def cluster_failures(blocks: list[str], samples: int = CLUSTER_SAMPLES) -> list[FailureCluster]:
+    """
+    Group failure blocks by signature, largest cluster first (ties keep test order).
+    """
+    clusters: dict[str, FailureCluster] = {}
+    for block in blocks:
+        signature, exception = failure_signature(block)
+        cluster = clusters.setdefault(signature, FailureCluster(signature, exception, [], []))
+        cluster.names.append(failure_name(block))
+        if len(cluster.samples) < samples:
+            cluster.samples.append(block)
+    return sorted(clusters.values(), key=lambda c: -c.count)
+
+
+def format_cluster(cluster: FailureCluster, max_names: int = 20) -> str:
+    """
+    Render a cluster as one traceback for the LLM: the failure count, the affected
+    tests and the representative samples. A single failure is returned unchanged.
+    """
+    if cluster.count == 1:
+        return cluster.samples[0]
+
+    names = ", ".join(cluster.names[:max_names])
+    if cluster.count > max_names:
+        names += f" (+{cluster.count - max_names} more)"
+    parts = [f"{cluster.count} failing tests share this failure ({cluster.exception}): {names}"]
+    for i, sample in enumerate(cluster.samples, start=1):
+        parts.append(f"--- Sample {i}/{len(cluster.samples)}: {failure_name(sample)} ---\n{sample}")
+    return "\n\n".join(parts)
+
+
 def run_single_test(test_name: str, config: dict) -> tuple[bool, str]:
     """
     Run a single test using config-specified command/script. Return (success, traceback).
@@ -1,9 +1,46 @@
 from pathlib import Path
+from typing import List, Optional
 
 
 def get_prompt_path(config, name: str) -> str:
     return config.get("prompt_paths", {}).get(name, Path(__file__).parent.parent / f"prompts/{name}")
 
+
+def get_model_route(config: dict, prompt_template: str) -> List[Optional[str]]:
+    """
+    Return the ordered model cascade for a prompt template, cheapest first.
+
+    Reads `model_routing.<template>` from config; templates without a route
+    get a single `None` entry, meaning "use litellm.model unchanged".
+    """
+    models = config.get("model_routing", {}).get(prompt_template) or []
+    return list(models) or [None]
+
+
+def get_history_budget(config: dict, model: Optional[str]) -> Optional[int]:
+    """
+    Return the chat-history token budget for `model`, or None when unbudgeted.
+
+    `history.token_budget` is either a single number or a mapping of model name
+    to budget, with an optional `default` entry.
+    """
+    budget = config.get("history", {}).get("token_budget")
+    if isinstance(budget, dict):
+        budget = budget.get(model, budget.get("default"))
+    return int(budget) if budget is not None else None
+
+
+def with_llm_options(config: dict, **options) -> dict:
+    """Return a shallow copy of config with `options` merged into its litellm section."""
+    return {**config, "litellm": {**config.get("litellm", {}), **options}}
+
+
+def with_model(config: dict, model: Optional[str]) -> dict:
+    """Return a shallow copy of config whose litellm section targets `model`."""
+    if model is None:
+        return config
+    return with_llm_options(config, model=model)
+
 def get_aider_extra_args(config: dict) -> list[str]:
     """
     Converts the LLM config section into Aider CLI args.
@@ -1,10 +1,15 @@
 import re
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 import typer
 
-from cybermule.symbol_resolution import extract_function_at_line
+from cybermule.symbol_resolution import extract_function_at_line, parse_batch
+from cybermule.utils.token_utils import estimate_tokens
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 6000
+# Path parts marking third-party code inside a project directory
+LIBRARY_DIRS = {"site-packages", "dist-packages", ".venv", "venv", ".tox", "node_modules"}
 
 def extract_locations(traceback: str, drop_site_package_prefix=True) -> List[Dict]:
     locations = []
@@ -23,35 +28,142 @@ def extract_locations(traceback: str, drop_site_package_prefix=True) -> List[Dic
             file = extract_module_path(file)
         locations.append({"file": file, "line": int(line), "function": func})
 
-    return locations
+    # A frame matched by both styles is only reported once
+    return list({(loc["file"], loc["line"], loc["function"]): loc for loc in locations}.values())
 
-def get_context_snippets(locations: List[Dict], fallback_window: int = 5) -> List[Dict]:
-    context_snippets = []
 
-    for loc in locations:
-        file_path = Path(loc["file"])
-        if not file_path.exists():
+def _context_span(context: Dict) -> Tuple[int, int]:
+    return context["start_line"], context["start_line"] + context["snippet"].count("\n")
+
+
+def _collect_contexts(locations: List[Dict], fallback_window: int) -> List[Tuple[Dict, int]]:
+    """
+    One context per enclosing function (or merged line window) with the depth of its
+    innermost frame, where depth 0 is the raise site. Contexts keep traceback order.
+    """
+    collected: List[Tuple[Dict, int]] = []
+    functions: Dict[Tuple[str, int, int], int] = {}
+    windows: Dict[str, List[List[int]]] = {}   # file -> [start, end, traceback_line, depth]
+
+    with parse_batch():
+        for index, loc in enumerate(locations):
+            file_path = Path(loc["file"])
+            if not file_path.exists():
+                continue
+
+            depth = len(locations) - 1 - index
+            line_no = loc["line"]
+            match = extract_function_at_line(file_path, line_no)
+
+            if match is None:
+                windows.setdefault(str(file_path), []).append(
+                    [max(1, line_no - fallback_window), line_no + fallback_window, line_no, depth])
+                collected.append(({"file": str(file_path), "window": True}, depth))
+                continue
+
+            key = (match["file"], *_context_span(match))
+            if key in functions:
+                # Another frame in the same function: keep the one nearest the raise site
+                position = functions[key]
+                if depth < collected[position][1]:
+                    collected[position] = (match, depth)
+                continue
+            functions[key] = len(collected)
+            collected.append((match, depth))
+
+    # Merge overlapping line windows per file; the first placeholder of a file holds them
+    results: List[Tuple[Dict, int]] = []
+    emitted = set()
+    for context, depth in collected:
+        if not context.get("window"):
+            results.append((context, depth))
             continue
+        if context["file"] in emitted:
+            continue
+        emitted.add(context["file"])
+        results.extend(_merge_windows(context["file"], windows[context["file"]], functions))
+    return results
+
 
-        line_no = loc["line"]
-        match = extract_function_at_line(file_path, line_no)
-
-        if match is None:
-            lines = file_path.read_text(encoding="utf-8").splitlines()
-            start = max(0, line_no - fallback_window - 1)
-            end = min(len(lines), line_no + fallback_window)
-            snippet = "\n".join(lines[start:end])
-            context_snippets.append({
-                "file": str(file_path),
-                "symbol": None,
-                "start_line": start + 1,
-                "traceback_line": line_no,
-                "snippet": snippet
-            })
+def _merge_windows(file: str, windows: List[List[int]],
+                   functions: Dict[Tuple[str, int, int], int]) -> List[Tuple[Dict, int]]:
+    lines = Path(file).read_text(encoding="utf-8").splitlines()
+    merged: List[List[int]] = []
+    for start, end, line_no, depth in sorted(windows):
+        if merged and start <= merged[-1][1] + 1:
+            last = merged[-1]
+            last[1] = max(last[1], end)
+            if depth < last[3]:
+                last[2], last[3] = line_no, depth
         else:
-            context_snippets.append(match)
+            merged.append([start, end, line_no, depth])
+
+    results = []
+    for start, end, line_no, depth in merged:
+        end = min(end, len(lines))
+        # Windows already covered by an enclosing function context add nothing
+        if any(f == file and f_start <= start and end <= f_end for f, f_start, f_end in functions):
+            continue
+        results.append(({
+            "file": file,
+            "symbol": None,
+            "start_line": start,
+            "traceback_line": line_no,
+            "snippet": "\n".join(lines[start - 1:end]),
+        }, depth))
+    return results
+
+
+def get_context_snippets(locations: List[Dict], fallback_window: int = 5) -> List[Dict]:
+    """
+    Code contexts for traceback frames: the enclosing function of each frame, or a
+    window of lines around it. Frames in the same function share one context and
+    overlapping windows are merged.
+    """
+    return [context for context, _ in _collect_contexts(locations, fallback_window)]
+
+
+def is_project_file(path: str, project_root: Optional[Path] = None) -> bool:
+    """True for files under `project_root` that are not vendored or installed packages."""
+    root = Path(project_root or ".").resolve()
+    try:
+        relative = Path(path).resolve().relative_to(root)
+    except ValueError:
+        return False
+    return not LIBRARY_DIRS.intersection(relative.parts)
+
+
+def assemble_contexts(
+    locations: List[Dict],
+    project_root: Optional[Path] = None,
+    token_budget: Optional[int] = DEFAULT_CONTEXT_TOKEN_BUDGET,
+    fallback_window: int = 5,
+) -> List[Dict]:
+    """
+    Build the traceback's code contexts for a prompt within a token budget.
+
+    Contexts are deduplicated as in `get_context_snippets`, ranked with project code
+    before library code and, within each, by proximity to the raise site, then
+    packed greedily into `token_budget` tokens. The top-ranked context is always
+    kept. The selection is returned in traceback order.
+    """
+    collected = _collect_contexts(locations, fallback_window)
+    ranked = sorted(range(len(collected)), key=lambda i: (
+        not is_project_file(collected[i][0]["file"], project_root), collected[i][1]))
+
+    selected, used = set(), 0
+    for i in ranked:
+        tokens = estimate_tokens(collected[i][0]["snippet"])
+        if selected and token_budget is not None and used + tokens > token_budget:
+            continue
+        selected.add(i)
+        used += tokens
 
-    return context_snippets
+    dropped = len(collected) - len(selected)
+    if dropped:
+        typer.echo(f"[context_extract] Dropped {dropped} of {len(collected)} code contexts "
+                   f"to fit {token_budget} tokens")
+    return [collected[i][0] for i in sorted(selected)]
 
 def extract_module_path(full_path):
     path = Path(full_path)
@@ -1,8 +1,14 @@
+from contextlib import contextmanager
 from glob import glob
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import typer
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms fall back to no file locking
+    fcntl = None
+
 def read_file_content(file_path: Path, verbose: bool = True) -> str:
     """
     Read content from a file with optional error message printing.
@@ -33,3 +39,19 @@ def resolve_context_inputs(entries: List[str]) -> List[Path]:
             matches = glob(entry, recursive=True)
             files.update(Path(m) for m in matches if Path(m).is_file())
     return sorted(files)
+
+
+@contextmanager
+def file_lock(lock_path: Optional[Path]):
+    """Hold an exclusive advisory lock on `lock_path` (no-op without a path or fcntl)."""
+    if lock_path is None or fcntl is None:
+        yield
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -1,14 +1,16 @@
 import subprocess
 import re
+from typing import Optional
 
 
-def run_git_command(cmd: list[str], capture_output: bool = False) -> str:
-    """Run a Git command and optionally return its output."""
+def run_git_command(cmd: list[str], capture_output: bool = False, cwd: Optional[str] = None) -> str:
+    """Run a Git command (in `cwd` if given) and optionally return its output."""
     result = subprocess.run(
         ["git"] + cmd,
         check=True,
         text=True,
-        capture_output=capture_output
+        capture_output=capture_output,
+        cwd=cwd,
     )
     return result.stdout.strip() if capture_output else ""
 
@@ -58,9 +60,9 @@ def run_git_commit(message: str):
     run_git_command(["commit", "-m", message])
 
 
-def get_latest_commit_sha() -> str:
+def get_latest_commit_sha(cwd: Optional[str] = None) -> str:
     """Return the SHA of the latest commit."""
-    return run_git_command(["rev-parse", "HEAD"], capture_output=True)
+    return run_git_command(["rev-parse", "HEAD"], capture_output=True, cwd=cwd)
 
 
 def get_latest_commit_message() -> str:
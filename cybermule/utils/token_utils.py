@@ -0,0 +1,35 @@
+from typing import Any, Dict, Iterable, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap, model-agnostic token estimate (~4 characters per token).
+
+    Good enough for budgeting prompt sections; use litellm's token_counter
+    when an exact, model-specific count is needed.
+    """
+    return (len(text) + 3) // 4 if text else 0
+
+
+def message_text(message: Dict[str, Any]) -> str:
+    """Return the plain text of a chat message whose content is a string or a list of chunks."""
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(chunk.get("text", "") for chunk in content)
+
+
+def estimate_message_tokens(messages: Iterable[Dict[str, Any]]) -> int:
+    return sum(estimate_tokens(message_text(m)) for m in messages)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """USD cost of a call from litellm's price map, or None for models it doesn't know."""
+    from litellm import cost_per_token
+
+    try:
+        prompt_cost, completion_cost = cost_per_token(
+            model=model, prompt_tokens=input_tokens, completion_tokens=output_tokens)
+    except Exception:
+        return None
+    return prompt_cost + completion_cost
@@ -1,11 +1,18 @@
 # cybermule/version_info.py
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
-from contextlib import chdir
+
 
 def get_version_info() -> Dict[str, str]:
+    # A copy, so callers can't change the cached info for everyone else
+    return dict(_version_info())
+
+
+@lru_cache(maxsize=None)
+def _version_info() -> Dict[str, str]:
     try:
         from cybermule import _version
         return {
@@ -18,8 +25,8 @@ def get_version_info() -> Dict[str, str]:
 
             cybermule_path = Path(__file__).resolve().parent
 
-            with chdir(cybermule_path):
-                commit = get_latest_commit_sha()
+            # Pass cwd rather than chdir: steps may log from several threads at once
+            commit = get_latest_commit_sha(cwd=str(cybermule_path))
 
         except Exception:
             commit = "unknown"
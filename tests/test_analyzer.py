@@ -296,3 +296,184 @@ def test_fix_plan_max_rounds_exceeded(
 
     assert fix.get("needs_more_context") is True
     assert "required_info" in fix
+
+
+def _plan_for(symbol):
+    return f'''```json
+{{
+  "fix_description": "Fix {symbol}",
+  "edits": [{{"file": "tests/fixtures/calls_local.py", "symbol": "{symbol}",
+              "fix_description": "patch", "justification": "bug"}}]
+}}
+```'''
+
+
+@patch("cybermule.executors.llm_runner.get_prompt_path")
+@patch("cybermule.executors.llm_runner.render_template")
+def test_speculative_fix_picks_applicable_candidate(
+    mock_render_template,
+    mock_get_prompt_path,
+    monkeypatch,
+    tmp_path
+):
+    mock_get_prompt_path.return_value = "/dev/null/generate_fix_from_summary.j2"
+    mock_render_template.return_value = "fix prompt"
+
+    class TemperatureLLM:
+        def __init__(self, temperature):
+            self.temperature = temperature
+
+        def generate(self, *args, **kwargs):
+            # Only the 0.6 candidate edits a symbol that is shown in CODE_CONTEXTS
+            return _plan_for("wrapper" if self.temperature == 0.6 else "not_shown")
+
+    monkeypatch.setattr(
+        "cybermule.executors.llm_runner.get_llm_provider",
+        lambda cfg: TemperatureLLM(cfg["litellm"]["temperature"])
+    )
+
+    traceback = 'File "tests/fixtures/calls_local.py", line 5, in wrapper'
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    parent = graph.new("Summary")
+
+    fix, node_id = analyzer.generate_fix_from_summary(
+        error_summary="boom",
+        traceback=traceback,
+        config={"fix": {"speculative_temperatures": [0.2, 0.6, 1.0]}},
+        graph=graph,
+        parent_id=parent,
+        candidates=3,
+    )
+
+    assert fix["edits"][0]["symbol"] == "wrapper"
+    winner = graph.get(node_id)
+    assert winner["status"] == "FIX_FINALIZED"
+    assert winner["temperature"] == 0.6
+
+    siblings = graph.children_of(parent)
+    assert len(siblings) == 3
+    assert all("candidate" in s["tags"] for s in siblings)
+
+
+@patch("cybermule.executors.llm_runner.get_prompt_path")
+@patch("cybermule.executors.llm_runner.render_template")
+def test_losing_candidates_stop_writing_after_the_winner(
+    mock_render_template,
+    mock_get_prompt_path,
+    monkeypatch,
+    tmp_path
+):
+    import threading
+    import time
+
+    mock_get_prompt_path.return_value = "/dev/null/generate_fix_from_summary.j2"
+    mock_render_template.return_value = "fix prompt"
+    release = threading.Event()
+
+    class TemperatureLLM:
+        def __init__(self, temperature):
+            self.temperature = temperature
+
+        def generate(self, *args, **kwargs):
+            if self.temperature != 0.6:
+                release.wait(5)    # still running when the 0.6 candidate wins
+            return _plan_for("wrapper" if self.temperature == 0.6 else "not_shown")
+
+    monkeypatch.setattr(
+        "cybermule.executors.llm_runner.get_llm_provider",
+        lambda cfg: TemperatureLLM(cfg["litellm"]["temperature"])
+    )
+
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    parent = graph.new("Summary")
+    updates = []
+    original_update = graph.update
+    monkeypatch.setattr(graph, "update", lambda node_id, **kw: (updates.append((node_id, kw.get("status"))),
+                                                                original_update(node_id, **kw))[1])
+
+    winner, plans = analyzer._race_fix_candidates(
+        {"fix": {"speculative_temperatures": [0.2, 0.6, 1.0]}}, graph, parent,
+        {"ERROR_SUMMARY": "boom", "CODE_CONTEXTS": []}, [{"symbol": "wrapper"}], 0, 3)
+    release.set()
+
+    losers = [s["id"] for s in graph.children_of(parent) if s["id"] != winner]
+    deadline = time.time() + 5
+    # Each loser is marked by the race and again by its own thread once it stops
+    while time.time() < deadline and any(updates.count((n, "CANCELLED")) < 2 for n in losers):
+        time.sleep(0.01)
+
+    assert graph.get(winner)["status"] == "FIX_FINALIZED"
+    for node_id in losers:
+        node = graph.get(node_id)
+        assert node["status"] == "CANCELLED"
+        assert not node.get("response") and node.get("fix_plan") is None
+
+
+def test_is_applicable_fix_plan():
+    contexts = [{"symbol": "helper"}, {"symbol": "main"}]
+
+    assert analyzer.is_applicable_fix_plan({"edits": [{"symbol": "Runner.helper"}]}, contexts)
+    assert not analyzer.is_applicable_fix_plan({"edits": [{"symbol": "other"}]}, contexts)
+    assert not analyzer.is_applicable_fix_plan({"edits": []}, contexts)
+    assert not analyzer.is_applicable_fix_plan(
+        {"needs_more_context": True, "required_info": [{"symbol": "x"}]}, contexts)
+
+
+@patch("cybermule.executors.llm_runner.get_prompt_path")
+@patch("cybermule.executors.llm_runner.render_template")
+def test_prefetch_provides_callees_up_front(mock_render_template, mock_get_prompt_path, monkeypatch, tmp_path):
+    mock_get_prompt_path.return_value = "/dev/null/generate_fix_from_summary.j2"
+    mock_render_template.return_value = "fix prompt"
+    module = tmp_path / "app.py"
+    module.write_text(
+        "def helper(x):\n"
+        "    return x + 1\n"
+        "\n"
+        "def unrelated():\n"
+        "    return 0\n"
+        "\n"
+        "def main():\n"
+        "    value = helper(1)\n"
+        "    return unrelated() + value\n"
+    )
+    calls = []
+    monkeypatch.setattr("cybermule.executors.llm_runner.get_llm_provider",
+                        lambda cfg: type("LLM", (), {"generate": lambda self, *a, **k: calls.append(1) or
+                                                     _plan_for("helper")})())
+    monkeypatch.setattr("cybermule.symbol_resolution._lookup_symbol",
+                        lambda symbol, root, ref_path=None: {"file": "app.py"} if symbol in ("helper", "unrelated") else None)
+
+    traceback = f'File "{module}", line 8, in main'
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    fix, node_id = analyzer.generate_fix_from_summary(
+        error_summary="boom", traceback=traceback,
+        config={"project_root": str(tmp_path)}, graph=graph, parent_id=None,
+    )
+
+    assert fix["edits"][0]["symbol"] == "helper"
+    assert len(calls) == 1
+    shown = [ctx["symbol"] for ctx in mock_render_template.call_args.kwargs["template_vars"]["CODE_CONTEXTS"]]
+    # The callee on the failing line ranks ahead of other calls in the function
+    assert shown == ["main", "helper", "unrelated"]
+    prefetch = graph.get(node_id)["prefetch"]
+    assert prefetch["hits"] == ["helper"] and prefetch["hit_rate"] == 1.0
+
+    tight = analyzer.prefetch_contexts(analyzer.extract_locations(traceback), [],
+                                       {"fix": {"prefetch_token_budget": 12}}, tmp_path)
+    assert [ctx["symbol"] for ctx in tight] == ["helper"]
+
+
+def test_prefetch_skips_library_frames(monkeypatch, tmp_path):
+    module = tmp_path / "app.py"
+    module.write_text("def helper(x):\n    return x + 1\n\ndef main():\n    return helper(1)\n")
+    library = tmp_path / ".venv" / "lib" / "site-packages" / "lib.py"
+    library.parent.mkdir(parents=True)
+    library.write_text("def internal():\n    return 0\n\ndef entry():\n    return internal()\n")
+    monkeypatch.setattr("cybermule.symbol_resolution._lookup_symbol",
+                        lambda symbol, root, ref_path=None: {"file": "app.py"} if symbol == "helper" else None)
+
+    traceback = f'File "{module}", line 5, in main\nFile "{library}", line 5, in entry'
+    locations = analyzer.extract_locations(traceback, drop_site_package_prefix=False)
+    prefetched = analyzer.prefetch_contexts(locations, [], {"fix": {"prefetch_frames": 1}}, tmp_path)
+
+    assert [ctx["symbol"] for ctx in prefetched] == ["helper"]
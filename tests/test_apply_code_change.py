@@ -1,6 +1,11 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from cybermule.executors.apply_code_change import apply_code_change, describe_change_plan
+from cybermule.executors.apply_code_change import (
+    apply_code_change,
+    describe_change_plan,
+    group_change_plans,
+    merge_change_plans,
+)
 
 fake_plan = {
     "fix_description": "Refactor function",
@@ -14,10 +19,12 @@ fake_plan = {
 }
 
 
+@patch("cybermule.executors.apply_code_change.refresh_after_change",
+       return_value={"incremental": 1, "full": 0, "deleted": 0, "indexed": 1})
 @patch("cybermule.executors.apply_code_change.apply_with_aider", return_value=True)
 @patch("cybermule.executors.apply_code_change.get_commits_since", return_value=["newsha123"])
 @patch("cybermule.executors.apply_code_change.get_latest_commit_sha", return_value="oldsha000")
-def test_apply_success(mock_sha, mock_commits, mock_aider):
+def test_apply_success(mock_sha, mock_commits, mock_aider, mock_refresh):
     mock_graph = MagicMock()
     file_paths, message = describe_change_plan(fake_plan, config={})
     node_id = apply_code_change(description='fake',
@@ -26,6 +33,7 @@ def test_apply_success(mock_sha, mock_commits, mock_aider):
     
     assert node_id is not None
     mock_aider.assert_called_once()
+    mock_refresh.assert_called_once_with("oldsha000")
     mock_graph.new.assert_called_once()
     mock_graph.update.assert_called_once()
 
@@ -45,3 +53,19 @@ def test_apply_failure_rolls_back(mock_git, mock_sha, mock_aider):
 def test_missing_edits_raises():
     with pytest.raises(ValueError):
       describe_change_plan({}, config={})
+
+
+def test_group_change_plans_by_overlapping_files():
+    plans = [
+        {"fix_description": "a", "edits": [{"file": "a.py"}]},
+        {"fix_description": "b", "edits": [{"file": "b.py"}]},
+        {"fix_description": "c", "edits": [{"file": "c.py"}, {"file": "a.py"}]},
+        {"fix_description": "d", "edits": [{"file": "b.py"}, {"file": "c.py"}]},
+        {"fix_description": "e", "edits": [{"file": "e.py"}]},
+    ]
+    assert group_change_plans(plans) == [[0, 1, 2, 3], [4]]
+    assert group_change_plans(plans[:2]) == [[0], [1]]
+
+    merged = merge_change_plans(plans[:3])
+    assert merged["fix_description"] == "a\nb\nc"
+    assert [e["file"] for e in merged["edits"]] == ["a.py", "b.py", "c.py", "a.py"]
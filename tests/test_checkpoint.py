@@ -0,0 +1,96 @@
+import pytest
+
+from cybermule.executors.checkpoint import maybe_insert_checkpoint
+from cybermule.memory.history_utils import extract_chat_history
+from cybermule.memory.memory_graph import MemoryGraph
+
+
+@pytest.fixture
+def digest_llm(monkeypatch):
+    calls = []
+
+    class DigestLLM:
+        def generate(self, prompt, history=(), respond_prefix=''):
+            calls.append(prompt)
+            return "<digest>Task: fix test_foo. Cause: missing import.</digest>"
+
+    monkeypatch.setattr("cybermule.executors.checkpoint.get_llm_provider", lambda config: DigestLLM())
+    return calls
+
+
+def _long_chain(graph, length=3):
+    parent = None
+    for i in range(length):
+        node = graph.new(f"Step {i}", parent_id=parent)
+        graph.update(node, prompt=f"Prompt {i} " + "x" * 400, response=f"Response {i}")
+        parent = node
+    return parent
+
+
+def test_no_checkpoint_without_threshold(tmp_path, digest_llm):
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    leaf = graph.new("Leaf", parent_id=_long_chain(graph))
+
+    assert maybe_insert_checkpoint({}, graph, leaf) is None
+    assert digest_llm == []
+
+
+def test_checkpoint_inserted_and_history_stops_there(tmp_path, digest_llm):
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    tail = _long_chain(graph)
+    leaf = graph.new("Leaf", parent_id=tail)
+    config = {"history": {"checkpoint_tokens": 100}}
+
+    checkpoint_id = maybe_insert_checkpoint(config, graph, leaf)
+
+    assert checkpoint_id is not None
+    assert graph.parent_id_of(leaf) == checkpoint_id
+    assert graph.parent_id_of(checkpoint_id) == tail
+    assert "Prompt 0" in digest_llm[0]
+
+    history = extract_chat_history(checkpoint_id, graph)
+    texts = [m["content"][0]["text"] for m in history]
+    assert texts == ["Summarize our conversation so far.", "Task: fix test_foo. Cause: missing import."]
+
+
+def test_checkpoint_digest_is_reused_by_siblings(tmp_path, digest_llm):
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    tail = _long_chain(graph)
+    config = {"history": {"checkpoint_tokens": 100}}
+
+    first = graph.new("First", parent_id=tail)
+    second = graph.new("Second", parent_id=tail)
+    cp1 = maybe_insert_checkpoint(config, graph, first)
+    cp2 = maybe_insert_checkpoint(config, graph, second)
+
+    assert cp1 == cp2
+    assert len(digest_llm) == 1
+
+
+def test_concurrent_siblings_share_one_checkpoint(tmp_path, monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = []
+    calls_lock = threading.Lock()
+
+    class SlowDigestLLM:
+        def generate(self, prompt, history=(), respond_prefix=''):
+            with calls_lock:
+                calls.append(prompt)
+            time.sleep(0.05)    # every sibling checks for a checkpoint while this one is written
+            return "<digest>Shared digest</digest>"
+
+    monkeypatch.setattr("cybermule.executors.checkpoint.get_llm_provider", lambda config: SlowDigestLLM())
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    tail = _long_chain(graph)
+    config = {"history": {"checkpoint_tokens": 100}}
+    siblings = [graph.new(f"Candidate {i}", parent_id=tail) for i in range(4)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        checkpoints = list(pool.map(lambda node: maybe_insert_checkpoint(config, graph, node), siblings))
+
+    assert len(set(checkpoints)) == 1
+    assert len(calls) == 1
+    assert all(graph.parent_id_of(node) == checkpoints[0] for node in siblings)
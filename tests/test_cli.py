@@ -92,6 +92,63 @@ def test_run_and_fix_with_multi_edit_plan(tmp_path):
         assert "🧾 Fix description: Edit both files" in result.output
         assert "[apply_code_change] ✅ Fix applied using Aider to 2 file(s)." in result.output
 
+def test_run_and_fix_all_failures(tmp_path):
+    tracebacks = [f"test_{name}\nTraceback in {name[0]}.py" for name in ("a", "b", "c", "a_again")]
+    plans = {
+        "a": {"fix_description": "fix a", "edits": [{"file": "a.py", "code_snippet": "a = 1"}]},
+        "b": {"fix_description": "fix b", "edits": [{"file": "b.py", "code_snippet": "b = 1"}]},
+        "c": {"fix_description": "fix c", "edits": [{"file": "a.py", "code_snippet": "c = 1"}]},
+    }
+
+    def fake_analyze(traceback, config, graph=None, parent_id=None):
+        name = traceback.split(" in ")[1][0]
+        return plans[name], f"node-{name}"
+
+    with (
+        patch("cybermule.commands.run_and_fix.run_test", return_value=(4, tracebacks)),
+        patch("cybermule.commands.run_and_fix.analyze_failure_with_llm", side_effect=fake_analyze) as mock_analyze,
+        patch("cybermule.commands.run_and_fix.apply_code_change") as mock_apply,
+    ):
+        result = CliRunner().invoke(app, ["--config=config.yaml", "run-and-fix", "--all-failures", "-j", "3"],
+                                    catch_exceptions=False)
+
+    assert result.exit_code == 0
+    # test_a and test_a_again share a traceback signature and are analyzed once
+    assert "4 failing test(s) in 3 cluster(s)" in result.output
+    assert mock_analyze.call_count == 3
+    assert "3 fix plan(s) in 2 change(s)" in result.output
+    applied = [call.kwargs["file_paths"] for call in mock_apply.call_args_list]
+    assert sorted(map(sorted, applied)) == [["a.py"], ["b.py"]]
+    assert "Applied 2/2 change(s)" in result.output
+
+
+def test_run_and_fix_all_failures_with_same_named_tests(tmp_path):
+    tracebacks = [
+        'test_parse\nTraceback (most recent call last):\n  File "tests/test_a.py", line 3, in test_parse\n'
+        '    assert parse("a")\nAssertionError',
+        'test_parse\nTraceback (most recent call last):\n  File "tests/test_b.py", line 8, in test_parse\n'
+        '    parse(None)\nTypeError: bad input',
+    ]
+
+    def fake_analyze(traceback, config, graph=None, parent_id=None):
+        name = "a" if "test_a.py" in traceback else "b"
+        return {"fix_description": f"fix {name}", "edits": [{"file": f"{name}.py"}]}, f"node-{name}"
+
+    with (
+        patch("cybermule.commands.run_and_fix.run_test", return_value=(2, tracebacks)),
+        patch("cybermule.commands.run_and_fix.analyze_failure_with_llm", side_effect=fake_analyze) as mock_analyze,
+        patch("cybermule.commands.run_and_fix.apply_code_change") as mock_apply,
+    ):
+        result = CliRunner().invoke(app, ["--config=config.yaml", "run-and-fix", "--all-failures"],
+                                    catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert "2 failing test(s) in 2 cluster(s)" in result.output
+    assert mock_analyze.call_count == 2
+    assert "Fixes for test_parse:" in result.output
+    assert sorted(call.kwargs["file_paths"][0] for call in mock_apply.call_args_list) == ["a.py", "b.py"]
+
+
 def test_run_and_fix_with_test_selection(tmp_path):
     fix_plan = {
         "fix_description": "Fix for selected test",
@@ -211,3 +268,11 @@ def test_version_info_displayed():
     assert result.exit_code == 0
     assert f"Cybermule v" in result.output
     assert expected_commit in result.output
+
+
+def test_version_info_is_copied_per_caller():
+    from cybermule.version_info import get_version_info
+
+    info = get_version_info()
+    info["git_commit"] = "changed"
+    assert get_version_info()["git_commit"] != "changed"
@@ -2,7 +2,12 @@
 import pytest
 from pathlib import Path
 from textwrap import dedent
-from cybermule.utils.context_extract import extract_function_at_line, extract_locations, get_context_snippets
+from cybermule.utils.context_extract import (
+    assemble_contexts,
+    extract_function_at_line,
+    extract_locations,
+    get_context_snippets,
+)
 
 
 def test_extract_locations_simple():
@@ -89,3 +94,50 @@ def test_get_context_snippets_fallback(tmp_path):
     assert 'c = 3' in snippet
     assert 'd = 4' in snippet
     assert context_entry['symbol'] is None
+
+
+def test_get_context_snippets_dedupes_and_merges(tmp_path):
+    source = dedent("""\
+        def run():
+            step()
+            step()
+            return 1
+    """) + "".join(f"x{i} = {i}\n" for i in range(20))
+    path = tmp_path / "mod.py"
+    path.write_text(source)
+
+    locations = [
+        {"file": str(path), "line": 2, "function": "run"},
+        {"file": str(path), "line": 3, "function": "run"},
+        {"file": str(path), "line": 10, "function": "<module>"},
+        {"file": str(path), "line": 13, "function": "<module>"},
+    ]
+    function_ctx, window_ctx = get_context_snippets(locations, fallback_window=2)
+
+    assert function_ctx["symbol"] == "run" and function_ctx["traceback_line"] == 3
+    # Windows 8-12 and 11-15 merge into one, pointing at the innermost frame
+    assert (window_ctx["start_line"], window_ctx["traceback_line"]) == (8, 13)
+    assert window_ctx["snippet"].splitlines() == [f"x{i} = {i}" for i in range(3, 11)]
+
+
+def test_assemble_contexts_ranks_project_frames_within_budget(tmp_path):
+    library = tmp_path / ".venv" / "lib" / "site-packages" / "lib.py"
+    library.parent.mkdir(parents=True)
+    library.write_text("def call(fn):\n" + "    x = 1\n" * 40 + "    return fn()\n")
+    app = tmp_path / "app.py"
+    app.write_text("def main():\n    return call(handler)\n\ndef handler():\n    raise ValueError\n")
+
+    tb = dedent(f"""\
+        Traceback (most recent call last):
+          File "{app}", line 2, in main
+          File "{library}", line 42, in call
+          File "{app}", line 5, in handler
+        ValueError""")
+    locations = extract_locations(tb, drop_site_package_prefix=False)
+
+    everything = assemble_contexts(locations, tmp_path, token_budget=None)
+    assert [ctx["symbol"] for ctx in everything] == ["main", "call", "handler"]
+
+    # The library frame is the largest and ranks last, so it is dropped first
+    budgeted = assemble_contexts(locations, tmp_path, token_budget=40)
+    assert [ctx["symbol"] for ctx in budgeted] == ["main", "handler"]
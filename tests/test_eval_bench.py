@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from cybermule.cli.main import app
+from cybermule.executors.eval_bench import (
+    infer_expectation,
+    load_cases,
+    make_scorer,
+    run_bench,
+    summarize_bench,
+)
+from cybermule.memory.memory_graph import MemoryGraph
+
+
+@pytest.fixture
+def bench_setup(tmp_path, monkeypatch):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "good.j2").write_text("GOOD {{ TRACEBACK }}")
+    (templates / "bad.j2").write_text("BAD {{ TRACEBACK }}")
+    monkeypatch.setattr("cybermule.executors.eval_bench.get_prompt_path",
+                        lambda config, name: templates / name)
+
+    class BenchLLM:
+        def __init__(self):
+            self.calls = 0
+
+        def generate(self, prompt, history=None, respond_prefix=None):
+            self.calls += 1
+            if prompt.startswith("GOOD"):
+                return "<error_summary>summary</error_summary>"
+            return "no summary here"
+
+    llm = BenchLLM()
+    monkeypatch.setattr("cybermule.executors.eval_bench.get_llm_provider", lambda config: llm)
+
+    graph_path = tmp_path / "graph.json"
+    graph = MemoryGraph(storage_path=graph_path)
+    for i in range(3):
+        node_id = graph.new(f"case {i}", tags=["traceback"])
+        graph.update(node_id, prompt_template="summarize_traceback.j2",
+                     variables={"TRACEBACK": f"tb {i}"},
+                     response="<error_summary>old</error_summary>")
+    graph.new("untagged", tags=["fix"])
+    return graph, graph_path, llm
+
+
+def test_bench_scores_every_variant_case_combination(bench_setup):
+    graph, _, llm = bench_setup
+    cases = load_cases(graph, "traceback")
+    assert len(cases) == 3
+    assert infer_expectation(cases) == "tag:error_summary"
+
+    runs = run_bench({}, ["good.j2", "bad.j2"], cases, jobs=4)
+    report = summarize_bench(runs)
+
+    assert llm.calls == 6
+    assert report["good.j2"]["success_rate"] == 1.0
+    assert report["bad.j2"]["success_rate"] == 0.0
+    assert report["good.j2"]["cases"] == 3
+
+
+def test_make_scorer():
+    assert make_scorer("json")('```json\n{"a": 1}\n```')
+    assert not make_scorer("json")("plain text")
+    assert make_scorer("tag:digest")("<digest>x</digest>")
+    with pytest.raises(ValueError):
+        make_scorer("regex")
+
+
+def test_eval_bench_cli_reports_per_variant(bench_setup, tmp_path):
+    _, graph_path, _ = bench_setup
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("litellm:\n  model: mock\n")
+
+    result = CliRunner().invoke(app, [
+        f"--config={config_path}", "eval-bench", "--tag", "traceback",
+        "--variant", "good.j2", "--variant", "bad.j2",
+        "--graph-path", str(graph_path), "--limit", "2", "--json",
+    ], catch_exceptions=False)
+
+    assert result.exit_code == 0
+    report = json.loads(result.output[result.output.index("{"):])
+    assert report["good.j2"]["cases"] == 2
+    assert report["bad.j2"]["success_rate"] == 0.0
@@ -0,0 +1,29 @@
+import litellm
+
+from cybermule.providers.http_pool import get_http_clients, install_http_clients, pool_settings
+
+
+def test_pool_settings_merge_defaults_and_gate_http2(monkeypatch):
+    monkeypatch.setattr("cybermule.providers.http_pool.http2_available", lambda: False)
+    settings = pool_settings({"max_connections": 5, "http2": True})
+
+    assert settings["max_connections"] == 5
+    assert settings["max_keepalive_connections"] == 10
+    assert settings["http2"] is False
+
+
+def test_clients_are_shared_per_settings_and_installed_into_litellm(monkeypatch):
+    monkeypatch.setattr("cybermule.providers.http_pool._installed", None)
+    monkeypatch.setattr(litellm, "client_session", litellm.client_session)
+    monkeypatch.setattr(litellm, "aclient_session", litellm.aclient_session)
+    client, aclient = install_http_clients({"max_connections": 7})
+
+    assert get_http_clients({"max_connections": 7}) == (client, aclient)
+    assert get_http_clients({"max_connections": 8})[0] is not client
+    assert litellm.client_session is client
+    assert litellm.aclient_session is aclient
+
+    # Installed once per process: later providers reuse the same pair
+    assert install_http_clients({"max_connections": 7}) == (client, aclient)
+    assert install_http_clients({"max_connections": 8}) == (client, aclient)
+    assert litellm.client_session is client
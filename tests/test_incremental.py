@@ -0,0 +1,98 @@
+import subprocess
+
+from cybermule.symbol_resolution import symbol_index
+from cybermule.symbol_resolution.incremental import Hunk, parse_diff_hunks, refresh_after_change
+from cybermule.symbol_resolution.native_index import tree_sitter_file_symbols
+from cybermule.symbol_resolution.tree_sitter_lookup import get_parser, parse_cache
+
+ORIGINAL = '''import os
+
+
+def alpha():
+    return 1
+
+
+def beta(x):
+    y = x + 1
+    return y
+
+
+class Gamma:
+    def method(self):
+        pass
+'''
+
+EDITED = '''import os
+import sys
+
+
+def alpha():
+    return 1
+
+
+def beta(x):
+    return x * 2
+
+
+class Gamma:
+    def method(self):
+        pass
+
+    def added(self):
+        return sys.argv
+'''
+
+
+def test_parse_diff_hunks():
+    diff = "\n".join([
+        "diff --git a/pkg/mod.py b/pkg/mod.py",
+        "index 1a2b3c4..5d6e7f8 100644",
+        "--- a/pkg/mod.py",
+        "+++ b/pkg/mod.py",
+        "@@ -1,0 +2 @@ import os",
+        "+import sys",
+        "@@ -9,2 +10 @@ def beta(x):",
+        "-    y = x + 1",
+        "-    return y",
+        "+    return x * 2",
+        "diff --git a/gone.py b/gone.py",
+        "deleted file mode 100644",
+        "index 9999999..0000000",
+        "--- a/gone.py",
+        "+++ /dev/null",
+        "@@ -1 +0,0 @@",
+        "-x = 1",
+    ])
+    files = parse_diff_hunks(diff)
+    assert files["pkg/mod.py"].hunks == [Hunk(1, 0, 2, 1), Hunk(9, 2, 10, 1)]
+    assert (files["pkg/mod.py"].old_blob, files["pkg/mod.py"].new_blob) == ("1a2b3c4", "5d6e7f8")
+    assert files["gone.py"].hunks == [Hunk(1, 1, 0, 0)]
+
+
+def test_refresh_after_change_reparses_incrementally(tmp_path, monkeypatch):
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    module = tmp_path / "mod.py"
+    module.write_text(ORIGINAL)
+    subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["add", "mod.py"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=tmp_path, check=True)
+    sha = subprocess.run(["git", "rev-parse", "HEAD"], cwd=tmp_path, check=True,
+                         capture_output=True, text=True).stdout.strip()
+
+    monkeypatch.setattr(symbol_index, "_indexes", {})
+    index = symbol_index.get_symbol_index(tmp_path)
+    old_tree = parse_cache.get(module).tree
+    assert index.lookup("added") is None
+
+    module.write_text(EDITED)
+    counts = refresh_after_change(sha, tmp_path)
+    assert counts == {"incremental": 1, "full": 0, "deleted": 0, "indexed": 1}
+
+    parsed = parse_cache.get(module)
+    assert parsed.source == EDITED
+    assert str(parsed.tree.root_node) == str(get_parser().parse(EDITED.encode()).root_node)
+    assert old_tree.root_node.child_count == 4    # the cached tree was copied, not edited in place
+
+    # The index entries match a from-scratch index of the edited file
+    assert index.files["mod.py"]["symbols"] == tree_sitter_file_symbols(["mod.py"], tmp_path)["mod.py"]
+    assert index.lookup("added")["line"] == 17
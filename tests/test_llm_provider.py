@@ -1,3 +1,5 @@
+import json
+import pytest
 from pathlib import Path
 from cybermule.providers.llm_provider import LLMProvider
 
@@ -41,3 +43,141 @@ def test_generate_and_cache_with_mock(tmp_path: Path):
 
     assert response1 == response2
     assert cache_path.exists()
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path: Path):
+    import threading
+    import time
+    from cybermule.providers.llm_provider import LLMResult
+
+    llm = LLMProvider("mock", cache_path=str(tmp_path / "cache.json"), show_token_summary=False)
+    calls = []
+
+    def slow_call_api(messages):
+        calls.append(messages)
+        time.sleep(0.2)
+        return LLMResult(text="shared answer")
+
+    llm._call_api = slow_call_api
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(llm.generate("Same prompt")))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["shared answer"] * 5
+
+
+def test_generate_picks_up_entries_written_by_other_processes(tmp_path: Path):
+    cache_path = tmp_path / "cache.json"
+    llm = LLMProvider("mock", cache_path=str(cache_path), mock_response="fresh")
+
+    # Simulate another process filling the cache after this provider loaded it
+    other = LLMProvider("mock", cache_path=str(cache_path), mock_response="from other process")
+    other.generate("Shared prompt")
+
+    assert llm.generate("Shared prompt") == "from other process"
+    assert llm.total_calls == 0
+
+
+def test_save_cache_merges_concurrent_writers(tmp_path: Path):
+    cache_path = tmp_path / "cache.json"
+    first = LLMProvider("mock", cache_path=str(cache_path), mock_response="one")
+    second = LLMProvider("mock", cache_path=str(cache_path), mock_response="two")
+
+    first.generate("Prompt A")
+    second.generate("Prompt B")
+
+    on_disk = json.loads(cache_path.read_text())
+    assert sorted(on_disk.values()) == ["one", "two"]
+
+
+def _fake_stream(*texts, usage=None):
+    from types import SimpleNamespace
+
+    for text in texts:
+        delta = SimpleNamespace(content=text, reasoning_content=None)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+    yield SimpleNamespace(choices=[], usage=usage)
+
+
+def test_cassette_record_then_replay(tmp_path: Path, monkeypatch):
+    cassette = {"mode": "record", "path": str(tmp_path / "cassette.json")}
+    monkeypatch.setattr("cybermule.providers.llm_provider.token_counter", lambda **kwargs: 7)
+    monkeypatch.setattr(
+        "cybermule.providers.llm_provider.completion",
+        lambda **kwargs: _fake_stream("Hello", " world", usage={"prompt_tokens": 12, "completion_tokens": 2}),
+    )
+
+    recorder = LLMProvider("mock", cache_path=None, cassette=cassette, show_token_summary=False)
+    assert recorder.generate("Greet me") == "Hello world"
+
+    def no_network(**kwargs):
+        raise AssertionError("replay must not call the API")
+
+    monkeypatch.setattr("cybermule.providers.llm_provider.completion", no_network)
+    replayer = LLMProvider("mock", cache_path=None, show_token_summary=False,
+                           cassette={**cassette, "mode": "replay"})
+
+    assert replayer.generate("Greet me") == "Hello world"
+    assert replayer.input_tokens == 12
+    assert replayer.output_tokens == 2
+
+
+def test_cassette_keeps_interactions_from_every_recorder(tmp_path: Path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "cassette.json"
+    monkeypatch.setattr("cybermule.providers.llm_provider.token_counter", lambda **kwargs: 7)
+    monkeypatch.setattr("cybermule.providers.llm_provider.completion",
+                        lambda **kwargs: _fake_stream(kwargs["messages"][-1]["content"].upper()))
+
+    # Both providers load the (empty) cassette before either records
+    recorders = [LLMProvider("mock", cache_path=None, show_token_summary=False,
+                             cassette={"mode": "record", "path": str(path)}) for _ in range(2)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda args: args[0].generate(args[1]), zip(recorders, ["first", "second"])))
+
+    assert len(json.loads(path.read_text())["interactions"]) == 2
+    replayer = LLMProvider("mock", cache_path=None, show_token_summary=False,
+                           cassette={"mode": "replay", "path": str(path)})
+    assert [replayer.generate(p) for p in ("first", "second")] == ["FIRST", "SECOND"]
+
+
+def test_cassette_replay_miss_raises(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr("cybermule.providers.llm_provider.token_counter", lambda **kwargs: 0)
+    llm = LLMProvider("mock", cache_path=None, show_token_summary=False,
+                      cassette={"mode": "replay", "path": str(tmp_path / "empty.json")})
+
+    with pytest.raises(RuntimeError, match="No recorded interaction"):
+        llm.generate("Never recorded")
+
+
+def test_call_stats_record_telemetry_and_cache_hits(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr("cybermule.providers.llm_provider.token_counter", lambda **kwargs: 7)
+    usage = {"prompt_tokens": 12, "completion_tokens": 2,
+             "completion_tokens_details": {"reasoning_tokens": 5},
+             "prompt_tokens_details": {"cached_tokens": 8}}
+    monkeypatch.setattr("cybermule.providers.llm_provider.completion",
+                        lambda **kwargs: _fake_stream("Hello", " world", usage=usage))
+
+    llm = LLMProvider("mock", cache_path=str(tmp_path / "cache.json"), show_token_summary=False)
+    llm.generate("Greet me")
+    stats = llm.last_call_stats
+
+    assert stats["model"] == "mock"
+    assert stats["cache_hit"] is False
+    assert stats["ttft"] is not None and stats["latency"] >= stats["ttft"]
+    assert (stats["input_tokens"], stats["output_tokens"]) == (12, 2)
+    assert stats["reasoning_tokens"] == 5
+    assert stats["cache_read_tokens"] == 8
+
+    llm.generate("Greet me")
+    assert llm.last_call_stats["cache_hit"] is True
+    assert llm.last_call_stats["output_tokens"] == 0
@@ -99,3 +99,110 @@ def test_identity_replay(tmp_path, patch_prompt_path, fake_llm):
     node = graph.get(replayed[root])
     assert node["prompt_template"] == "noop.j2"
     assert node.get("prompt_variant_of") is None
+
+# ✅ Sibling subtrees replay concurrently, keeping the id map and tags
+def test_sibling_subtrees_replay_concurrently(tmp_path, patch_prompt_path, monkeypatch):
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    class FakeLLM:
+        def generate(self, prompt, history=None, respond_prefix=None):
+            if prompt in ("Sim B1!", "Sim B2!"):
+                barrier.wait()  # deadlocks unless both siblings are in flight together
+            return f"[FAKE] {prompt}"
+
+    monkeypatch.setattr("cybermule.executors.llm_runner.get_llm_provider", lambda config: FakeLLM())
+
+    graph = MemoryGraph(storage_path=tmp_path / "concurrent.json")
+    root = graph.new("task_root")
+    graph.update(root, prompt_template="root.j2", variables={"name": "Root"})
+    b1 = graph.new("task_b1", parent_id=root)
+    graph.update(b1, prompt_template="b.j2", variables={"name": "B1"})
+    b2 = graph.new("task_b2", parent_id=root)
+    graph.update(b2, prompt_template="b.j2", variables={"name": "B2"})
+    c1 = graph.new("task_c1", parent_id=b1)
+    graph.update(c1, prompt_template="c.j2", variables={"name": "C1"})
+
+    replayed = replay_subtree(root, graph, {}, jobs=2)
+
+    assert list(replayed) == [root, b1, b2, c1]
+    assert graph.get(replayed[c1])["parent"] == replayed[b1]
+    assert all(graph.get(new_id)["tags"] == ["REPLAYED"] for new_id in replayed.values())
+
+
+# ✅ Memoized replay only re-runs the cone below a changed template
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    for name, text in {"a.j2": "A {{ name }}", "b.j2": "B {{ name }}",
+                       "b_alt.j2": "B alt {{ name }}", "c.j2": "C {{ name }}"}.items():
+        (templates / name).write_text(text)
+    monkeypatch.setattr("cybermule.executors.llm_runner.get_prompt_path",
+                        lambda config, name: templates / name)
+    monkeypatch.setattr("cybermule.memory.tracker.get_version_info", lambda: {"git_commit": "abc123"})
+
+
+@pytest.fixture
+def counting_llm(monkeypatch):
+    prompts = []
+
+    class CountingLLM:
+        def generate(self, prompt, history=None, respond_prefix=None):
+            prompts.append(prompt)
+            return f"[FAKE] {prompt}"
+
+    monkeypatch.setattr("cybermule.executors.llm_runner.get_llm_provider", lambda config: CountingLLM())
+    return prompts
+
+
+def _run_original_tree(graph):
+    from cybermule.executors.llm_runner import run_llm_task
+
+    nodes = {}
+    for name, template, parent in [("a", "a.j2", None), ("b", "b.j2", "a"),
+                                   ("c", "c.j2", "b"), ("d", "c.j2", "a")]:
+        nodes[name] = graph.new(f"task_{name}", parent_id=nodes.get(parent))
+        run_llm_task(config={}, graph=graph, node_id=nodes[name], prompt_template=template,
+                     variables={"name": name}, tags=[])
+    return nodes
+
+
+def test_replay_reuses_unchanged_nodes(tmp_path, template_dir, counting_llm):
+    graph = MemoryGraph(storage_path=tmp_path / "memo.json")
+    nodes = _run_original_tree(graph)
+    assert graph.get(nodes["b"])["variables"] == {"name": "b"}
+    counting_llm.clear()
+
+    replayed = replay_subtree(nodes["a"], graph, {}, {"b.j2": "b_alt.j2"})
+
+    assert sorted(counting_llm) == ["B alt b", "C c"]
+    assert graph.get(replayed[nodes["a"]])["reused_response_of"] == nodes["a"]
+    assert graph.get(replayed[nodes["d"]])["reused_response_of"] == nodes["d"]
+    assert "reused_response_of" not in graph.get(replayed[nodes["c"]])
+    assert graph.get(replayed[nodes["d"]])["response"] == graph.get(nodes["d"])["response"]
+
+
+def test_identity_replay_makes_no_calls_unless_forced(tmp_path, template_dir, counting_llm):
+    graph = MemoryGraph(storage_path=tmp_path / "memo.json")
+    nodes = _run_original_tree(graph)
+    counting_llm.clear()
+
+    replay_subtree(nodes["a"], graph, {})
+    assert counting_llm == []
+
+    replay_subtree(nodes["a"], graph, {}, force=True)
+    assert len(counting_llm) == 4
+
+
+def test_replay_below_the_graph_root_reuses_unchanged_nodes(tmp_path, template_dir, counting_llm):
+    graph = MemoryGraph(storage_path=tmp_path / "memo.json")
+    nodes = _run_original_tree(graph)
+    counting_llm.clear()
+
+    replayed = replay_subtree(nodes["b"], graph, {})
+
+    assert counting_llm == []
+    assert graph.get(replayed[nodes["b"]])["parent"] == nodes["a"]
+    assert graph.get(replayed[nodes["c"]])["reused_response_of"] == nodes["c"]
@@ -241,3 +241,145 @@ def test_run_llm_and_store_basic(
     assert metadata == {"parsed_result": "RESPONSE TO: HELLO, CYBERMULE!"}
     assert node["parsed_result"] == metadata["parsed_result"]
     assert node["status"] == "STORE_TEST"
+
+def test_run_llm_task_escalates_model_on_failed_validation(
+    patch_prompt_path, patch_version_info, monkeypatch
+):
+    used_models = []
+
+    class RoutedLLM:
+        def __init__(self, model):
+            self.model = model
+
+        def generate(self, prompt, history=None, respond_prefix=None):
+            used_models.append(self.model)
+            return "<ok>" if self.model == "strong" else "garbage"
+
+    monkeypatch.setattr(
+        "cybermule.executors.llm_runner.get_llm_provider",
+        lambda cfg: RoutedLLM(cfg["litellm"]["model"])
+    )
+
+    config = {
+        "litellm": {"model": "default"},
+        "model_routing": {"test_prompt.j2": ["cheap", "strong"]},
+    }
+    graph = MemoryGraph()
+    node_id = graph.new("Routed")
+
+    response = run_llm_task(
+        config=config,
+        graph=graph,
+        node_id=node_id,
+        prompt_template="test_prompt.j2",
+        variables={"name": "Router"},
+        validate=lambda r: r == "<ok>",
+    )
+
+    assert response == "<ok>"
+    assert used_models == ["cheap", "strong"]
+    routing = graph.get(node_id)["routing"]
+    assert [r["model"] for r in routing] == ["cheap", "strong"]
+    assert [r["valid"] for r in routing] == [False, True]
+    assert all(r["latency"] >= 0 for r in routing)
+
+
+def test_run_llm_task_stops_at_first_valid_model(
+    patch_prompt_path, patch_version_info, monkeypatch
+):
+    used_models = []
+
+    class RoutedLLM:
+        def __init__(self, model):
+            self.model = model
+
+        def generate(self, prompt, history=None, respond_prefix=None):
+            used_models.append(self.model)
+            return "fine"
+
+    monkeypatch.setattr(
+        "cybermule.executors.llm_runner.get_llm_provider",
+        lambda cfg: RoutedLLM(cfg["litellm"]["model"])
+    )
+
+    graph = MemoryGraph()
+    node_id = graph.new("Routed")
+    run_llm_task(
+        config={"model_routing": {"test_prompt.j2": ["cheap", "strong"]}},
+        graph=graph,
+        node_id=node_id,
+        prompt_template="test_prompt.j2",
+        variables={"name": "Router"},
+        validate=lambda r: True,
+        min_route_level=1,
+    )
+
+    assert used_models == ["strong"]
+
+
+def test_run_llm_task_stores_provider_call_stats(
+    patch_prompt_path, patch_version_info, monkeypatch
+):
+    from cybermule.providers.llm_provider import LLMProvider
+
+    monkeypatch.setattr(
+        "cybermule.executors.llm_runner.get_llm_provider",
+        lambda config: LLMProvider("mock-model", mock_response="ok", cache_path=None, show_token_summary=False)
+    )
+
+    graph = MemoryGraph()
+    node_id = graph.new("Telemetry")
+    run_llm_task(
+        config={},
+        graph=graph,
+        node_id=node_id,
+        prompt_template="test_prompt.j2",
+        variables={"name": "Stats"},
+    )
+
+    stats = graph.get(node_id)["llm_stats"]
+    assert stats["model"] == "mock-model"
+    assert stats["cache_hit"] is False
+    assert "finished_at" in stats
+    assert "llm_stats" not in graph.get(graph.new("Other"))
+
+
+def test_run_llm_task_sums_call_stats_across_the_cascade(
+    patch_prompt_path, patch_version_info, monkeypatch, tmp_path
+):
+    from cybermule.memory.stats import collect_llm_stats, summarize_llm_stats
+
+    class RoutedLLM:
+        def __init__(self, model):
+            self.model = model
+            self.last_call_stats = None
+
+        def generate(self, prompt, history=None, respond_prefix=None):
+            self.last_call_stats = {"model": self.model, "cache_hit": False, "latency": 1.0,
+                                    "input_tokens": 100, "output_tokens": 10}
+            return "<ok>" if self.model == "strong" else "garbage"
+
+    monkeypatch.setattr(
+        "cybermule.executors.llm_runner.get_llm_provider",
+        lambda cfg: RoutedLLM(cfg["litellm"]["model"])
+    )
+
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    node_id = graph.new("Routed")
+    run_llm_task(
+        config={"model_routing": {"test_prompt.j2": ["cheap", "strong"]}},
+        graph=graph,
+        node_id=node_id,
+        prompt_template="test_prompt.j2",
+        variables={"name": "Router"},
+        validate=lambda r: r == "<ok>",
+    )
+
+    stats = graph.get(node_id)["llm_stats"]
+    assert stats["model"] == "strong"
+    assert (stats["input_tokens"], stats["output_tokens"], stats["latency"]) == (200, 20, 2.0)
+    assert [call["model"] for call in stats["calls"]] == ["cheap", "strong"]
+
+    # Each model is credited with its own call
+    by_model = summarize_llm_stats(collect_llm_stats(graph), "model")
+    assert {name: entry["input_tokens"] for name, entry in by_model.items()} == {"cheap": 100, "strong": 100}
@@ -149,3 +149,62 @@ def test_format_chat_history_as_text_simple():
     lines = [line for line in result.strip().splitlines() if line.strip()]
     assert lines[0].startswith("USER:")
     assert lines[1].startswith("ASSISTANT:")
+
+
+def _turn(prompt, response):
+    return [
+        {"role": "user", "content": [{"type": "text", "text": prompt}]},
+        {"role": "assistant", "content": [{"type": "text", "text": response}]},
+    ]
+
+
+def test_trim_chat_history_within_budget_is_untouched():
+    from cybermule.memory.history_utils import trim_chat_history
+
+    messages = _turn("Q1", "A1") + _turn("Q2", "A2")
+    trimmed, saved = trim_chat_history(messages, token_budget=1000)
+    assert trimmed == messages
+    assert saved == 0
+
+
+def test_trim_chat_history_elides_code_in_older_turns():
+    from cybermule.memory.history_utils import trim_chat_history
+
+    code = "```python\n" + "x = 1\n" * 200 + "```"
+    messages = _turn(f"Look at this:\n{code}", "Old answer") + _turn(f"Recent:\n{code}", "New answer")
+    trimmed, saved = trim_chat_history(messages, token_budget=450, keep_recent_turns=1)
+
+    old_prompt = trimmed[0]["content"][0]["text"]
+    assert "lines of code elided" in old_prompt
+    assert trimmed[2]["content"][0]["text"] == f"Recent:\n{code}"
+    assert saved > 0
+
+
+def test_trim_chat_history_drops_intermediate_turns_before_root():
+    from cybermule.memory.history_utils import trim_chat_history
+
+    filler = "words " * 200
+    messages = (_turn("Root task", "Root answer")
+                + _turn(f"Middle 1 {filler}", "M1")
+                + _turn(f"Middle 2 {filler}", "M2")
+                + _turn("Latest", "Latest answer"))
+    trimmed, saved = trim_chat_history(messages, token_budget=50, keep_recent_turns=1)
+
+    texts = [m["content"][0]["text"] for m in trimmed]
+    assert texts == ["Root task", "Root answer", "Latest", "Latest answer"]
+    assert saved > 0
+
+
+def test_extract_chat_history_with_budget(temp_graph_file):
+    mg = MemoryGraph(storage_path=temp_graph_file)
+    root = mg.new("Root")
+    mg.update(root, prompt="Root prompt", response="Root response")
+    mid = mg.new("Mid", parent_id=root)
+    mg.update(mid, prompt="Mid prompt " + "x" * 4000, response="Mid response")
+    leaf = mg.new("Leaf", parent_id=mid)
+    mg.update(leaf, prompt="Leaf prompt", response="Leaf response")
+
+    history = extract_chat_history(leaf, mg, token_budget=100, keep_recent_turns=1)
+    texts = [m["content"][0]["text"] for m in history]
+    assert "Leaf prompt" in texts
+    assert not any(t.startswith("Mid prompt") for t in texts)
@@ -0,0 +1,80 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from cybermule.providers.llm_provider import LLMProvider
+from cybermule.tools.mock_llm_server import MockLLMServer, MockServerSettings, template_response
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        f"{url}/chat/completions",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=5) as resp:
+        return resp.read().decode("utf-8")
+
+
+def _sse_chunks(body):
+    return [json.loads(line[len("data: "):]) for line in body.splitlines()
+            if line.startswith("data: ") and line != "data: [DONE]"]
+
+
+def test_streams_scripted_response_with_usage_chunk():
+    with MockLLMServer(script=[{"response": "hello from the script"}]) as server:
+        body = _post(server.url, {
+            "model": "mock",
+            "messages": [{"role": "user", "content": "hi"}],
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        })
+
+    chunks = _sse_chunks(body)
+    text = "".join(c["choices"][0]["delta"].get("content") or "" for c in chunks if c["choices"])
+    assert text == "hello from the script"
+    assert chunks[-1]["usage"]["completion_tokens"] == 4
+
+
+def test_rate_limit_injection():
+    settings = MockServerSettings(rate_limit_rate=1.0)
+    with MockLLMServer(settings=settings) as server:
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            _post(server.url, {"model": "mock", "messages": [{"role": "user", "content": "hi"}]})
+
+    assert exc_info.value.code == 429
+
+
+def test_template_aware_responses():
+    assert "<error_summary>" in template_response("<traceback>\nboom\n</traceback>")
+
+    fix = template_response("<code_context>\n[file] a.py\n[symbol] helper\n[start_line] 1\n</code_context>")
+    assert '"symbol": "helper"' in fix
+
+
+def test_llm_provider_streams_from_stand_in_server(tmp_path):
+    with MockLLMServer(script=[{"match": "capital", "response": "Paris is the capital."}]) as server:
+        llm = LLMProvider("openai/mock", api_base=server.url, api_key="mock",
+                          cache_path=None, show_token_summary=False)
+        response = llm.generate("What is the capital of France?")
+
+    assert response == "Paris is the capital."
+    assert llm.output_tokens == 4
+    assert llm.last_call_stats["ttft"] is not None
+    assert llm.last_call_stats["output_tokens"] == 4
+
+
+def test_provider_reuses_pooled_connection_across_providers():
+    with MockLLMServer() as server:
+        first = LLMProvider("openai/mock", api_base=server.url, api_key="mock",
+                            cache_path=None, show_token_summary=False)
+        first.generate("First question")
+        second = LLMProvider("openai/mock", api_base=server.url, api_key="mock",
+                             cache_path=None, show_token_summary=False)
+        second.generate("Second question")
+
+    assert first.http_client is second.http_client
+    assert first.last_call_stats["connection_reused"] is False
+    assert second.last_call_stats["connection_reused"] is True
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from textwrap import dedent
+
+from cybermule.symbol_resolution import native_index
+from cybermule.symbol_resolution.native_index import index_source, tree_sitter_file_symbols
+
+SOURCE = dedent("""\
+    import os
+
+    LIMIT = 10
+
+    @decorator
+    def top(a):
+        local = 1
+        def inner():
+            pass
+        return local
+
+    class Outer:
+        name = "x"
+
+        class Inner:
+            def method(self):
+                pass
+
+        @property
+        def value(self):
+            return 1
+
+    if os.name == "nt":
+        def platform_only():
+            pass
+""")
+
+
+def test_index_source_records_spans_kinds_and_scopes():
+    symbols = index_source(SOURCE.encode("utf-8"))
+    summary = [(s["name"], s["kind"], s["scope"], s["line"], s["end_line"]) for s in symbols]
+    assert summary == [
+        ("LIMIT", "variable", None, 3, 3),
+        ("top", "function", None, 6, 10),
+        ("inner", "function", "top", 8, 9),
+        ("Outer", "class", None, 12, 21),
+        ("name", "variable", "Outer", 13, 13),
+        ("Inner", "class", "Outer", 15, 17),
+        ("method", "member", "Outer.Inner", 16, 17),
+        ("value", "member", "Outer", 20, 21),
+        ("platform_only", "function", None, 24, 25),
+    ]
+    top = symbols[1]
+    assert SOURCE.encode("utf-8")[top["start_byte"]:top["end_byte"]].startswith(b"def top(a):")
+
+
+def test_process_pool_matches_in_process_indexing(tmp_path, monkeypatch):
+    files = []
+    for i in range(6):
+        (tmp_path / f"mod_{i}.py").write_text(f"def func_{i}():\n    pass\n\nclass C{i}:\n    def m(self): pass\n")
+        files.append(f"mod_{i}.py")
+
+    in_process = tree_sitter_file_symbols(files, tmp_path, workers=1)
+    monkeypatch.setattr(native_index, "MIN_FILES_FOR_POOL", 1)
+    monkeypatch.setattr(native_index, "FILES_PER_TASK", 2)
+    # Built from a worker thread, as context requests do on their first lookup
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        pooled = threads.submit(tree_sitter_file_symbols, files, tmp_path, workers=2).result(timeout=120)
+
+    assert pooled == in_process
+    assert [s["name"] for s in pooled["mod_3.py"]] == ["func_3", "C3", "m"]
@@ -73,3 +73,98 @@ def test_evaluate_prompt_variants_basic(tmp_path, patch_prompt_utils, fake_llm_e
     assert "scores" in result
     assert result["scores"]["t1.j2"] == 3
     assert result["scores"]["t2.j2"] == 9
+
+
+def _pairwise_setup(tmp_path, monkeypatch, judged_pairs):
+    pair_template = tmp_path / "pair.j2"
+    pair_template.write_text("{{ goal }}|{{ variant_a.response }}|{{ variant_b.response }}")
+    variant_template = tmp_path / "variant.j2"
+    variant_template.write_text("Prompt for {{ name }}")
+    monkeypatch.setattr(
+        "cybermule.executors.prompt_eval.get_prompt_path",
+        lambda config, name: pair_template if name == "pair.j2" else variant_template,
+    )
+
+    class QualityJudge:
+        """Prefers the response with the higher number in it."""
+        def generate(self, prompt: str, respond_prefix: str = '', history=()):
+            _, a, b = prompt.split("|")
+            judged_pairs.append((a, b))
+            winner = "A" if int(a.split()[-1]) > int(b.split()[-1]) else "B"
+            return f"```json\n{json.dumps({'winner': winner, 'justification': 'higher'})}\n```"
+
+    monkeypatch.setattr("cybermule.executors.prompt_eval.get_llm_provider", lambda config: QualityJudge())
+
+    graph = MemoryGraph(storage_path=tmp_path / "pairwise.json")
+
+    def add_variant(quality):
+        node_id = graph.new(f"v{quality}")
+        graph.update(node_id, prompt_template="variant.j2", variables={"name": "x"},
+                     response=f"quality {quality}")
+        return node_id
+
+    return graph, add_variant
+
+
+def test_pairwise_leaderboard_and_incremental_cache(tmp_path, monkeypatch):
+    judged_pairs = []
+    graph, add_variant = _pairwise_setup(tmp_path, monkeypatch, judged_pairs)
+    nodes = [add_variant(q) for q in (2, 5, 1)]
+    cache_path = tmp_path / "judge_cache.json"
+
+    result = evaluate_prompt_variants(nodes, graph, {}, goal="quality", prompt_template="pair.j2",
+                                      mode="pairwise", cache_path=cache_path)
+
+    assert [entry["node_id"] for entry in result["leaderboard"]] == [nodes[1], nodes[0], nodes[2]]
+    assert result["winner"] == nodes[1]
+    assert result["leaderboard"][0]["wins"] == 2
+    assert len(judged_pairs) == 6  # every pair in both orders
+
+    judged_pairs.clear()
+    newcomer = add_variant(9)
+    result = evaluate_prompt_variants(nodes + [newcomer], graph, {}, goal="quality",
+                                      prompt_template="pair.j2", mode="pairwise", cache_path=cache_path)
+
+    assert len(judged_pairs) == 6  # only the newcomer's comparisons
+    assert result["winner"] == newcomer
+
+
+def test_bradley_terry_orders_by_strength():
+    from cybermule.executors.prompt_eval import bradley_terry
+
+    ratings = bradley_terry(["a", "b", "c"], [("a", "b"), ("a", "c"), ("b", "c"), ("b", "a", 0.5)])
+
+    assert ratings["a"] > ratings["b"] > ratings["c"]
+
+
+def test_pairwise_judging_cancels_position_bias(tmp_path, monkeypatch):
+    judged_pairs = []
+    graph, add_variant = _pairwise_setup(tmp_path, monkeypatch, judged_pairs)
+    nodes = [add_variant(q) for q in (2, 5)]
+
+    class FirstPositionJudge:
+        def generate(self, prompt: str, respond_prefix: str = '', history=()):
+            return f"```json\n{json.dumps({'winner': 'A', 'justification': 'first'})}\n```"
+
+    monkeypatch.setattr("cybermule.executors.prompt_eval.get_llm_provider", lambda config: FirstPositionJudge())
+
+    result = evaluate_prompt_variants(nodes, graph, {}, goal="quality", prompt_template="pair.j2",
+                                      mode="pairwise", cache_path=tmp_path / "judge_cache.json")
+
+    comparison = result["comparisons"][0]
+    assert comparison["winner"] == "tie"
+    assert [j["order"] for j in comparison["judgements"]] == [[nodes[0], nodes[1]], [nodes[1], nodes[0]]]
+    assert result["scores"][nodes[0]] == result["scores"][nodes[1]]
+
+
+def test_judge_cache_merges_concurrent_writers(tmp_path):
+    from cybermule.executors.prompt_eval import JudgeCache
+
+    path = tmp_path / "judge_cache.json"
+    first, second = JudgeCache(path), JudgeCache(path)
+    first.put("goal", "a", "b", {"winner": "a"})
+    second.put("goal", "b", "a", {"winner": "b"})
+
+    merged = JudgeCache(path)
+    assert merged.get("goal", "a", "b") == {"winner": "a"}
+    assert merged.get("goal", "b", "a") == {"winner": "b"}
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cybermule.memory.memory_graph import MemoryGraph
+from cybermule.memory.stats import collect_llm_stats, parse_window, percentile, summarize_llm_stats
+
+
+def _log_call(graph, template, model, latency, finished_at, cache_hit=False):
+    node_id = graph.new(task=template)
+    graph.update(node_id, prompt_template=template, llm_stats={
+        "model": model,
+        "cache_hit": cache_hit,
+        "ttft": latency / 2,
+        "latency": latency,
+        "output_tokens_per_second": 10.0,
+        "input_tokens": 100,
+        "output_tokens": 20,
+        "finished_at": finished_at.isoformat(),
+    })
+    return node_id
+
+
+def test_parse_window():
+    assert parse_window("30m") == timedelta(minutes=30)
+    assert parse_window("7d") == timedelta(days=7)
+    with pytest.raises(ValueError):
+        parse_window("soon")
+
+
+def test_percentile_interpolates():
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile([], 50) is None
+
+
+def test_collect_and_summarize_llm_stats(tmp_path):
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    now = datetime.now(timezone.utc)
+    _log_call(graph, "summarize_traceback.j2", "haiku", 1.0, now - timedelta(minutes=5))
+    _log_call(graph, "summarize_traceback.j2", "haiku", 3.0, now - timedelta(minutes=1))
+    _log_call(graph, "summarize_traceback.j2", "haiku", 0.0, now, cache_hit=True)
+    _log_call(graph, "fix_traceback.j2", "sonnet", 9.0, now - timedelta(days=2))
+    graph.new(task="no llm call")
+
+    records = collect_llm_stats(graph, since=timedelta(hours=1), now=now)
+    assert len(records) == 3
+
+    by_template = summarize_llm_stats(records, "template")
+    summary = by_template["summarize_traceback.j2"]
+    assert summary["calls"] == 3
+    assert summary["cache_hit_rate"] == pytest.approx(1 / 3)
+    assert summary["latency"]["p50"] == 2.0
+    assert summary["input_tokens"] == 300
+
+    by_model = summarize_llm_stats(collect_llm_stats(graph), "model")
+    assert set(by_model) == {"haiku", "sonnet"}
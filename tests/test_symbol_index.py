@@ -0,0 +1,122 @@
+import os
+import re
+import subprocess
+
+from cybermule.symbol_resolution.symbol_index import (
+    SymbolIndex,
+    blob_hash,
+    git_clean_blobs,
+    imported_files,
+    list_source_files,
+)
+
+
+def def_indexer(calls):
+    def regex_indexer(files, project_root):
+        calls.append(sorted(files))
+        return {
+            rel: [{"name": m.group(1), "line": (project_root / rel).read_text()[:m.start()].count("\n") + 1,
+                   "kind": "function"}
+                  for m in re.finditer(r"^def (\w+)", (project_root / rel).read_text(), re.MULTILINE)]
+            for rel in files
+        }
+    return regex_indexer
+
+
+def test_index_persists_and_refreshes_incrementally(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("def alpha():\n    pass\n")
+    (tmp_path / "b.py").write_text("x = 1\n\ndef beta():\n    pass\n")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "skip.py").write_text("def skipped(): pass\n")
+
+    calls = []
+    index = SymbolIndex(tmp_path, indexer=def_indexer(calls))
+    assert index.refresh() == 2
+    assert calls == [["b.py", os.path.join("pkg", "a.py")]]
+    assert index.lookup("beta") == {"name": "beta", "line": 3, "kind": "function", "file": "b.py",
+                                    "qualname": "b.beta"}
+    assert index.lookup("skipped") is None
+    assert (tmp_path / ".cybermule" / "symbol_index.json").exists()
+
+    # A new process loads the index from disk and re-indexes nothing
+    warm = SymbolIndex(tmp_path, indexer=def_indexer(calls))
+    assert warm.refresh() == 0
+    assert warm.lookup("alpha")["file"] == os.path.join("pkg", "a.py")
+
+    # Touching a file without changing it only updates its stat data
+    os.utime(tmp_path / "b.py", ns=(1, 1))
+    assert warm.refresh() == 0
+
+    (tmp_path / "b.py").write_text("def gamma():\n    pass\n")
+    (tmp_path / "pkg" / "a.py").unlink()
+    assert warm.refresh() == 1
+    assert calls[-1] == ["b.py"]
+    assert warm.lookup("gamma")["line"] == 1
+    assert warm.lookup("beta") is None and warm.lookup("alpha") is None
+
+
+def test_git_index_hashes_match_content(tmp_path):
+    (tmp_path / "tracked.py").write_text("def tracked(): pass\n")
+    (tmp_path / "ignored.py").write_text("def ignored(): pass\n")
+    (tmp_path / ".gitignore").write_text("ignored.py\n")
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["add", "tracked.py", ".gitignore"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=tmp_path, check=True)
+    (tmp_path / "untracked.py").write_text("def untracked(): pass\n")
+
+    assert list_source_files(tmp_path) == ["tracked.py", "untracked.py"]
+    assert git_clean_blobs(tmp_path) == {"tracked.py": blob_hash((tmp_path / "tracked.py").read_bytes())}
+
+    (tmp_path / "tracked.py").write_text("def changed(): pass\n")
+    assert git_clean_blobs(tmp_path) == {}
+
+
+def test_candidates_rank_qualified_imported_and_nearby_definitions(tmp_path):
+    files = {
+        "pkg/__init__.py": "",
+        "pkg/jobs.py": "class Job:\n    def run(self): pass\n\ndef helper(): pass\n",
+        "pkg/tasks.py": "class Task:\n    def run(self): pass\n",
+        "pkg/cli.py": "from .jobs import (\n    helper,\n    Job as J,\n)\nfrom pkg import tasks\n\ndef main():\n    helper()\n",
+        "other/tools.py": "def run(): pass\ndef helper(): pass\n",
+    }
+    symbols = {
+        "pkg/jobs.py": [{"name": "Job", "line": 1, "kind": "class", "scope": None},
+                        {"name": "run", "line": 2, "kind": "member", "scope": "Job"},
+                        {"name": "helper", "line": 4, "kind": "function", "scope": None}],
+        "pkg/tasks.py": [{"name": "Task", "line": 1, "kind": "class", "scope": None},
+                         {"name": "run", "line": 2, "kind": "member", "scope": "Task"}],
+        "pkg/cli.py": [{"name": "main", "line": 4, "kind": "function", "scope": None}],
+        "other/tools.py": [{"name": "run", "line": 1, "kind": "function", "scope": None},
+                           {"name": "helper", "line": 2, "kind": "function", "scope": None}],
+    }
+    for rel, source in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(source)
+    index = SymbolIndex(tmp_path, indexer=lambda changed, root: {
+        rel: symbols.get(rel.replace(os.sep, "/"), []) for rel in changed})
+    index.refresh()
+
+    def best(symbol, ref_path=None):
+        found = index.lookup(symbol, ref_path=ref_path)
+        return found["qualname"] if found else None
+
+    assert imported_files(tmp_path / "pkg" / "cli.py", tmp_path) == {
+        os.path.join("pkg", "jobs.py"): ["helper", "Job"],
+        os.path.join("pkg", "__init__.py"): ["tasks"],
+        os.path.join("pkg", "tasks.py"): [],
+    }
+
+    # Every definition is kept under its qualified name
+    assert sorted(d["qualname"] for d in index.candidates("run")) == \
+        ["other.tools.run", "pkg.jobs.Job.run", "pkg.tasks.Task.run"]
+    assert best("Task.run") == "pkg.tasks.Task.run"
+    assert best("self.run()", ref_path="pkg/tasks.py") == "pkg.tasks.Task.run"
+    assert best("jobs.Job.run") == "pkg.jobs.Job.run"
+    # Imported names win over same-named definitions elsewhere, then imported modules
+    assert best("helper", ref_path="pkg/cli.py") == "pkg.jobs.helper"
+    assert best("run", ref_path="pkg/cli.py") == "pkg.tasks.Task.run"
+    assert best("run", ref_path="other/new.py") == "other.tools.run"
+    assert best("HELPER", ref_path="other/tools.py") == "other.tools.helper"
+    assert best("missing") is None
@@ -1,5 +1,6 @@
 import pytest
 from pathlib import Path
+from textwrap import dedent
 from cybermule.executors.analyzer import fulfill_context_requests
 from cybermule.symbol_resolution import (
     extract_definition_by_callsite,
@@ -124,3 +125,100 @@ def test_fulfill_context_with_string_lineno():
     assert len(result) == 1
     assert result[0]["symbol"] == "bar"
     assert "def bar" in result[0]["snippet"]
+
+
+def test_fulfill_context_parallel_dedup_and_parse_once():
+    from unittest.mock import patch
+    from cybermule.symbol_resolution import tree_sitter_lookup
+
+    info = [
+        {"symbol": "bar", "ref_path": str(FIXTURES / "calls_imported.py"), "lineno": 4},
+        {"symbol": "bar", "ref_path": str(FIXTURES / "calls_in_function.py"), "ref_function": "foo"},
+        {"symbol": "bar"},
+        {"symbol": "bar"},
+    ]
+    with (
+        patch("cybermule.symbol_resolution._lookup_symbol", return_value={"file": "lib.py"}),
+        patch.object(tree_sitter_lookup, "_read_and_parse", wraps=tree_sitter_lookup._read_and_parse) as parse,
+    ):
+        result = fulfill_context_requests(info, project_root=FIXTURES, max_workers=4)
+
+    # Every request resolves to the same definition
+    assert [(Path(r["file"]).name, r["symbol"]) for r in result] == [("lib.py", "bar")]
+    parsed = [Path(call.args[0]).name for call in parse.call_args_list]
+    assert sorted(parsed) == ["calls_imported.py", "calls_in_function.py", "lib.py"]
+
+
+def test_resolve_symbol_picks_indexed_definition(tmp_path):
+    from unittest.mock import patch
+
+    (tmp_path / "jobs.py").write_text(
+        "class Job:\n    def run(self):\n        return 1\n\nclass Task:\n    def run(self):\n        return 2\n")
+    entry = {"file": "jobs.py", "name": "run", "line": 6, "kind": "member", "qualname": "jobs.Task.run"}
+    with patch("cybermule.symbol_resolution._lookup_symbol", return_value=entry) as lookup:
+        result = resolve_symbol("Task.run", project_root=tmp_path, ref_path=tmp_path / "jobs.py")
+
+    lookup.assert_called_once_with("Task.run", tmp_path, ref_path=tmp_path / "jobs.py")
+    assert result["start_line"] == 6
+    assert "return 2" in result["snippet"]
+
+
+def test_parse_cache_reuses_trees_until_the_file_changes(tmp_path):
+    from cybermule.symbol_resolution.tree_sitter_lookup import ParseCache
+
+    path = tmp_path / "mod.py"
+    path.write_text("def a():\n    return 1\n")
+    cache = ParseCache()
+
+    first = cache.get(path)
+    assert cache.get(tmp_path / "." / "mod.py") is first
+    assert first.line_offsets == [0, 9, 22]
+
+    path.write_text("def a():\n    return 22\n")
+    second = cache.get(path)
+    assert second is not first and second.source.endswith("22\n")
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    # The memory cap evicts the least recently used file
+    other = tmp_path / "other.py"
+    other.write_text("x = 1\n")
+    cache.max_bytes = cache.stats()["bytes"] + 10
+    cache.get(other)
+    assert cache.peek(path) is None and cache.peek(other) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_outline_queries_find_definitions_and_calls(tmp_path):
+    from cybermule.symbol_resolution.tree_sitter_lookup import (
+        extract_called_symbols_in_function,
+        extract_called_symbols_on_line,
+        extract_symbol_definition,
+        extract_test_definitions,
+        file_outline,
+        load_parsed,
+    )
+
+    path = tmp_path / "test_mod.py"
+    path.write_text(dedent("""\
+        def helper(x):
+            return str(x).strip() + fmt(x)
+
+        class TestThing:
+            def test_one(self):
+                def test_nested():
+                    pass
+                assert helper(1) == self.check(2)
+
+        def test_two():
+            pass
+    """))
+
+    outline = file_outline(load_parsed(path))
+    assert [d.name for d in outline.definitions] == ["helper", "TestThing", "test_one", "test_nested", "test_two"]
+    assert file_outline(load_parsed(path)) is outline   # queried once per parse
+
+    # Outer calls come before the calls they contain
+    assert extract_called_symbols_on_line(path, 2) == ["strip", "str", "fmt"]
+    assert extract_called_symbols_in_function(path, "test_one") == ["helper", "check"]
+    assert extract_symbol_definition(path, "test_two")["start_line"] == 10
+    assert [t["symbol"] for t in extract_test_definitions(path)] == ["test_one", "test_two"]
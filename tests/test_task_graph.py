@@ -0,0 +1,88 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from cybermule.executors.task_graph import TaskGraph
+from cybermule.memory.memory_graph import MemoryGraph
+
+
+@pytest.fixture
+def patch_prompt_path(monkeypatch, tmp_path):
+    prompt_file = tmp_path / "echo.j2"
+    prompt_file.write_text("{{ text }}")
+    monkeypatch.setattr("cybermule.executors.llm_runner.get_prompt_path",
+                        lambda config, name: Path(prompt_file))
+    monkeypatch.setattr("cybermule.memory.tracker.get_version_info", lambda: {"git_commit": "abc123"})
+
+
+def _patch_llm(monkeypatch, generate):
+    class FakeLLM:
+        def generate(self, prompt, history=None, respond_prefix=None):
+            return generate(prompt)
+
+    monkeypatch.setattr("cybermule.executors.llm_runner.get_llm_provider", lambda config: FakeLLM())
+
+
+def test_independent_tasks_run_concurrently(monkeypatch, patch_prompt_path, tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def generate(prompt):
+        barrier.wait()  # only passes if both tasks are in flight at the same time
+        return prompt.upper()
+
+    _patch_llm(monkeypatch, generate)
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    tasks = TaskGraph({}, graph, max_workers=2)
+    tasks.add_llm_task("a", task="A", prompt_template="echo.j2", variables={"text": "a"})
+    tasks.add_llm_task("b", task="B", prompt_template="echo.j2", variables={"text": "b"})
+
+    results = tasks.run()
+
+    assert results["a"].value == "A"
+    assert results["b"].value == "B"
+    assert graph.get(results["a"].node_id)["response"] == "A"
+
+
+def test_dependent_task_uses_postprocess_output_and_parent_node(monkeypatch, patch_prompt_path, tmp_path):
+    _patch_llm(monkeypatch, lambda prompt: f"<{prompt}>")
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    tasks = TaskGraph({}, graph)
+    tasks.add_llm_task("first", task="First", prompt_template="echo.j2", variables={"text": "hi"},
+                       postprocess=lambda r: {"wrapped": r})
+    tasks.add_llm_task("second", task="Second", prompt_template="echo.j2", parent_task="first",
+                       variables=lambda results: {"text": results["first"].value["wrapped"]})
+
+    results = tasks.run()
+
+    assert results["second"].value == "<<hi>>"
+    assert graph.parent_id_of(results["second"].node_id) == results["first"].node_id
+    assert graph.get(results["first"].node_id)["wrapped"] == "<hi>"
+
+
+def test_failed_task_skips_dependents(monkeypatch, patch_prompt_path, tmp_path):
+    def generate(prompt):
+        raise RuntimeError("boom")
+
+    _patch_llm(monkeypatch, generate)
+    graph = MemoryGraph(storage_path=tmp_path / "graph.json")
+    tasks = TaskGraph({}, graph)
+    tasks.add_llm_task("broken", task="Broken", prompt_template="echo.j2", variables={"text": "x"})
+    tasks.add_task("after", lambda results: "never", depends_on=["broken"])
+    tasks.add_task("unrelated", lambda results: 42)
+
+    results = tasks.run()
+
+    assert results["broken"].status == "FAILED"
+    assert graph.get(results["broken"].node_id)["status"] == "FAILED"
+    assert results["after"].status == "SKIPPED"
+    assert results["unrelated"].value == 42
+
+    with pytest.raises(RuntimeError, match="boom"):
+        tasks.run(raise_on_error=True)
+
+
+def test_unknown_dependency_is_rejected(tmp_path):
+    tasks = TaskGraph({}, MemoryGraph(storage_path=tmp_path / "graph.json"))
+    with pytest.raises(ValueError, match="unknown tasks"):
+        tasks.add_task("orphan", lambda results: None, depends_on=["missing"])
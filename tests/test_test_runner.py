@@ -127,3 +127,36 @@ def test_get_first_failure_empty_list():
     name, tb = test_runner.get_first_failure([])
     assert name == ""
     assert tb == ""
+
+
+def test_cluster_failures_by_signature():
+    broken_import = dedent("""\
+        test_parse[case-1]
+        tests/test_a.py:110: in test_parse
+            load(path)
+        src/mod.py:20: in load
+            import broken
+        E   ImportError: cannot import name 'x' from /tmp/pytest-of-ci/pytest-3/test_parse0/y.py (0x7fab12)""")
+    same_cause = (broken_import.replace("case-1", "case-2").replace("110", "140")
+                  .replace("pytest-3", "pytest-9").replace("7fab12", "7fdd00"))
+    assertion = dedent("""\
+        test_total
+            def test_total():
+        >       assert total() == 2
+        E       assert 1 == 2
+
+        tests/test_b.py:12: AssertionError""")
+
+    assert test_runner.normalize_traceback(broken_import).endswith("from <tmp> (0x?)")
+    assert test_runner.failure_signature(broken_import) == test_runner.failure_signature(same_cause)
+    assert test_runner.failure_signature(assertion)[1] == "AssertionError"
+
+    clusters = test_runner.cluster_failures([assertion, broken_import, same_cause])
+    assert [(c.count, c.exception) for c in clusters] == [(2, "ImportError"), (1, "AssertionError")]
+    assert clusters[0].names == ["test_parse[case-1]", "test_parse[case-2]"]
+
+    prompt = test_runner.format_cluster(clusters[0])
+    assert prompt.startswith("2 failing tests share this failure (ImportError)")
+    assert "--- Sample 2/2: test_parse[case-2] ---" in prompt
+    assert test_runner.format_cluster(clusters[1]) == assertion
+